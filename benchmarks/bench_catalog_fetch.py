@@ -0,0 +1,48 @@
+# benchmarks/bench_catalog_fetch.py
+#
+# Serves a synthetic 10k-product catalog from the local stub server in
+# tests/catalog_stub.py (DummyJSON-style limit/skip/select) and compares
+# serial page fetching against the concurrent pooled fetcher.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_catalog_fetch.py [products] [latency_ms]
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from catalog_stub import StubCatalog
+from utils.api_handler import fetch_all_products
+
+DEFAULT_PRODUCTS = 10_000
+DEFAULT_LATENCY_MS = 20
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCTS
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LATENCY_MS) / 1000
+
+    server = StubCatalog(product_count, latency).start()
+    url = server.url
+
+    try:
+        print(f"Products: {product_count} | Per-request latency: {latency * 1000:.0f} ms")
+        print(f"{'Workers':>8} | {'Seconds':>8} | {'Fetched':>8}")
+        print("-" * 30)
+
+        for workers in [1, 4, 8, 16]:
+            start = time.perf_counter()
+            products = fetch_all_products(url, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} | {elapsed:>8.2f} | {len(products):>8}")
+
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_external_groupby.py
+#
+# Compares peak RSS and wall time of the in-memory customer_analysis and
+# the spill-to-disk group-by on a high-cardinality file. Result parity
+# (with a tiny budget that forces spilling) is covered by
+# tests/test_external_groupby.py.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_external_groupby.py [--rows N] [--customers N] [--memory-mb N]
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from generate_sales_data import write_sample_file
+
+SETUP = """
+import resource, time
+from utils.data_processor import iter_sales_records, customer_analysis
+from utils.external_groupby import iter_customer_analysis
+start = time.perf_counter()
+"""
+
+IN_MEMORY = """
+count = len(customer_analysis(iter_sales_records(PATH)))
+"""
+
+EXTERNAL = """
+count = sum(1 for _ in iter_customer_analysis(iter_sales_records(PATH), LIMIT))
+"""
+
+REPORT = """
+elapsed = time.perf_counter() - start
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed, count)
+"""
+
+
+def run(body, path, limit):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = f"PATH = {path!r}\nLIMIT = {limit}\n" + SETUP + body + REPORT
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+
+    rss_kb, elapsed, count = output.strip().splitlines()[-1].split()
+    return int(rss_kb) / 1024, float(elapsed), int(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the spill-to-disk group-by")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--memory-mb", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.txt")
+        write_sample_file(path, args.rows, customers=args.customers)
+        limit = args.memory_mb * 1024 * 1024
+
+        print(f"{args.rows:,} rows, up to {args.customers:,} customers")
+        for label, body in (("In-memory", IN_MEMORY), (f"External ({args.memory_mb} MB)", EXTERNAL)):
+            rss, elapsed, count = run(body, path, limit)
+            print(f"  {label:<18}: {rss:8.1f} MB peak RSS, {elapsed:7.2f} s, {count:,} customers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_parallel_scaling.py
+#
+# Measures wall time of parallel_aggregate for increasing worker counts
+# against the serial streaming path.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_parallel_scaling.py [rows]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_sales_data import write_sample_file
+from utils.aggregator import Aggregator
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.parallel import parallel_aggregate
+
+DEFAULT_ROWS = 2_000_000
+WORKER_COUNTS = [1, 2, 4, 8, 16, 32]
+
+
+def time_serial(path):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        valid, _, _ = validate_and_filter(iter_sales_records(path))
+        Aggregator().consume(valid)
+    return time.perf_counter() - start
+
+
+def time_parallel(path, workers):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parallel_aggregate(path, workers, chunk_size=8 * 1024 * 1024)
+    return time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.txt")
+        write_sample_file(path, rows)
+
+        serial = time_serial(path)
+        print(f"Rows: {rows} | CPUs: {cpus}")
+        print(f"{'Workers':>8} | {'Seconds':>8} | {'Speedup':>8}")
+        print("-" * 30)
+        print(f"{'serial':>8} | {serial:>8.2f} | {1.0:>8.2f}")
+
+        for workers in WORKER_COUNTS:
+            if workers > cpus:
+                break
+            elapsed = time_parallel(path, workers)
+            print(f"{workers:>8} | {elapsed:>8.2f} | {serial / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
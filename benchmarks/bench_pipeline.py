@@ -0,0 +1,190 @@
+# benchmarks/bench_pipeline.py
+#
+# Times every pipeline stage on a reproducible synthetic file (with the
+# real file's quirks) and records the results, so regressions show up
+# against the previous run on the same row count:
+# - read_sales_data, parse_transactions, validate_and_filter
+# - each aggregation function
+# - enrich_sales_data (against a synthetic catalog, no network)
+# - report rendering (txt, md, json, csv)
+#
+# Results are written to output/benchmarks/pipeline_<rows>_<timestamp>.json
+# and compared with the most recent earlier result for the same row count
+# (or with --baseline). Stages slower than the tolerance are flagged and
+# the script exits with status 1.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_pipeline.py [rows] [--baseline FILE] [--tolerance 0.25]
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_sales_data import CATALOG, write_sample_file
+from utils.aggregator import Aggregator
+from utils.api_handler import create_product_mapping, enrich_sales_data
+from utils.data_processor import (
+    parse_transactions,
+    validate_and_filter,
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    low_performing_products
+)
+from utils.file_handler import read_sales_data
+from utils.report_generator import write_reports
+
+DEFAULT_ROWS = 100_000
+REPEATS = 3
+RESULTS_DIR = "output/benchmarks"
+
+
+def best_time(func):
+    """
+    Runs func REPEATS times.
+    Returns (best wall seconds, last result)
+    """
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+def synthetic_catalog():
+    """
+    DummyJSON-shaped products for the synthetic ProductIDs.
+    """
+    return [
+        {"id": int(pid[1:]), "title": name, "category": "electronics", "brand": "Generic", "rating": 4.5}
+        for pid, (name, _, _) in CATALOG.items()
+    ]
+def run_suite(path, rows, report_dir):
+    """
+    Times each stage in pipeline order, feeding each its real input.
+    Returns dict stage -> {"seconds", "rows_per_second"}
+    """
+    timings = {}
+
+    def record(name, func, row_count):
+        seconds, result = best_time(func)
+        timings[name] = {
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(row_count / seconds, 1) if seconds > 0 else None
+        }
+        return result
+
+    lines = record("read_sales_data", lambda: read_sales_data(path), rows)
+    transactions = record("parse_transactions", lambda: parse_transactions(lines), len(lines))
+    valid, _, _ = record("validate_and_filter", lambda: validate_and_filter(transactions), len(transactions))
+
+    for func in (
+        calculate_total_revenue,
+        region_wise_sales,
+        top_selling_products,
+        customer_analysis,
+        daily_sales_trend,
+        low_performing_products
+    ):
+        record(func.__name__, lambda: func(valid), len(valid))
+
+    mapping = create_product_mapping(synthetic_catalog())
+    enriched = record("enrich_sales_data", lambda: enrich_sales_data(valid, mapping), len(valid))
+
+    results = Aggregator().consume(enriched).results()
+    record(
+        "write_reports",
+        lambda: write_reports(results, rows, os.path.join(report_dir, "report.txt"), ["txt", "md", "json", "csv"]),
+        len(valid)
+    )
+
+    return timings
+def latest_result(rows):
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, f"pipeline_{rows}_*.json")))
+    return paths[-1] if paths else None
+def compare(timings, baseline, tolerance):
+    """
+    Prints each stage against the baseline.
+    Returns list of regressed stage names
+    """
+    regressions = []
+
+    print(f"{'Stage':>24} | {'Seconds':>9} | {'Rows/sec':>12} | {'vs baseline':>11}")
+    print("-" * 66)
+
+    for name, timing in timings.items():
+        change = ""
+        previous = baseline.get(name) if baseline else None
+        if previous and previous["seconds"]:
+            ratio = timing["seconds"] / previous["seconds"] - 1
+            change = f"{ratio:+.1%}"
+            if ratio > tolerance:
+                change += " !"
+                regressions.append(name)
+
+        rate = timing["rows_per_second"]
+        rate = f"{rate:,.0f}" if rate is not None else "-"
+        print(f"{name:>24} | {timing['seconds']:>9.4f} | {rate:>12} | {change:>11}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline stage benchmarks")
+    parser.add_argument("rows", type=float, nargs="?", default=DEFAULT_ROWS)
+    parser.add_argument("--baseline", help="result file to compare against (default: previous run)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown per stage (default: 0.25)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rows = int(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.txt")
+        write_sample_file(path, rows, seed=args.seed, quirks=True)
+        # validate_and_filter prints filter info on every call
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = run_suite(path, rows, tmp)
+
+    baseline_path = args.baseline or latest_result(rows)
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["timings"]
+        print(f"Baseline: {baseline_path}")
+
+    print(f"Rows: {rows}")
+    regressions = compare(timings, baseline, args.tolerance)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    result_path = os.path.join(RESULTS_DIR, f"pipeline_{rows}_{stamp}.json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "rows": rows,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded_at": stamp,
+            "timings": timings
+        }, f, indent=2)
+    print(f"Results saved at: {result_path}")
+
+    if regressions:
+        print("Regressed stages:", ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
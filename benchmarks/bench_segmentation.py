@@ -0,0 +1,106 @@
+# benchmarks/bench_segmentation.py
+#
+# Compares customer segmentation through customer_analysis (per-row dict
+# updates) with the vectorized CustomerTable, then times the vectorized
+# path alone on synthetic columns with many customers.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_segmentation.py [--rows N] [--customers N] [--synthetic-customers N]
+# Defaults: 1M rows / 100k customers from a sample file, then 10M
+# synthetic customers with 3 rows each.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from generate_sales_data import write_sample_file
+from utils.data_processor import iter_sales_records, customer_analysis
+from utils.segmentation import CustomerTable, day_numbers
+from utils.transaction_table import TransactionTable
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def current_segments(transactions):
+    segment_count = {}
+    for data in customer_analysis(transactions):
+        segment = data["Segment"]
+        segment_count[segment] = segment_count.get(segment, 0) + 1
+    return segment_count
+
+
+def vectorized_segments(table):
+    customers = CustomerTable.from_transactions(table)
+    return customers.segment_counts(), customers.rfm_counts()
+
+
+def compare(rows, customers):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.txt")
+        write_sample_file(path, rows, customers=customers)
+
+        transactions = list(iter_sales_records(path))
+        table = TransactionTable.from_transactions(transactions)
+
+    expected, current_time = timed(current_segments, transactions)
+    (counts, rfm), vectorized_time = timed(vectorized_segments, table)
+
+    if counts != expected:
+        print(f"ERROR: Segment counts differ -> {counts} vs {expected}")
+
+    print(f"{rows:,} rows, {len(table.dictionaries['CustomerID']):,} customers")
+    print(f"  customer_analysis + count : {current_time:8.3f} s")
+    print(f"  CustomerTable + RFM       : {vectorized_time:8.3f} s  ({current_time / vectorized_time:.1f}x)")
+    print(f"  Segments: {counts}")
+    print(f"  RFM cells: {len(rfm)}")
+
+
+def synthetic(customers, rows_per_customer=3, days=365, seed=42):
+    rng = np.random.default_rng(seed)
+    rows = customers * rows_per_customer
+
+    customer_codes = rng.integers(0, customers, rows, dtype=np.int32)
+    amounts = rng.integers(1, 10, rows) * rng.choice([150.0, 800.0, 4500.0, 18000.0], rows)
+    date_codes = rng.integers(0, days, rows, dtype=np.int32)
+    dates = [f"2024-{1 + d // 31 % 12:02d}-{1 + d % 28:02d}" for d in range(days)]
+
+    # Customer IDs are only looked up by to_records, so a range stands in
+    start = time.perf_counter()
+    table = CustomerTable.from_columns(customer_codes, range(customers), amounts, date_codes, day_numbers(dates))
+    group_time = time.perf_counter() - start
+
+    counts, threshold_time = timed(table.segment_counts)
+    quantile_counts, quantile_time = timed(table.segment_counts, "quantile")
+    rfm, rfm_time = timed(table.rfm_counts)
+
+    print(f"{rows:,} synthetic rows, {len(table):,} customers")
+    print(f"  group-by (spend/frequency/recency) : {group_time:8.3f} s")
+    print(f"  threshold segments                 : {threshold_time:8.3f} s  {counts}")
+    print(f"  quantile segments                  : {quantile_time:8.3f} s  {quantile_counts}")
+    print(f"  RFM scores + counts                : {rfm_time:8.3f} s  ({len(rfm)} cells)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized customer segmentation")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--synthetic-customers", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    compare(args.rows, args.customers)
+    print()
+    synthetic(args.synthetic_customers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_streaming_memory.py
+#
+# Compares peak RSS of the list-based ingestion path against the
+# streaming path (iter_sales_records) as the input file grows.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_streaming_memory.py
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from generate_sales_data import write_sample_file
+
+ROW_COUNTS = [100_000, 400_000, 1_600_000]
+
+LIST_PATH = """
+from utils.file_handler import read_sales_data
+from utils.data_processor import parse_transactions, region_wise_sales
+region_wise_sales(parse_transactions(read_sales_data(PATH)))
+"""
+
+STREAM_PATH = """
+from utils.data_processor import iter_sales_records, region_wise_sales
+region_wise_sales(iter_sales_records(PATH))
+"""
+
+REPORT_RSS = """
+import resource
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def peak_rss_kb(script, path):
+    """
+    Runs the script in a fresh interpreter and returns its peak RSS in KB.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = f"PATH = {path!r}\n" + script + REPORT_RSS
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+
+    return int(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'Rows':>10} | {'List RSS (MB)':>14} | {'Stream RSS (MB)':>15}")
+    print("-" * 46)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in ROW_COUNTS:
+            path = os.path.join(tmp, f"sales_{rows}.txt")
+            write_sample_file(path, rows)
+
+            list_rss = peak_rss_kb(LIST_PATH, path) / 1024
+            stream_rss = peak_rss_kb(STREAM_PATH, path) / 1024
+
+            print(f"{rows:>10} | {list_rss:>14.1f} | {stream_rss:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
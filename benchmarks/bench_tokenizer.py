@@ -0,0 +1,127 @@
+# benchmarks/bench_tokenizer.py
+#
+# Microbenchmark for the sales-line tokenizer, reported in rows/sec:
+# - baseline parsers from before the shared tokenizer: the per-line
+#   parse_transactions dict builder and the list-based
+#   parse_sales_lines/clean_sales_records path (copied below as they were)
+# - the tokenizer over line-at-a-time text decoding
+# - block-decoded tokenizer (iter_sales_records)
+#
+# Usage (from the project root):
+#     python benchmarks/bench_tokenizer.py [rows]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_sales_data import write_sample_file
+from utils.data_processor import iter_sales_records, parse_sales_lines
+from utils.file_handler import read_sales_file
+from utils.tokenizer import iter_tokenized
+
+DEFAULT_ROWS = 1_000_000
+REPEATS = 3
+
+
+def text_mode_lines(path):
+    with open(path, mode="r", encoding="utf-8", errors="replace") as file:
+        next(file, None)
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def baseline_parse_transaction_line(line):
+    fields = line.split("|")
+    if len(fields) != 8:
+        return None
+
+    transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region = fields
+    product_name = product_name.replace(",", "").strip()
+
+    try:
+        quantity = int(quantity)
+        unit_price = float(unit_price.replace(",", ""))
+    except ValueError:
+        return None
+
+    return {
+        "TransactionID": transaction_id,
+        "Date": date,
+        "ProductID": product_id,
+        "ProductName": product_name,
+        "Quantity": quantity,
+        "UnitPrice": unit_price,
+        "CustomerID": customer_id,
+        "Region": region
+    }
+
+
+def baseline_parse_transactions(raw_lines):
+    transactions = []
+    for line in raw_lines:
+        transaction = baseline_parse_transaction_line(line)
+        if transaction is not None:
+            transactions.append(transaction)
+    return transactions
+
+
+def baseline_clean_sales_records(records):
+    cleaned_records = []
+    for record in records:
+        transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region = record
+        product_name = product_name.replace(",", "").strip()
+
+        try:
+            quantity = int(quantity)
+            unit_price = int(unit_price.replace(",", ""))
+        except ValueError:
+            continue
+
+        cleaned_records.append([
+            transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region
+        ])
+    return cleaned_records
+
+
+def best_rate(rows, parse):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        count = sum(1 for _ in parse())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    assert count == rows
+    return rows / best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.txt")
+        write_sample_file(path, rows)
+
+        baseline_rate = best_rate(rows, lambda: baseline_parse_transactions(text_mode_lines(path)))
+        baseline_list_rate = best_rate(
+            rows, lambda: baseline_clean_sales_records(parse_sales_lines(read_sales_file(path)))
+        )
+        text_rate = best_rate(rows, lambda: iter_tokenized(text_mode_lines(path)))
+        block_rate = best_rate(rows, lambda: iter_sales_records(path))
+
+    print(f"Rows: {rows}")
+    print(f"{'Path':>32} | {'Rows/sec':>12}")
+    print("-" * 48)
+    print(f"{'baseline parse_transactions':>32} | {baseline_rate:>12,.0f}")
+    print(f"{'baseline clean_sales_records':>32} | {baseline_list_rate:>12,.0f}")
+    print(f"{'tokenizer, text-mode lines':>32} | {text_rate:>12,.0f}")
+    print(f"{'block-decoded tokenizer':>32} | {block_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
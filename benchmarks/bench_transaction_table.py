@@ -0,0 +1,92 @@
+# benchmarks/bench_transaction_table.py
+#
+# Compares peak RSS and aggregation wall time of the list-of-dicts path
+# against the columnar TransactionTable path.
+#
+# Usage (from the project root):
+#     python benchmarks/bench_transaction_table.py [rows ...]
+# Defaults to 1M, 10M and 50M rows; generating 50M rows takes a while.
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from generate_sales_data import write_sample_file
+
+DEFAULT_ROW_COUNTS = [1_000_000, 10_000_000, 50_000_000]
+
+SETUP = """
+import resource, time
+from utils.data_processor import (
+    iter_sales_records, region_wise_sales, top_selling_products,
+    customer_analysis, daily_sales_trend
+)
+from utils.transaction_table import TransactionTable
+"""
+
+DICT_PATH = """
+data = list(iter_sales_records(PATH))
+"""
+
+TABLE_PATH = """
+data = TransactionTable.from_transactions(iter_sales_records(PATH))
+"""
+
+AGGREGATE = """
+start = time.perf_counter()
+region_wise_sales(data)
+top_selling_products(data)
+customer_analysis(data)
+daily_sales_trend(data)
+elapsed = time.perf_counter() - start
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed)
+"""
+
+
+def run(store, path):
+    """
+    Loads the file into the given store in a fresh interpreter.
+    Returns (peak RSS in MB, aggregation seconds).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = f"PATH = {path!r}\n" + SETUP + store + AGGREGATE
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+
+    rss_kb, elapsed = output.strip().splitlines()[-1].split()
+    return int(rss_kb) / 1024, float(elapsed)
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+
+    print(
+        f"{'Rows':>10} | {'Dict RSS (MB)':>13} | {'Dict agg (s)':>12} | "
+        f"{'Table RSS (MB)':>14} | {'Table agg (s)':>13}"
+    )
+    print("-" * 75)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = os.path.join(tmp, f"sales_{rows}.txt")
+            write_sample_file(path, rows)
+
+            dict_rss, dict_time = run(DICT_PATH, path)
+            table_rss, table_time = run(TABLE_PATH, path)
+
+            print(
+                f"{rows:>10} | {dict_rss:>13.1f} | {dict_time:>12.3f} | "
+                f"{table_rss:>14.1f} | {table_time:>13.3f}"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/generate_sales_data.py
+#
+# Reproducible synthetic sales files in the data/sales_data.txt format,
+# from 1e5 up to 1e8 rows. With quirks enabled the output contains the
+# same irregularities as the real file, at realistic rates:
+# thousands separators in prices ("1,916"), commas in product names
+# ("Laptop,Premium"), missing regions, bad transaction/customer/product
+# IDs, zero quantities, negative prices and rows with the wrong number
+# of fields.
+#
+# Usage (from the project root):
+#     python benchmarks/generate_sales_data.py OUTPUT ROWS [--seed N] [--clean]
+
+import argparse
+import random
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region\n"
+REGIONS = ["North", "South", "East", "West"]
+
+# ProductID -> (plain name, name with an embedded comma, typical unit price)
+CATALOG = {
+    "P101": ("Laptop", "Laptop,Premium", 60000),
+    "P102": ("Mouse", "Mouse,Wireless", 800),
+    "P103": ("Keyboard", "Keyboard,Mechanical", 2000),
+    "P104": ("Monitor", "Monitor,LED", 12000),
+    "P105": ("Webcam", "Webcam,HD", 2500),
+    "P106": ("Headphones", "Headphones,Bluetooth", 2800),
+    "P107": ("USB Cable", "USB Cable,Type-C", 300),
+    "P108": ("External Hard Drive", "External Hard Drive,1TB", 4000),
+    "P109": ("Wireless Mouse", "Wireless Mouse,Gaming", 1000),
+    "P110": ("Laptop Charger", "Laptop Charger,65W", 2000)
+}
+PRODUCT_IDS = sorted(CATALOG)
+
+# Per-row probabilities of each quirk (only used when quirks are enabled)
+QUIRK_RATES = {
+    "thousands_separator": 0.3,   # applied to prices >= 1000
+    "comma_in_name": 0.25,
+    "missing_region": 0.01,
+    "bad_id": 0.03,
+    "zero_quantity": 0.02,
+    "negative_price": 0.01,
+    "wrong_field_count": 0.01
+}
+
+BATCH_ROWS = 10_000
+
+
+def format_price(price, rng, quirks):
+    """
+    Formats an integer price, sometimes with a thousands separator.
+    """
+    if quirks and price >= 1000 and rng.random() < QUIRK_RATES["thousands_separator"]:
+        return f"{price:,}"
+    return str(price)
+def make_row(i, rng, customers, days, quirks):
+    """
+    Returns one pipe-delimited sales line (with trailing newline).
+    """
+    product_id = rng.choice(PRODUCT_IDS)
+    name, comma_name, base_price = CATALOG[product_id]
+    quantity = rng.randint(1, 10)
+    price = max(1, int(base_price * rng.uniform(0.5, 1.5)))
+
+    fields = [
+        f"T{i:07d}",
+        f"2024-12-{rng.randint(1, days):02d}",
+        product_id,
+        name,
+        str(quantity),
+        None,
+        f"C{rng.randint(1, customers):05d}",
+        rng.choice(REGIONS)
+    ]
+
+    if quirks:
+        roll = rng.random
+        if roll() < QUIRK_RATES["comma_in_name"]:
+            fields[3] = comma_name
+        if roll() < QUIRK_RATES["zero_quantity"]:
+            fields[4] = "0"
+        if roll() < QUIRK_RATES["negative_price"]:
+            price = -price
+        if roll() < QUIRK_RATES["missing_region"]:
+            fields[7] = ""
+        if roll() < QUIRK_RATES["bad_id"]:
+            position = rng.choice((0, 2, 6))
+            fields[position] = "X" + fields[position][1:]
+
+    fields[5] = format_price(price, rng, quirks)
+
+    if quirks and rng.random() < QUIRK_RATES["wrong_field_count"]:
+        if rng.random() < 0.5:
+            fields.pop()
+        else:
+            fields.append("EXTRA")
+
+    return "|".join(fields) + "\n"
+def write_sample_file(path, rows, seed=42, quirks=False, customers=None, days=31):
+    """
+    Writes a synthetic pipe-delimited sales file with the given row count.
+    The same (rows, seed, quirks, customers, days) always produce the same
+    bytes. customers defaults to about one customer per 20 rows.
+    """
+    rng = random.Random(seed)
+    if customers is None:
+        customers = max(1, min(rows // 20, 99_999))
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(HEADER)
+        for start in range(0, rows, BATCH_ROWS):
+            stop = min(start + BATCH_ROWS, rows)
+            f.write("".join(make_row(i, rng, customers, days, quirks) for i in range(start, stop)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic sales data file")
+    parser.add_argument("output", help="path of the file to write")
+    parser.add_argument("rows", type=float, help="number of data rows, e.g. 1e6")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--customers", type=int, help="distinct customer IDs (default: rows / 20)")
+    parser.add_argument("--clean", action="store_true", help="write only well-formed rows")
+    args = parser.parse_args()
+
+    rows = int(args.rows)
+    write_sample_file(args.output, rows, args.seed, not args.clean, args.customers)
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,107 +1,510 @@
+import argparse
+
 from utils.data_processor import (
-    read_sales_data,
-    parse_transactions,
+    iter_sales_records,
+    iter_valid_transactions,
     validate_and_filter,
-    region_wise_sales,
-    top_selling_products,
-    customer_analysis
-)
-from utils.api_handler import fetch_all_products
-from utils.report_generator import (
-    create_report_file,
-    write_region_summary,
-    write_top_products,
-    write_customer_segments,
-    write_peak_sales_day
+    new_filter_stats,
+    print_filter_info,
+    filter_summary
 )
+from utils.agg_cache import AggregationCache, AGG_CACHE_DIR, source_fingerprint
+from utils.aggregator import Aggregator, default_accumulators
+from utils.api_handler import create_product_mapping, enrich_sales_data, iter_enriched
+from utils.catalog_cache import get_products, wait_for_revalidation, CACHE_STATS
+from utils.dataset import aggregate_dataset, normalize_date
+from utils.file_handler import new_decode_stats
+from utils.incremental import incremental_aggregate
+from utils.parallel import parallel_aggregate
+from utils.pipeline import overlapped_aggregate
+from utils.profiler import start_profile, stage
+from utils.report_generator import write_reports, REPORT_FORMATS
+from utils.rollup import RollupCube
+from utils.server import serve, DEFAULT_HOST, DEFAULT_PORT
+from utils.sketches import sketch_accumulators, approximate_results
+from utils.snapshot import load_sales_table
+from utils.sqlite_store import SQLiteStore, DEFAULT_DB
 
+DATA_FILE = "data/sales_data.txt"
 
-def main():
-    print("=" * 50)
-    print("SALES ANALYTICS SYSTEM – END TO END PIPELINE")
-    print("=" * 50)
+# Stages each run mode records (what --cprofile-stage can select)
+RUN_MODE_STAGES = {
+    "overlapped": ("fetch", "validate", "enrich", "aggregate", "report"),
+    "sequential": ("validate", "fetch", "enrich", "aggregate", "report"),
+    "parallel": ("aggregate", "report"),
+    "dataset": ("aggregate", "report"),
+    "cache": ("aggregate", "report"),
+    "incremental": ("aggregate", "report"),
+    "snapshot": ("load", "validate", "aggregate", "report"),
+    "sqlite": ("fetch", "load", "aggregate", "report"),
+    "serve": ()
+}
 
-    # [1/10] Read raw sales data
-    print("[1/10] Reading sales data file...")
-    raw_lines = read_sales_data("data/sales_data.txt")
 
-    # [2/10] Parse transactions
-    print("[2/10] Parsing transactions...")
-    transactions = parse_transactions(raw_lines)
+def date_arg(text):
+    """
+    argparse type for --start-date / --end-date.
+    """
+    try:
+        return normalize_date(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date as YYYY-MM-DD, got {text!r}")
+
+
+def parse_args():
+    """
+    Parses command line options for the pipeline.
+    """
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
+    parser.add_argument("--region", help="only include transactions from this region (East/West/North/South)")
+    parser.add_argument("--min-amount", type=float, help="minimum transaction amount (Quantity * UnitPrice)")
+    parser.add_argument("--max-amount", type=float, help="maximum transaction amount (Quantity * UnitPrice)")
+    # Run modes; the default overlapped mode is used when none is given
+    mode = parser.add_mutually_exclusive_group()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes for parsing and aggregation, on its own or with --dataset "
+             "(default: 1); revenue is summed "
+             "per chunk, which matches the serial run exactly for whole-number prices and within "
+             "float rounding (relative 1e-12) for fractional prices"
+    )
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only process data appended since the last run (checkpointed aggregates)"
+    )
+    mode.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="load parsed data from a memory-mapped binary snapshot (re-parsed only when the file changes) and aggregate whole columns"
+    )
+    mode.add_argument(
+        "--sqlite",
+        action="store_true",
+        help=f"stream validated transactions into an indexed SQLite database ({DEFAULT_DB}) and aggregate in SQL"
+    )
+    mode.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"reuse aggregates from earlier runs with the same data file and filters ({AGG_CACHE_DIR})"
+    )
+    mode.add_argument(
+        "--sequential",
+        action="store_true",
+        help="run read/validate, catalog fetch, enrichment and aggregation one after another instead of overlapped"
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="bounded-memory sketches for products and customers (default or --sequential mode); "
+             "top products are SpaceSaving estimates and segments become a distinct-customer estimate"
+    )
+    mode.add_argument(
+        "--dataset",
+        help="aggregate a directory or glob of sales files (.txt, .txt.gz, .txt.zst) instead of the sample file; "
+             "revenue is summed per file, exact for whole-number prices and within float rounding "
+             "(relative 1e-12) of one combined file for fractional prices"
+    )
+    parser.add_argument("--start-date", type=date_arg, help="with --dataset: first date to include (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=date_arg, help="with --dataset: last date to include (YYYY-MM-DD)")
+    mode.add_argument(
+        "--serve",
+        action="store_true",
+        help="load the data once and answer JSON queries over HTTP instead of writing a report"
+    )
+    parser.add_argument(
+        "--format",
+        action="append",
+        choices=sorted(REPORT_FORMATS),
+        help="report output format; repeat for several (default: txt)"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="output/profile/run_profile.json",
+        help="record per-stage timings and throughput to a JSON run profile"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="also trace per-stage peak memory with tracemalloc (several times slower, so timings are inflated)"
+    )
+    parser.add_argument(
+        "--cprofile-stage",
+        choices=["validate", "fetch", "enrich", "load", "aggregate", "report"],
+        help="also dump cProfile stats for this stage to output/profile/<stage>.prof"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="server bind address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="server port")
+    parser.add_argument("--socket", help="serve on this Unix socket path instead of TCP")
 
-    # [3/10] User-driven filters
-    min_amount = input("Enter minimum transaction amount (or press Enter to skip): ")
-    min_amount = float(min_amount) if min_amount else None
+    args = parser.parse_args()
+    run = run_mode(args)
+    if args.workers > 1 and not (args.dataset or run == "parallel"):
+        parser.error("--workers only applies on its own or with --dataset")
+    if args.approximate and run not in ("overlapped", "sequential"):
+        parser.error("--approximate only applies to the default and --sequential run modes")
+    if (args.start_date or args.end_date) and not args.dataset:
+        parser.error("--start-date and --end-date only apply with --dataset")
+    if args.start_date and args.end_date and args.start_date > args.end_date:
+        parser.error("--start-date is after --end-date")
+    if args.cprofile_stage and args.cprofile_stage not in RUN_MODE_STAGES[run]:
+        parser.error(f"--cprofile-stage {args.cprofile_stage}: the {run} run mode has no such stage")
+    return args
 
-    region = input("Enter region filter (East/West/North/South or press Enter to skip): ")
-    region = region if region else None
 
-    # [4/10] Validate & filter
+def run_mode(args):
+    """
+    Returns the RUN_MODE_STAGES key of the mode selected by the arguments.
+    """
+    for name in ("serve", "dataset", "cache", "incremental", "sqlite", "snapshot", "sequential"):
+        if getattr(args, name):
+            return name
+    if args.workers > 1:
+        return "parallel"
+    return "overlapped"
+
+
+def pipeline_accumulators(approximate=False):
+    """
+    Exact accumulators plus the rollup cube, or the bounded-memory
+    sketches with approximate=True.
+    """
+    if approximate:
+        return sketch_accumulators()
+    return default_accumulators() + [RollupCube()]
+
+
+def print_highlights(results, approximate=False):
+    """
+    Prints the peak week/month, or the sketch estimates, and returns the
+    results in report shape.
+    """
+    if not approximate:
+        cube = results["rollup"]
+        print("Peak Week:", cube.peak("week"), "| Peak Month:", cube.peak("month"))
+        return results
+
+    print("Distinct customers (approx.):", results["distinct_customers"])
+    print("Amount quantiles (approx.):", results["amount_quantiles"])
+    print("Top products by quantity (approx.):", results["heavy_products"])
+    return approximate_results(results)
+
+
+def run_serial(region, min_amount, max_amount=None, approximate=False):
+    """
+    Streams, validates, enriches and aggregates the data in one process.
+    Returns (results, summary)
+    """
+    # [1/10] + [2/10] Stream and parse raw sales data
+    print("[1/10] Reading sales data file...")
+    print("[2/10] Parsing transactions...")
+    decode_stats = new_decode_stats()
+    transactions = iter_sales_records(DATA_FILE, decode_stats)
+
+    # [4/10] Validate & filter (reading and parsing are streamed through this stage)
     print("[3/10] Validating and filtering transactions...")
-    valid_txns, invalid_count, summary = validate_and_filter(
-        transactions,
-        region=region,
-        min_amount=min_amount
-    )
+    with stage("validate") as record:
+        valid_txns, invalid_count, summary = validate_and_filter(
+            transactions,
+            region=region,
+            min_amount=min_amount,
+            max_amount=max_amount
+        )
+        record["rows_in"] = summary["total_input"]
+        record["rows_out"] = summary["final_count"]
+
+    summary["encoding"] = decode_stats["encoding"]
+    summary["undecodable_bytes"] = decode_stats["undecodable_bytes"]
 
     print("Filter Summary:", summary)
 
     # [5/10] Fetch product data from API
     print("[4/10] Fetching product data from API...")
-    products = fetch_all_products()
+    with stage("fetch") as record:
+        products = get_products()
+        record["rows_out"] = len(products)
+    print("Catalog Cache:", CACHE_STATS)
 
     # [6/10] Enrich transactions
     print("[5/10] Enriching transactions with product data...")
-    product_map = {p["id"]: p for p in products}
-
-    enriched = []
-    for txn in valid_txns:
-        product = product_map.get(txn["ProductID"], {})
-        txn.update({
-            "ProductTitle": product.get("title"),
-            "Category": product.get("category"),
-            "Brand": product.get("brand"),
-            "API_Price": product.get("price"),
-            "Rating": product.get("rating")
-        })
-        enriched.append(txn)
+    with stage("enrich", rows_in=len(valid_txns)) as record:
+        enriched = enrich_sales_data(valid_txns, create_product_mapping(products))
+        record["rows_out"] = len(enriched)
 
     print(f"Enriched transactions: {len(enriched)}")
 
-    # [7/10] Generate analytics
-    region_summary = region_wise_sales(enriched)
-    top_products = top_selling_products(enriched)
-    customers = customer_analysis(enriched)
-    peak_day = max(
-        enriched,
-        key=lambda x: x["Quantity"] * x["UnitPrice"],
-        default=None
+    # [7/10] Generate analytics (single pass over all metrics)
+    with stage("aggregate", rows_in=len(enriched)):
+        results = Aggregator(pipeline_accumulators(approximate)).consume(enriched).results()
+        results = print_highlights(results, approximate)
+
+    return results, summary
+
+
+def run_snapshot(region, min_amount, max_amount=None):
+    """
+    Loads the memory-mapped snapshot (re-parsing only when the data file
+    changed), then validates, filters and aggregates whole columns with
+    NumPy instead of per-row dictionaries. Row-level enrichment is
+    skipped because it does not change the aggregates.
+    Returns (results, summary)
+    """
+    print("[1/10] Loading sales data snapshot...")
+    decode_stats = new_decode_stats()
+    with stage("load") as record:
+        table = load_sales_table(DATA_FILE, decode_stats=decode_stats)
+        record["rows_out"] = len(table)
+
+    print("[2/10] Validating and filtering columns...")
+    stats = new_filter_stats()
+    with stage("validate", rows_in=len(table)) as record:
+        valid = table.validate(stats, region, min_amount, max_amount)
+        record["rows_out"] = len(valid)
+
+    print_filter_info(stats)
+    summary = filter_summary(stats, decode_stats)
+    print("Filter Summary:", summary)
+
+    print("[3/10] Aggregating columns...")
+    with stage("aggregate", rows_in=len(valid)):
+        results = valid.results()
+        results["rollup"] = valid.rollup_cube()
+        results = print_highlights(results)
+
+    return results, summary
+
+
+def run_sqlite(region, min_amount, max_amount=None):
+    """
+    Fetches the catalog, then streams validated rows (enriched one at a
+    time) straight into the SQLite store in BATCH_SIZE batches, so no
+    Python list of transactions is built. Aggregates run in SQL.
+    Returns (results, summary)
+    """
+    print("[1/10] Fetching product data from API...")
+    with stage("fetch") as record:
+        products = get_products()
+        record["rows_out"] = len(products)
+    print("Catalog Cache:", CACHE_STATS)
+
+    print("[2/10] Streaming validated, enriched transactions into SQLite...")
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    store = SQLiteStore(DEFAULT_DB)
+    store.clear()
+
+    with stage("load") as record:
+        valid_txns = iter_valid_transactions(
+            iter_sales_records(DATA_FILE, decode_stats), stats, region, min_amount, max_amount
+        )
+        record["rows_out"] = store.load(iter_enriched(valid_txns, create_product_mapping(products)))
+        record["rows_in"] = stats["total_input"]
+
+    print_filter_info(stats)
+    summary = filter_summary(stats, decode_stats)
+    print("Filter Summary:", summary)
+
+    print("[3/10] Aggregating in SQL...")
+    with stage("aggregate", rows_in=summary["final_count"]):
+        results = store.results()
+    store.close()
+
+    return results, summary
+
+
+def run_overlapped(region, min_amount, max_amount=None, approximate=False):
+    """
+    Fetches the catalog in the background while the data file is streamed,
+    validated and handed to enrichment and aggregation in batches.
+    Returns (results, summary)
+    """
+    print("[1/10] Fetching product data from API in the background...")
+    print("[2/10] Reading, parsing and validating sales data...")
+    print("[3/10] Enriching and aggregating transaction batches as they arrive...")
+    aggregator, summary = overlapped_aggregate(
+        DATA_FILE,
+        region=region,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        accumulators=pipeline_accumulators(approximate)
     )
 
-    # [8/10] Generate report
-    print("[6/10] Generating sales report...")
-    report_path = "output/sales_report.txt"
-    create_report_file(report_path, len(transactions))
+    print("Filter Summary:", summary)
+    print("Catalog Cache:", CACHE_STATS)
+    print(f"Enriched transactions: {aggregator.count}")
 
-    write_region_summary(report_path, region_summary)
-    write_top_products(report_path, top_products)
-    write_customer_segments(report_path, customers)
-    write_peak_sales_day(report_path, peak_day)
+    results = print_highlights(aggregator.results(), approximate)
 
-    print("[10/10] Process complete!")
-    print("Report saved at:", report_path)
+    return results, summary
 
 
-if __name__ == "__main__":
-    main()
+def run_cached(region, min_amount, max_amount=None):
+    """
+    Returns the aggregates from the on-disk aggregation cache when the data
+    file bytes and filters match an earlier run; otherwise validates and
+    aggregates once and stores the results. Row-level enrichment is
+    skipped because it does not change the aggregates.
+    Returns (results, summary)
+    """
+    print("[2/10] Looking up cached aggregates...")
+    cache = AggregationCache(disk_dir=AGG_CACHE_DIR)
+    decode_stats = new_decode_stats()
 
+    with stage("aggregate") as record:
+        results = cache.get_results(
+            iter_sales_records(DATA_FILE, decode_stats),
+            region=region,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            fingerprint=source_fingerprint(DATA_FILE),
+            decode_stats=decode_stats
+        )
+        summary = results["summary"]
+        record["rows_out"] = summary["final_count"]
 
+    print("Filter Summary:", summary)
+    print("Aggregation Cache:", cache.stats())
 
+    return results, summary
 
 
+def run_parallel(workers, region, min_amount, max_amount=None):
+    """
+    Parses, validates and aggregates byte ranges of the data file
+    across worker processes. Row-level enrichment is skipped because
+    only merged aggregates come back from the workers.
+    Returns (results, summary)
+    """
+    print(f"[2/10] Parsing and aggregating with {workers} workers...")
+    with stage("aggregate") as record:
+        aggregator, summary = parallel_aggregate(
+            DATA_FILE,
+            workers,
+            region=region,
+            min_amount=min_amount,
+            max_amount=max_amount
+        )
+        record["rows_in"] = summary["total_input"]
+        record["rows_out"] = summary["final_count"]
 
+    print("Filter Summary:", summary)
 
+    return aggregator.results(), summary
 
 
+def run_incremental(region, min_amount, max_amount=None):
+    """
+    Processes only the tail appended since the last checkpoint and merges it
+    into the saved aggregates. Row-level enrichment is skipped because
+    earlier rows are only kept as aggregates.
+    Returns (results, summary)
+    """
+    print("[2/10] Parsing and aggregating new data since last checkpoint...")
+    with stage("aggregate") as record:
+        aggregator, summary = incremental_aggregate(
+            DATA_FILE,
+            region=region,
+            min_amount=min_amount,
+            max_amount=max_amount
+        )
+        record["rows_out"] = summary["final_count"]
 
+    print("Filter Summary:", summary)
+
+    return aggregator.results(), summary
+
+
+def run_dataset(source, workers, region, min_amount, max_amount, start_date, end_date):
+    """
+    Aggregates a multi-file dataset, pruning files by date partition and
+    reading them concurrently. Row-level enrichment is skipped because
+    only merged aggregates come back from the workers.
+    Returns (results, summary)
+    """
+    print(f"[2/10] Parsing and aggregating dataset {source} with {workers} workers...")
+    with stage("aggregate") as record:
+        aggregator, summary = aggregate_dataset(
+            source,
+            workers,
+            region=region,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            start_date=start_date,
+            end_date=end_date
+        )
+        record["rows_in"] = summary["total_input"]
+        record["rows_out"] = summary["final_count"]
+
+    print("Filter Summary:", summary)
 
+    return aggregator.results(), summary
+
+
+def main():
+    args = parse_args()
+
+    if args.serve:
+        serve(DATA_FILE, args.host, args.port, args.socket)
+        return
+
+    print("=" * 50)
+    print("SALES ANALYTICS SYSTEM – END TO END PIPELINE")
+    print("=" * 50)
+
+    # [3/10] Filters come from the command line so runs are non-interactive
+    region = args.region or None
+    min_amount = args.min_amount
+    max_amount = args.max_amount
+
+    profile = None
+    if args.profile or args.profile_memory or args.cprofile_stage:
+        profile = start_profile(trace_memory=args.profile_memory, cprofile_stage=args.cprofile_stage)
+
+    run = run_mode(args)
+    if run == "dataset":
+        results, summary = run_dataset(
+            args.dataset, args.workers, region, min_amount, max_amount, args.start_date, args.end_date
+        )
+    elif run == "cache":
+        results, summary = run_cached(region, min_amount, max_amount)
+    elif run == "incremental":
+        results, summary = run_incremental(region, min_amount, max_amount)
+    elif run == "parallel":
+        results, summary = run_parallel(args.workers, region, min_amount, max_amount)
+    elif run == "sqlite":
+        results, summary = run_sqlite(region, min_amount, max_amount)
+    elif run == "snapshot":
+        results, summary = run_snapshot(region, min_amount, max_amount)
+    elif run == "sequential":
+        results, summary = run_serial(region, min_amount, max_amount, args.approximate)
+    else:
+        results, summary = run_overlapped(region, min_amount, max_amount, args.approximate)
+
+    # [8/10] Generate report
+    print("[6/10] Generating sales report...")
+    with stage("report"):
+        report_paths = write_reports(
+            results,
+            summary["total_input"],
+            "output/sales_report.txt",
+            args.format or ["txt"]
+        )
+
+    # A stale catalog is refreshed in the background; let it finish
+    wait_for_revalidation()
+
+    print("[10/10] Process complete!")
+    print("Report saved at:", ", ".join(report_paths))
+
+    if profile:
+        profile.close()
+        profile.print_summary()
+        if args.profile or args.profile_memory:
+            print("Run profile saved at:", profile.save(args.profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# tests/catalog_stub.py
+#
+# Local DummyJSON-style catalog server for the catalog tests and
+# benchmarks/bench_catalog_fetch.py: limit/skip/select pagination, an ETag
+# per response body like DummyJSON's (If-None-Match -> 304), so changing
+# one product only changes its own page's ETag; optional per-request
+# latency and injected failure statuses.
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_catalog(product_count, version=1):
+    return [
+        {
+            "id": i,
+            "title": f"Product {i}" + ("" if version == 1 else f" v{version}"),
+            "category": "electronics",
+            "brand": "Acme",
+            "price": 10 + i % 90,
+            "rating": 4.5,
+            "description": "x" * 200
+        }
+        for i in range(1, product_count + 1)
+    ]
+def page_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+def make_handler(stub):
+    class CatalogHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            status = stub.record(self.path, dict(self.headers))
+            time.sleep(stub.latency)
+
+            if status is not None:
+                self._send(status, b'{"message": "injected failure"}')
+                return
+
+            query = parse_qs(urlparse(self.path).query)
+            skip = int(query.get("skip", ["0"])[0])
+            limit = int(query.get("limit", ["30"])[0])
+            fields = query.get("select", [""])[0].split(",")
+
+            catalog = stub.products
+            page = [
+                {"id": p["id"], **{f: p.get(f) for f in fields if f}}
+                for p in catalog[skip:skip + limit]
+            ]
+            body = json.dumps({
+                "products": page,
+                "total": len(catalog),
+                "skip": skip,
+                "limit": limit
+            }).encode("utf-8")
+
+            etag = page_etag(body)
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+
+            self._send(200, body, {"ETag": etag})
+
+    return CatalogHandler
+
+
+class StubCatalog:
+    """
+    Threaded catalog server on an ephemeral localhost port.
+    failures: status codes returned (in order) by the next requests.
+    requests: (path, headers) of every request received.
+    """
+
+    def __init__(self, product_count=250, latency=0.0):
+        self.product_count = product_count
+        self.latency = latency
+        self.version = 1
+        self.products = make_catalog(product_count)
+        self.failures = []
+        self.requests = []
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(self))
+        self.url = f"http://127.0.0.1:{self.server.server_port}/products"
+
+    def record(self, path, headers):
+        """
+        Logs a request. Returns the injected failure status, or None.
+        """
+        with self._lock:
+            self.requests.append((path, headers))
+            return self.failures.pop(0) if self.failures else None
+
+    def update(self, product_ids=None):
+        """
+        Publishes a new catalog version: new titles for the given product
+        ids (all by default), which changes the ETags of their pages.
+        """
+        self.version += 1
+        updated = make_catalog(self.product_count, self.version)
+        self.products = [
+            new if product_ids is None or new["id"] in product_ids else old
+            for old, new in zip(self.products, updated)
+        ]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
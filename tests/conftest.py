@@ -0,0 +1,100 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from catalog_stub import StubCatalog  # noqa: E402
+from generate_sales_data import write_sample_file  # noqa: E402
+from utils.aggregator import Aggregator  # noqa: E402
+from utils.file_handler import new_decode_stats  # noqa: E402
+from utils.data_processor import (  # noqa: E402
+    iter_sales_records,
+    iter_valid_transactions,
+    new_filter_stats,
+    filter_summary
+)
+
+SAMPLE_FILE = os.path.join(ROOT, "data", "sales_data.txt")
+FLOAT_TOLERANCE = 1e-12  # relative; partial float sums merged per chunk/file/run
+
+
+def approx_results(value):
+    """
+    Wraps every float in nested results with pytest.approx at
+    FLOAT_TOLERANCE; keys, order, counts and strings still compare exactly.
+    """
+    if isinstance(value, float):
+        return pytest.approx(value, rel=FLOAT_TOLERANCE)
+    if isinstance(value, dict):
+        return {key: approx_results(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [approx_results(item) for item in value]
+    return value
+
+
+def serial_results(path, **filters):
+    """
+    Reference single-pass run over one file.
+    Returns (results, filter summary with encoding and undecodable_bytes)
+    """
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    aggregator = Aggregator().consume(
+        iter_valid_transactions(iter_sales_records(path, decode_stats), stats, **filters)
+    )
+    return aggregator.results(), filter_summary(stats, decode_stats)
+
+
+@pytest.fixture
+def sales_file(tmp_path):
+    """
+    A 3,000-row synthetic file with the sample data's quirks.
+    """
+    path = str(tmp_path / "sales.txt")
+    write_sample_file(path, 3000, seed=7, quirks=True, customers=200)
+    return path
+
+
+@pytest.fixture
+def fractional_sales_file(tmp_path):
+    """
+    Like sales_file, but every valid price gets a fractional part so float
+    sums depend on the order they are added in.
+    """
+    source = str(tmp_path / "whole.txt")
+    write_sample_file(source, 3000, seed=11, customers=200)
+
+    path = str(tmp_path / "fractional.txt")
+    with open(source, encoding="utf-8") as src, open(path, "w", encoding="utf-8") as dst:
+        dst.write(src.readline())
+        for i, line in enumerate(src):
+            fields = line.rstrip("\n").split("|")
+            fields[5] = f"{fields[5]}.{(i * 37) % 100:02d}"
+            dst.write("|".join(fields) + "\n")
+    return path
+
+
+@pytest.fixture
+def catalog_server():
+    """
+    A 250-product stub catalog on a localhost port.
+    """
+    server = StubCatalog(250).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    """
+    Shrinks the retry backoff so failure tests finish quickly.
+    """
+    import utils.api_handler
+
+    monkeypatch.setattr(utils.api_handler, "RETRY_BACKOFF", 0.01)
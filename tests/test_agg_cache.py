@@ -0,0 +1,68 @@
+# tests/test_agg_cache.py
+
+import pytest
+
+from utils.agg_cache import AggregationCache, dataset_fingerprint, source_fingerprint
+from utils.data_processor import (
+    iter_sales_records,
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    low_performing_products
+)
+from utils.file_handler import new_decode_stats
+
+
+def test_generator_input_is_not_consumed_by_fingerprinting(sales_file):
+    cache = AggregationCache()
+
+    from_generator = cache.get_results(iter_sales_records(sales_file))
+    from_list = cache.get_results(list(iter_sales_records(sales_file)))
+
+    assert from_generator["summary"]["total_input"] > 0
+    assert from_generator["total_revenue"] > 0
+    assert from_list == from_generator
+
+
+def test_dataset_fingerprint_rejects_iterators(sales_file):
+    with pytest.raises(TypeError):
+        dataset_fingerprint(iter_sales_records(sales_file))
+
+
+def test_source_fingerprint_skips_parsing_on_hit(sales_file, tmp_path):
+    fingerprint = source_fingerprint(sales_file)
+    first = AggregationCache(disk_dir=str(tmp_path / "aggregates")).get_results(
+        iter_sales_records(sales_file), region="East", fingerprint=fingerprint
+    )
+
+    # A fresh process-level cache is served from disk without reading rows
+    cache = AggregationCache(disk_dir=str(tmp_path / "aggregates"))
+    assert cache.get_results(iter([]), region="East", fingerprint=fingerprint) == first
+    assert cache.stats()["disk"]["hits"] == 1
+
+
+def test_cache_hits_report_the_encoding_of_the_miss(sales_file, tmp_path):
+    fingerprint = source_fingerprint(sales_file)
+    decode_stats = new_decode_stats()
+    first = AggregationCache(disk_dir=str(tmp_path / "aggregates")).get_results(
+        iter_sales_records(sales_file, decode_stats), fingerprint=fingerprint, decode_stats=decode_stats
+    )
+    assert first["summary"]["encoding"] == decode_stats["encoding"] == "utf-8"
+    assert first["summary"]["undecodable_bytes"] == 0
+
+    cache = AggregationCache(disk_dir=str(tmp_path / "aggregates"))
+    assert cache.get_results(iter([]), fingerprint=fingerprint, decode_stats=new_decode_stats()) == first
+
+
+def test_accessors_match_data_processor_functions(sales_file):
+    transactions = list(iter_sales_records(sales_file))
+    cache = AggregationCache()
+
+    assert cache.calculate_total_revenue(transactions) == calculate_total_revenue(transactions)
+    assert cache.region_wise_sales(transactions) == region_wise_sales(transactions)
+    assert cache.top_selling_products(transactions, 3) == top_selling_products(transactions, 3)
+    assert cache.customer_analysis(transactions) == customer_analysis(transactions)
+    assert cache.daily_sales_trend(transactions) == daily_sales_trend(transactions)
+    assert cache.low_performing_products(transactions, 50) == low_performing_products(transactions, 50)
@@ -0,0 +1,80 @@
+# tests/test_api_handler.py
+
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import utils.api_handler
+from utils.api_handler import (
+    create_session,
+    fetch_products_page,
+    fetch_product_pages,
+    fetch_all_products,
+    MAX_RETRIES,
+    PRODUCT_FIELDS
+)
+
+
+def page_skips(server):
+    return sorted(int(parse_qs(urlparse(path).query)["skip"][0]) for path, _ in server.requests)
+
+
+@pytest.mark.parametrize("page_size, workers", [(100, 1), (100, 4), (30, 8), (250, 4), (1000, 2)])
+def test_pages_are_fetched_once_and_kept_in_order(catalog_server, page_size, workers):
+    products = fetch_product_pages(catalog_server.url, page_size=page_size, max_workers=workers)
+
+    assert [p["id"] for p in products] == list(range(1, 251))
+    assert page_skips(catalog_server) == list(range(0, 250, page_size))
+    assert set(products[0]) == {"id"} | set(PRODUCT_FIELDS)
+
+
+def test_only_selected_fields_are_requested(catalog_server):
+    products = fetch_product_pages(catalog_server.url, fields=["title"])
+
+    assert products[0] == {"id": 1, "title": "Product 1"}
+    assert all(parse_qs(urlparse(path).query)["select"] == ["title"] for path, _ in catalog_server.requests)
+
+
+def test_transient_failures_are_retried_with_backoff(catalog_server, monkeypatch):
+    monkeypatch.setattr(utils.api_handler, "RETRY_BACKOFF", 0.05)
+    catalog_server.failures = [503, 429]
+
+    start = time.perf_counter()
+    products = fetch_product_pages(catalog_server.url, max_workers=1)
+    elapsed = time.perf_counter() - start
+
+    assert len(products) == 250
+    assert len(catalog_server.requests) == 3 + 2
+    # Backoff doubles: 0.05 s then 0.1 s
+    assert elapsed >= 0.15
+
+
+def test_retries_give_up_after_max_retries(catalog_server, fast_retries):
+    catalog_server.failures = [500] * (MAX_RETRIES + 1)
+    session = create_session()
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        fetch_products_page(session, catalog_server.url, 0, 100)
+    session.close()
+
+    assert len(catalog_server.requests) == MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried(catalog_server, fast_retries):
+    catalog_server.failures = [404]
+
+    assert fetch_all_products(catalog_server.url) == []
+    assert len(catalog_server.requests) == 1
+
+
+def test_failure_on_a_later_page_fails_the_fetch(catalog_server, fast_retries):
+    # First page succeeds, then every retry of the next page fails
+    catalog_server.failures = [None] + [502] * (MAX_RETRIES + 1)
+
+    assert fetch_all_products(catalog_server.url, max_workers=1) == []
+
+
+def test_unreachable_server_returns_empty_catalog(fast_retries):
+    assert fetch_all_products("http://127.0.0.1:9/products") == []
@@ -0,0 +1,145 @@
+# tests/test_catalog_cache.py
+
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from utils.catalog_cache import get_products, load_cache, wait_for_revalidation, CACHE_STATS
+
+HOUR = 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    for key in CACHE_STATS:
+        CACHE_STATS[key] = 0
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "products.json")
+
+
+def age_cache(cache_path, seconds):
+    with open(cache_path, encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["fetched_at"] = time.time() - seconds
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+
+def sent_etags(server):
+    """
+    Returns {skip: If-None-Match header} of the requests received.
+    """
+    return {
+        int(parse_qs(urlparse(path).query)["skip"][0]): headers.get("If-None-Match")
+        for path, headers in server.requests
+    }
+
+
+def test_miss_then_fresh_hit(catalog_server, cache_path):
+    products = get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=HOUR)
+    requests_after_miss = len(catalog_server.requests)
+
+    assert len(products) == 250
+    assert [page["skip"] for page in load_cache(cache_path)["pages"]] == [0, 100, 200]
+
+    assert get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=HOUR) == products
+    assert len(catalog_server.requests) == requests_after_miss
+    assert CACHE_STATS["misses"] == 1
+    assert CACHE_STATS["hits"] == 1
+
+
+def test_expired_entry_revalidates_every_page_with_its_etag(catalog_server, cache_path):
+    products = get_products(catalog_server.url, cache_path)
+    pages = load_cache(cache_path)["pages"]
+    age_cache(cache_path, 2 * HOUR)
+    catalog_server.requests.clear()
+
+    assert get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=0) == products
+
+    # One conditional request per page, all answered with 304
+    assert sent_etags(catalog_server) == {page["skip"]: page["etag"] for page in pages}
+    assert len({page["etag"] for page in pages}) == 3
+    assert CACHE_STATS["revalidated"] == 1
+    assert time.time() - load_cache(cache_path)["fetched_at"] < HOUR
+
+
+def test_changed_catalog_is_refetched(catalog_server, cache_path):
+    get_products(catalog_server.url, cache_path)
+    age_cache(cache_path, 2 * HOUR)
+    catalog_server.update()
+
+    products = get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=0)
+
+    assert products[0]["title"] == "Product 1 v2"
+    assert CACHE_STATS["refreshed"] == 2
+    assert products == get_products(catalog_server.url, str(cache_path) + ".fresh")
+
+
+def test_change_on_a_later_page_is_picked_up(catalog_server, cache_path):
+    old = get_products(catalog_server.url, cache_path)
+    old_pages = load_cache(cache_path)["pages"]
+    age_cache(cache_path, 2 * HOUR)
+    catalog_server.update(product_ids={150})
+    catalog_server.requests.clear()
+
+    products = get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=0)
+
+    assert products[149]["title"] == "Product 150 v2"
+    assert products[:149] == old[:149] and products[150:] == old[150:]
+    assert len(catalog_server.requests) == 3
+    pages = load_cache(cache_path)["pages"]
+    assert [page["etag"] == old_page["etag"] for page, old_page in zip(pages, old_pages)] == [True, False, True]
+    assert CACHE_STATS["refreshed"] == 2
+
+
+def test_changed_total_refetches_the_pagination(catalog_server, cache_path):
+    get_products(catalog_server.url, cache_path)
+    age_cache(cache_path, 2 * HOUR)
+    catalog_server.products = catalog_server.products[:180]
+
+    products = get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=0)
+
+    assert [p["id"] for p in products] == list(range(1, 181))
+    assert [page["skip"] for page in load_cache(cache_path)["pages"]] == [0, 100]
+
+
+def test_stale_entry_is_served_while_revalidating(catalog_server, cache_path):
+    old = get_products(catalog_server.url, cache_path)
+    age_cache(cache_path, 1.5 * HOUR)
+    catalog_server.update()
+    catalog_server.latency = 0.2
+
+    start = time.perf_counter()
+    served = get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=HOUR)
+
+    assert served == old
+    assert time.perf_counter() - start < 0.2
+    assert CACHE_STATS["stale"] == 1
+
+    assert wait_for_revalidation(timeout=10)
+    assert load_cache(cache_path)["products"][0]["title"] == "Product 1 v2"
+
+
+def test_failed_revalidation_falls_back_to_stale_copy(catalog_server, cache_path, fast_retries):
+    products = get_products(catalog_server.url, cache_path)
+    age_cache(cache_path, 3 * HOUR)
+    catalog_server.failures = [500] * 10
+
+    assert get_products(catalog_server.url, cache_path, ttl=HOUR, stale_window=HOUR) == products
+    assert CACHE_STATS["errors"] == 1
+    assert CACHE_STATS["stale"] == 1
+
+
+def test_entry_for_another_url_is_ignored(catalog_server, cache_path):
+    get_products(catalog_server.url, cache_path)
+    catalog_server.requests.clear()
+
+    get_products(catalog_server.url + "?other", cache_path)
+
+    assert CACHE_STATS["misses"] == 2
+    assert catalog_server.requests
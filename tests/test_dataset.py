@@ -0,0 +1,173 @@
+# tests/test_dataset.py
+
+import gzip
+import os
+
+import pytest
+
+from conftest import approx_results, serial_results
+from utils.data_processor import iter_sales_records
+from utils.dataset import aggregate_dataset, partition_date, normalize_date
+
+LAYOUTS = {
+    "hive": lambda y, m, d: f"date={y}-{m}-{d}/sales.txt",
+    "file": lambda y, m, d: f"{y}-{m}-{d}.txt.gz",
+    "nested": lambda y, m, d: f"{y}/{m}/{d}/sales.txt",
+    "compact": lambda y, m, d: f"date={y}{m}{d}/sales.txt"
+}
+
+
+def split_dataset(source, directory, parts=5):
+    """
+    Writes the source rows as `parts` files (every other one gzipped), in
+    sorted path order.
+    """
+    with open(source, encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+
+    os.makedirs(directory)
+    size = -(-len(rows) // parts)
+    for part in range(parts):
+        text = "\n".join([header] + rows[part * size:(part + 1) * size]) + "\n"
+        path = os.path.join(directory, f"part_{part:02d}.txt")
+        if part % 2:
+            with gzip.open(path + ".gz", "wt", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+    return directory
+
+
+def partition_dataset(source, directory, layout):
+    """
+    Writes one file per Date value under the given LAYOUTS path.
+    Returns the sorted dates
+    """
+    with open(source, encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+
+    by_date = {}
+    for row in rows:
+        by_date.setdefault(row.split("|")[1], []).append(row)
+
+    for date, date_rows in by_date.items():
+        path = os.path.join(directory, LAYOUTS[layout](*date.split("-")))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        text = "\n".join([header] + date_rows) + "\n"
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+
+    return sorted(by_date)
+
+
+def write_date_range(source, path, start_date, end_date, by_date=False):
+    """
+    Copies the rows dated within [start_date, end_date] to path, grouped
+    by date (the partitioned files' order) with by_date=True.
+    """
+    with open(source, encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+
+    rows = [row for row in rows if start_date <= row.split("|")[1] <= end_date]
+    if by_date:
+        rows.sort(key=lambda row: row.split("|")[1])
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join([header] + rows) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("filters", [{}, {"region": "West", "max_amount": 100000}])
+def test_whole_number_prices_match_one_file_exactly(sales_file, tmp_path, workers, filters):
+    directory = split_dataset(sales_file, str(tmp_path / "daily"))
+    expected_results, expected_summary = serial_results(sales_file, **filters)
+
+    aggregator, summary = aggregate_dataset(directory, workers, **filters)
+
+    assert summary["files"] == 5
+    assert {key: summary[key] for key in expected_summary} == expected_summary
+    assert aggregator.results() == expected_results
+
+
+def test_fractional_prices_match_one_file_within_tolerance(fractional_sales_file, tmp_path):
+    directory = split_dataset(fractional_sales_file, str(tmp_path / "daily"))
+    expected_results, expected_summary = serial_results(fractional_sales_file)
+
+    aggregator, summary = aggregate_dataset(directory, 2)
+
+    assert {key: summary[key] for key in expected_summary} == expected_summary
+    assert aggregator.results() == approx_results(expected_results)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("daily/date=2024-12-01/store_1.txt", "2024-12-01"),
+    ("daily/2024-12-01.txt.gz", "2024-12-01"),
+    ("daily/2024/12/01/part-0.txt.zst", "2024-12-01"),
+    ("daily/date=20241201/part-0.txt", "2024-12-01"),
+    ("daily/2024-11-30/backfill/2024-12-01.txt", "2024-12-01"),
+    ("daily/store_7.txt", None),
+    ("daily/2024-13-01.txt", None),
+    ("daily/2024-12-32.txt", None),
+    ("daily/120241201.txt", None),
+    ("daily/2024-12/01.txt", None)
+])
+def test_partition_date_layouts(path, expected):
+    assert partition_date(path) == expected
+
+
+@pytest.mark.parametrize("layout", sorted(LAYOUTS))
+def test_files_outside_the_date_range_are_pruned(sales_file, tmp_path, layout):
+    directory = str(tmp_path / "daily")
+    dates = partition_dataset(sales_file, directory, layout)
+    expected_results, expected_summary = serial_results(
+        write_date_range(sales_file, str(tmp_path / "week.txt"), "2024-12-05", "2024-12-11", by_date=True)
+    )
+
+    aggregator, summary = aggregate_dataset(directory, 2, start_date="2024-12-05", end_date="2024-12-11")
+
+    assert summary["files"] == 7
+    assert summary["files_pruned"] == len(dates) - 7
+    assert summary["filtered_by_date"] == 0
+    assert {key: summary[key] for key in expected_summary} == expected_summary
+    assert aggregator.results() == expected_results
+
+
+def test_rows_outside_the_date_range_are_counted(sales_file, tmp_path):
+    outside = sum(1 for txn in iter_sales_records(sales_file) if txn["Date"] < "2024-12-10")
+    expected = serial_results(write_date_range(sales_file, str(tmp_path / "late.txt"), "2024-12-10", "9999-12-31"))
+
+    aggregator, summary = aggregate_dataset(sales_file, 1, start_date="2024-12-10")
+
+    assert outside > 0
+    assert summary["files_pruned"] == 0
+    assert summary["filtered_by_date"] == outside
+    assert (aggregator.results(), {key: summary[key] for key in expected[1]}) == expected
+
+
+def test_dates_are_validated_and_zero_padded(sales_file):
+    assert normalize_date("2024-12-1") == "2024-12-01"
+    for text in ("2024-13-01", "2024-02-30", "12/01/2024", "yesterday"):
+        with pytest.raises(ValueError):
+            normalize_date(text)
+
+    padded, _ = aggregate_dataset(sales_file, 1, start_date="2024-12-01", end_date="2024-12-09")
+    shorthand, _ = aggregate_dataset(sales_file, 1, start_date="2024-12-1", end_date="2024-12-9")
+    assert shorthand.results() == padded.results()
+
+
+def test_summary_lists_each_files_encoding(sales_file, tmp_path):
+    directory = split_dataset(sales_file, str(tmp_path / "daily"))
+    with open(sales_file, encoding="utf-8") as f:
+        header = f.readline()
+    with open(os.path.join(directory, "part-9.txt"), "wb") as f:
+        f.write((header + "T99999|2024-12-01|P101|Mouse – Pro|1|500|C001|East\n").encode("cp1252"))
+
+    _, summary = aggregate_dataset(directory, 2)
+
+    assert summary["files"] == 6
+    assert summary["encoding"] == "cp1252, utf-8"
+    assert summary["undecodable_bytes"] == 0
@@ -0,0 +1,82 @@
+# tests/test_external_groupby.py
+
+import os
+
+import pytest
+
+from utils.data_processor import (
+    iter_sales_records,
+    iter_valid_transactions,
+    new_filter_stats,
+    customer_analysis,
+    top_selling_products
+)
+from utils.external_groupby import (
+    ExternalGroupBy,
+    GROUP_BYTES,
+    MAX_MERGE_RUNS,
+    customer_analysis_external,
+    top_selling_products_external
+)
+
+TINY_BUDGET = 20 * GROUP_BYTES  # spills every 20 new groups
+
+
+def _valid(path):
+    return list(iter_valid_transactions(iter_sales_records(path), new_filter_stats()))
+
+
+def _approx(rows):
+    return [
+        {key: pytest.approx(value, rel=1e-12) if isinstance(value, float) else value for key, value in row.items()}
+        for row in rows
+    ]
+
+
+def test_tiny_budget_spills_and_matches_in_memory(sales_file, tmp_path):
+    transactions = _valid(sales_file)
+    spill_dir = str(tmp_path / "spill")
+
+    with ExternalGroupBy("CustomerID", TINY_BUDGET, spill_dir) as groups:
+        groups.consume(transactions)
+        assert len(groups.runs) > MAX_MERGE_RUNS  # exercises the multi-pass merge
+
+    # Whole-number amounts: partial sums are exact, so results are identical
+    assert customer_analysis_external(transactions, TINY_BUDGET, spill_dir) == customer_analysis(transactions)
+    for top_n in (1, 5, 20):
+        assert top_selling_products_external(transactions, top_n, GROUP_BYTES, spill_dir) == \
+            top_selling_products(transactions, top_n)
+
+    assert os.listdir(spill_dir) == []
+
+
+def test_fractional_amounts_match_within_float_rounding(fractional_sales_file):
+    transactions = _valid(fractional_sales_file)
+
+    external = customer_analysis_external(transactions, TINY_BUDGET)
+    assert external == _approx(customer_analysis(transactions))
+    assert top_selling_products_external(transactions, 5, GROUP_BYTES) == \
+        _approx(top_selling_products(transactions, 5))
+
+
+def test_runs_grow_with_groups_not_rows(sales_file):
+    transactions = _valid(sales_file) * 5
+
+    with ExternalGroupBy("Region", TINY_BUDGET) as groups:
+        groups.consume(transactions)
+        # Four hot keys fit in the budget however many rows they have
+        assert groups.runs == []
+        assert [group[2] for group in groups.iter_groups()] == [
+            sum(1 for txn in transactions if txn["Region"] == key)
+            for key in dict.fromkeys(txn["Region"] for txn in transactions)
+        ]
+
+
+def test_first_seen_order_can_be_read_twice(sales_file):
+    transactions = _valid(sales_file)
+
+    with ExternalGroupBy("CustomerID", TINY_BUDGET) as groups:
+        groups.consume(transactions)
+        first = list(groups.iter_first_seen())
+        assert list(groups.iter_first_seen()) == first
+        assert [group[0] for group in first] == [row["CustomerID"] for row in customer_analysis(transactions)]
@@ -0,0 +1,106 @@
+# tests/test_file_handler.py
+
+import codecs
+
+import pytest
+
+from utils.file_handler import (
+    SNIFF_BYTES,
+    detect_encoding,
+    iter_decoded_lines,
+    merge_decode_stats,
+    new_decode_stats,
+    sniff_encoding
+)
+
+
+def write_bytes(tmp_path, data, name="sales.txt"):
+    path = str(tmp_path / name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.mark.parametrize("bom, encoding", [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be")
+])
+def test_bom_wins_and_is_stripped(tmp_path, bom, encoding):
+    text = "TransactionID|ProductName\nT001|Café\n"
+    path = write_bytes(tmp_path, bom + text.encode(encoding))
+
+    assert detect_encoding(path) == (encoding, len(bom))
+
+    decode_stats = new_decode_stats()
+    assert list(iter_decoded_lines(path, decode_stats=decode_stats)) == ["T001|Café"]
+    assert decode_stats == {"encoding": encoding, "fallback_lines": 0, "undecodable_bytes": 0}
+
+
+def test_utf8_bom_is_not_mistaken_for_cp1252():
+    # 0xEF 0xBB 0xBF are also printable cp1252/latin-1 characters
+    assert sniff_encoding(codecs.BOM_UTF8 + "ï»¿".encode("cp1252")) == ("utf-8", 3)
+
+
+@pytest.mark.parametrize("prefix, encoding", [
+    ("Mouse – Pro".encode("cp1252"), "cp1252"),      # 0x96: en dash in cp1252, a C1 control in latin-1
+    ("Café".encode("cp1252"), "latin-1"),            # no 0x80-0x9F bytes: both agree, latin-1 is the superset
+    (b"Caf\xe9 \x96 \x81", "latin-1"),               # 0x81 is undefined in cp1252
+    ("Café".encode("utf-8"), "utf-8"),
+    (b"", "utf-8")
+])
+def test_cp1252_versus_latin1(prefix, encoding):
+    assert sniff_encoding(prefix, truncated=False) == (encoding, 0)
+
+
+@pytest.mark.parametrize("cut", [1, 2, 3])
+def test_multibyte_character_cut_at_the_sniffed_prefix(tmp_path, cut):
+    # The first `cut` bytes of a 4-byte character end the sniffed prefix
+    header = b"TransactionID|ProductName\n"
+    row = "T001|" + "x" * (SNIFF_BYTES - len(header) - 5 - cut) + "\U0001F642"
+    path = write_bytes(tmp_path, header + row.encode("utf-8") + b"\n")
+
+    assert detect_encoding(path) == ("utf-8", 0)
+
+    decode_stats = new_decode_stats()
+    lines = list(iter_decoded_lines(path, block_size=SNIFF_BYTES, decode_stats=decode_stats))
+
+    assert lines == [row]
+    assert decode_stats == {"encoding": "utf-8", "fallback_lines": 0, "undecodable_bytes": 0}
+
+
+def test_invalid_utf8_inside_the_prefix_is_not_excused(tmp_path):
+    assert sniff_encoding(b"Caf\xe9 is " + b"x" * 10) == ("latin-1", 0)
+
+    # A short file ending in a latin-1 byte was not cut by the sniffer
+    path = write_bytes(tmp_path, "TransactionID|ProductName\nT001|Café".encode("latin-1"))
+    assert sniff_encoding(b"T001|Caf\xe9") == ("utf-8", 0)
+    assert detect_encoding(path) == ("latin-1", 0)
+    assert list(iter_decoded_lines(path)) == ["T001|Café"]
+
+
+def test_lines_past_the_prefix_fall_back_per_line(tmp_path):
+    data = "TransactionID|ProductName\n".encode("utf-8")
+    data += "T001|Café\n".encode("utf-8") * (SNIFF_BYTES // 10 + 1)
+    data += "T002|Mouse – Pro\n".encode("cp1252")
+    data += "T003|Café\n".encode("utf-8")
+    path = write_bytes(tmp_path, data)
+
+    assert detect_encoding(path) == ("utf-8", 0)
+
+    decode_stats = new_decode_stats()
+    lines = list(iter_decoded_lines(path, decode_stats=decode_stats))
+
+    assert lines[-2:] == ["T002|Mouse – Pro", "T003|Café"]
+    assert decode_stats == {"encoding": "utf-8", "fallback_lines": 1, "undecodable_bytes": 1}
+
+
+def test_merge_decode_stats():
+    merged = merge_decode_stats(
+        {"encoding": "utf-8", "fallback_lines": 1, "undecodable_bytes": 2},
+        {"encoding": "cp1252", "fallback_lines": 0, "undecodable_bytes": 0}
+    )
+    merged = merge_decode_stats(merged, {"encoding": "utf-8", "fallback_lines": 2, "undecodable_bytes": 3})
+
+    assert merged == {"encoding": "cp1252, utf-8", "fallback_lines": 3, "undecodable_bytes": 5}
+    assert merge_decode_stats(new_decode_stats(), new_decode_stats())["encoding"] is None
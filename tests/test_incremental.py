@@ -0,0 +1,179 @@
+# tests/test_incremental.py
+
+import os
+
+import pytest
+
+from conftest import serial_results
+from generate_sales_data import write_sample_file
+from utils.file_handler import FINGERPRINT_SAMPLES
+from utils.incremental import incremental_aggregate, load_checkpoint
+
+SWAPPED_REGIONS = {"East": "West", "West": "East", "North": "South", "South": "North"}
+
+
+@pytest.fixture
+def large_sales_file(tmp_path):
+    """
+    About 1.1 MB, so the head and tail hashes miss most of the file.
+    """
+    path = str(tmp_path / "sales.txt")
+    write_sample_file(path, 25_000, seed=5, quirks=True, customers=500)
+    return path
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return str(tmp_path / "checkpoint.json")
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def run(path, checkpoint, capsys, **filters):
+    """
+    Returns ((results, summary), whether the checkpoint was discarded)
+    """
+    capsys.readouterr()
+    aggregator, summary = incremental_aggregate(path, checkpoint_path=checkpoint, **filters)
+    rebuilt = "rebuilding from scratch" in capsys.readouterr().out
+    return (aggregator.results(), summary), rebuilt
+
+
+def swap_region_after(data, position):
+    """
+    Swaps the Region of the first line starting after `position` that has
+    one, keeping the file length.
+    Returns the edited bytes
+    """
+    start = data.index(b"\n", position) + 1
+    while True:
+        end = data.index(b"\n", start)
+        fields = data[start:end].split(b"|")
+        region = fields[-1].decode("utf-8")
+        if region in SWAPPED_REGIONS:
+            fields[-1] = SWAPPED_REGIONS[region].encode("utf-8")
+            return data[:start] + b"|".join(fields) + data[end:]
+        start = end + 1
+
+
+def test_appended_rows_are_merged_into_the_checkpoint(large_sales_file, checkpoint, capsys):
+    data = read_bytes(large_sales_file)
+    split = data.index(b"\n", len(data) // 2) + 1
+    write_bytes(large_sales_file, data[:split])
+    run(large_sales_file, checkpoint, capsys)
+
+    with open(large_sales_file, "ab") as f:
+        f.write(data[split:])
+    result, rebuilt = run(large_sales_file, checkpoint, capsys)
+
+    assert not rebuilt
+    assert result == serial_results(large_sales_file)
+    assert load_checkpoint(checkpoint)["fingerprint"]["length"] == len(data)
+
+
+def test_unterminated_last_line_is_counted_but_not_committed(sales_file, checkpoint, capsys):
+    data = read_bytes(sales_file)
+    last_line = data.rindex(b"\n", 0, len(data) - 1) + 1
+    cut = last_line + 10
+    write_bytes(sales_file, data[:cut])
+
+    result, _ = run(sales_file, checkpoint, capsys)
+    assert result == serial_results(sales_file)
+    assert load_checkpoint(checkpoint)["fingerprint"]["length"] == last_line
+
+    with open(sales_file, "ab") as f:
+        f.write(data[cut:])
+    result, rebuilt = run(sales_file, checkpoint, capsys)
+
+    assert not rebuilt
+    assert result == serial_results(sales_file)
+    assert load_checkpoint(checkpoint)["fingerprint"]["length"] == len(data)
+
+
+def test_truncated_file_is_rebuilt(sales_file, checkpoint, capsys):
+    data = read_bytes(sales_file)
+    run(sales_file, checkpoint, capsys)
+
+    write_bytes(sales_file, data[:data.index(b"\n", len(data) // 3) + 1])
+    result, rebuilt = run(sales_file, checkpoint, capsys)
+
+    assert rebuilt
+    assert result == serial_results(sales_file)
+
+
+def test_same_length_rewrite_in_the_middle_is_rebuilt(large_sales_file, checkpoint, capsys):
+    data = read_bytes(large_sales_file)
+    before, _ = run(large_sales_file, checkpoint, capsys)
+
+    # Between the hashed blocks, so only the changed mtime gives it away
+    stat = os.stat(large_sales_file)
+    write_bytes(large_sales_file, swap_region_after(data, len(data) // 2))
+    os.utime(large_sales_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    result, rebuilt = run(large_sales_file, checkpoint, capsys)
+
+    assert rebuilt
+    assert result == serial_results(large_sales_file)
+    assert result[0]["regions"] != before[0]["regions"]
+
+
+def test_rewrite_with_an_append_is_rebuilt(large_sales_file, checkpoint, capsys):
+    data = read_bytes(large_sales_file)
+    split = data.index(b"\n", len(data) - 5000) + 1
+    write_bytes(large_sales_file, data[:split])
+    run(large_sales_file, checkpoint, capsys)
+
+    # Lands in the middle sampled block, next to an append
+    edited = swap_region_after(data[:split], split * (FINGERPRINT_SAMPLES // 2) // (FINGERPRINT_SAMPLES + 1))
+    write_bytes(large_sales_file, edited + data[split:])
+    result, rebuilt = run(large_sales_file, checkpoint, capsys)
+
+    assert rebuilt
+    assert result == serial_results(large_sales_file)
+
+
+def test_replaced_file_is_rebuilt(sales_file, checkpoint, capsys):
+    data = read_bytes(sales_file)
+    run(sales_file, checkpoint, capsys)
+
+    replacement = sales_file + ".new"
+    write_bytes(replacement, data + b"T999|2024-12-31|P101|Laptop|1|60000|C001|East\n")
+    os.replace(replacement, sales_file)
+    result, rebuilt = run(sales_file, checkpoint, capsys)
+
+    assert rebuilt
+    assert result == serial_results(sales_file)
+
+
+def test_changed_filters_are_rebuilt(sales_file, checkpoint, capsys):
+    run(sales_file, checkpoint, capsys, region="East")
+
+    result, rebuilt = run(sales_file, checkpoint, capsys, region="West", min_amount=1000)
+
+    assert rebuilt
+    assert result == serial_results(sales_file, region="West", min_amount=1000)
+    assert load_checkpoint(checkpoint)["filters"] == {"region": "West", "min_amount": 1000, "max_amount": None}
+
+
+def test_decode_counts_survive_a_resume(large_sales_file, checkpoint, capsys):
+    data = read_bytes(large_sales_file)
+    split = data.index(b"\n", len(data) // 2) + 1
+    cp1252_row = "T99999|2024-12-01|P101|Mouse – Pro|1|500|C001|East\n".encode("cp1252")
+    write_bytes(large_sales_file, data[:split] + cp1252_row)
+    run(large_sales_file, checkpoint, capsys)
+
+    with open(large_sales_file, "ab") as f:
+        f.write(data[split:] + cp1252_row)
+    result, rebuilt = run(large_sales_file, checkpoint, capsys)
+
+    assert not rebuilt
+    assert result == serial_results(large_sales_file)
+    assert result[1]["encoding"] == "utf-8"
+    assert result[1]["undecodable_bytes"] == 2
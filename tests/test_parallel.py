@@ -0,0 +1,87 @@
+# tests/test_parallel.py
+
+import os
+
+import pytest
+
+from conftest import approx_results, serial_results
+from utils.file_handler import iter_decoded_lines, new_decode_stats
+from utils.incremental import incremental_aggregate
+from utils.parallel import parallel_aggregate
+
+
+def reencode(source, path, encoding):
+    with open(source, encoding="utf-8") as src, open(path, "wb") as dst:
+        dst.write(("\ufeff" + src.read()).encode(encoding))
+    return path
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(2, 1000), (3, 7919), (4, 10 ** 9)])
+@pytest.mark.parametrize("filters", [{}, {"region": "East", "min_amount": 1000}])
+def test_whole_number_prices_match_serial_exactly(sales_file, workers, chunk_size, filters):
+    expected_results, expected_summary = serial_results(sales_file, **filters)
+
+    aggregator, summary = parallel_aggregate(sales_file, workers, chunk_size=chunk_size, **filters)
+
+    assert summary == expected_summary
+    assert aggregator.results() == expected_results
+
+
+def test_fractional_prices_match_serial_within_tolerance(fractional_sales_file):
+    expected_results, expected_summary = serial_results(fractional_sales_file)
+
+    aggregator, summary = parallel_aggregate(fractional_sales_file, 3, chunk_size=1000)
+    results = aggregator.results()
+
+    assert summary == expected_summary
+    assert results == approx_results(expected_results)
+
+
+@pytest.mark.parametrize("encoding", ["utf-16-le", "utf-16-be"])
+def test_utf16_falls_back_to_serial(sales_file, tmp_path, encoding):
+    path = reencode(sales_file, str(tmp_path / "sales_utf16.txt"), encoding)
+    expected_results, expected_summary = serial_results(sales_file)
+    assert expected_summary["total_input"] > 0
+    expected = (expected_results, dict(expected_summary, encoding=encoding))
+
+    aggregator, summary = parallel_aggregate(path, 2, chunk_size=1000)
+    assert (aggregator.results(), summary) == expected
+
+    checkpoint = str(tmp_path / "checkpoint.json")
+    aggregator, summary = incremental_aggregate(path, checkpoint_path=checkpoint)
+    assert (aggregator.results(), summary) == expected
+    assert not os.path.exists(checkpoint)
+
+
+def test_byte_ranges_use_the_file_encoding(sales_file, tmp_path):
+    # cp1252 punctuation only in the first range
+    with open(sales_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    fields = lines[1].split("|")
+    fields[3] = "Mouse – Pro"
+    lines[1] = "|".join(fields)
+
+    path = str(tmp_path / "sales_cp1252.txt")
+    with open(path, "w", encoding="cp1252", newline="") as f:
+        f.write("\n".join(lines) + "\n")
+
+    expected = serial_results(path)
+    assert "Mouse – Pro" in {p["ProductName"] for p in expected[0]["products"]}
+
+    aggregator, summary = parallel_aggregate(path, 2, chunk_size=1000)
+    assert (aggregator.results(), summary) == expected
+
+
+def test_undecodable_bytes_count_the_fallback_input(tmp_path):
+    path = str(tmp_path / "mixed.txt")
+    with open(path, "wb") as f:
+        f.write("TransactionID|Date\n".encode("utf-8"))
+        # Enough utf-8 to fill the sniffed prefix
+        f.write("T001|café\n".encode("utf-8") * 10_000)
+        f.write("T002|café – bar\n".encode("cp1252"))
+
+    decode_stats = new_decode_stats()
+    lines = list(iter_decoded_lines(path, decode_stats=decode_stats))
+
+    assert lines == ["T001|café"] * 10_000 + ["T002|café – bar"]
+    assert decode_stats == {"encoding": "utf-8", "fallback_lines": 1, "undecodable_bytes": 2}
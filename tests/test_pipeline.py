@@ -0,0 +1,78 @@
+# tests/test_pipeline.py
+
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from utils.aggregator import Aggregator
+from utils.api_handler import create_product_mapping, enrich_sales_data
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.pipeline import overlapped_aggregate
+from utils.profiler import start_profile
+
+CATALOG = [{"id": n, "title": f"Product {n}", "category": "test", "brand": "Acme", "rating": 4.5} for n in range(1, 200)]
+
+
+@pytest.fixture
+def profile(tmp_path):
+    yield start_profile(cprofile_stage="enrich", output_dir=str(tmp_path))
+    start_profile(enabled=False)
+
+
+def test_overlapped_matches_sequential(sales_file):
+    valid, _, summary = validate_and_filter(iter_sales_records(sales_file), region="East")
+    expected = Aggregator().consume(enrich_sales_data(valid, create_product_mapping(CATALOG))).results()
+
+    aggregator, overlapped_summary = overlapped_aggregate(
+        sales_file, region="East", fetch=lambda: CATALOG, batch_size=50, queue_size=2
+    )
+
+    assert aggregator.results() == expected
+    assert {key: overlapped_summary[key] for key in summary} == summary
+    assert overlapped_summary["catalog_products"] == len(CATALOG)
+
+
+def test_every_stage_is_profiled_in_its_own_thread(sales_file, profile):
+    aggregator, summary = overlapped_aggregate(sales_file, fetch=lambda: CATALOG, batch_size=100)
+
+    stages = {record["stage"]: record for record in profile.stages}
+    assert set(stages) == {"fetch", "validate", "enrich", "aggregate"}
+    assert stages["validate"]["rows_in"] == summary["total_input"]
+    assert stages["validate"]["rows_out"] == summary["final_count"]
+    assert stages["enrich"]["rows_out"] == aggregator.count
+    assert stages["aggregate"]["rows_out"] == aggregator.count
+    assert os.path.exists(stages["enrich"]["cprofile"])
+
+
+def test_concurrent_stage_cpu_adds_up_to_the_process_cpu(sales_file, tmp_path):
+    profile = start_profile(trace_memory=True, output_dir=str(tmp_path))
+    try:
+        cpu_start = time.process_time()
+        overlapped_aggregate(sales_file, fetch=lambda: CATALOG, batch_size=100)
+        process_cpu = time.process_time() - cpu_start
+    finally:
+        profile.close()
+        start_profile(enabled=False)
+
+    stages = profile.stages
+    # Rounded to the microsecond per stage
+    assert sum(record["cpu_seconds"] for record in stages) <= process_cpu + 1e-6 * len(stages)
+    assert all(record["cpu_seconds"] < process_cpu for record in stages)
+    assert all(record["peak_memory_bytes"] is None and record["memory_shared"] for record in stages)
+
+
+def test_profiles_do_not_trace_memory_unless_asked(sales_file, profile):
+    overlapped_aggregate(sales_file, fetch=lambda: CATALOG)
+
+    assert not tracemalloc.is_tracing()
+    assert all("peak_memory_bytes" not in record for record in profile.stages)
+
+
+def test_fetch_errors_stop_the_pipeline(tmp_path):
+    def failing_fetch():
+        raise RuntimeError("catalog down")
+
+    with pytest.raises(RuntimeError, match="catalog down"):
+        overlapped_aggregate(str(tmp_path / "missing.txt"), fetch=failing_fetch)
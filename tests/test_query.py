@@ -0,0 +1,155 @@
+# tests/test_query.py
+
+from operator import itemgetter
+
+import pytest
+
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.file_handler import iter_sales_lines
+from utils.query import scan, AMOUNT
+from utils.tokenizer import FIELD_NAMES
+
+FILTERS = [
+    {},
+    {"region": "East"},
+    {"min_amount": 1000, "max_amount": 200000},
+    {"region": "West", "min_amount": 5000},
+    {"region": "Nowhere"}
+]
+
+
+@pytest.fixture(params=["sales_file", "fractional_sales_file"])
+def source(request):
+    return request.getfixturevalue(request.param)
+
+
+def reference(path, **filters):
+    """
+    Returns (valid rows, summary) from validate_and_filter.
+    """
+    valid, _, summary = validate_and_filter(iter_sales_records(path), **filters)
+    return valid, summary
+
+
+def amount(txn):
+    return txn["Quantity"] * txn["UnitPrice"]
+
+
+def grouped(rows, key, value=None):
+    """
+    Reference group-by in first-seen order: count per key, or the sum of
+    value(row) added in row order.
+    """
+    results = {}
+    for row in rows:
+        k = key(row)
+        if value is None:
+            results[k] = results.get(k, 0) + 1
+        else:
+            results[k] = results.get(k, 0) + value(row)
+    return results
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_matching_rows_are_those_validate_and_filter_keeps(source, filters):
+    valid, _ = reference(source, **filters)
+    query = scan(source).filter(**filters)
+
+    assert query.select(*FIELD_NAMES).collect() == valid
+    assert query.count() == len(valid)
+    assert list(query.iter_rows(("TransactionID", AMOUNT))) == [
+        (txn["TransactionID"], amount(txn)) for txn in valid
+    ]
+
+
+def test_select_projects_and_orders_columns(sales_file):
+    valid, _ = reference(sales_file, region="East")
+
+    rows = scan(sales_file).filter(region="East").select(AMOUNT, "ProductName", "Quantity").collect()
+
+    assert rows == [
+        {AMOUNT: amount(txn), "ProductName": txn["ProductName"], "Quantity": txn["Quantity"]}
+        for txn in valid
+    ]
+    assert [list(row) for row in rows[:1]] == [[AMOUNT, "ProductName", "Quantity"]]
+
+    with pytest.raises(ValueError):
+        scan(sales_file).select("Amount")
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sums_match_in_row_order(source, filters):
+    valid, _ = reference(source, **filters)
+    query = scan(source).filter(**filters)
+
+    assert query.sum() == sum((amount(txn) for txn in valid), 0.0)
+    assert query.sum("Quantity") == sum(txn["Quantity"] for txn in valid)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_groups_match_in_first_seen_order(source, filters):
+    valid, _ = reference(source, **filters)
+    query = scan(source).filter(**filters)
+
+    by_customer = query.group_by("CustomerID")
+    expected_revenue = grouped(valid, itemgetter("CustomerID"), amount)
+    assert list(by_customer.sum().items()) == list(expected_revenue.items())
+    assert list(by_customer.count().items()) == list(grouped(valid, itemgetter("CustomerID")).items())
+
+    by_region_product = query.group_by("Region", "ProductName")
+    assert list(by_region_product.sum("Quantity").items()) == list(
+        grouped(valid, itemgetter("Region", "ProductName"), itemgetter("Quantity")).items()
+    )
+
+    agg = by_customer.agg(
+        revenue=("sum", AMOUNT),
+        orders=("count", None),
+        smallest=("min", AMOUNT),
+        largest=("max", "Quantity")
+    )
+    assert list(agg) == list(expected_revenue)
+    for customer, group in agg.items():
+        rows = [txn for txn in valid if txn["CustomerID"] == customer]
+        assert group == {
+            "revenue": expected_revenue[customer],
+            "orders": len(rows),
+            "smallest": min(amount(txn) for txn in rows),
+            "largest": max(txn["Quantity"] for txn in rows)
+        }
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_stats_counters(source, filters):
+    _, summary = reference(source, **filters)
+    query = scan(source).filter(**filters)
+    query.count()
+    stats = query.stats
+
+    assert stats["scanned"] == sum(1 for _ in iter_sales_lines(source))
+    assert stats["matched"] == summary["final_count"]
+    assert stats["filtered_by_amount"] == summary["filtered_by_amount"]
+    assert stats["scanned"] == (
+        stats["pushed_down"] + stats["malformed"] + stats["invalid"]
+        + stats["filtered_by_amount"] + stats["matched"]
+    )
+
+    if filters.get("region"):
+        # Every line from another region is rejected before it is split
+        assert stats["pushed_down"] >= summary["filtered_by_region"]
+        assert stats["pushed_down"] > 0
+    else:
+        # Without pushdown, lines the parser drops count as malformed
+        assert stats["pushed_down"] == 0
+        assert stats["malformed"] == stats["scanned"] - summary["total_input"]
+        assert stats["invalid"] == summary["invalid"]
+
+
+def test_repeated_filters_narrow_the_amount_range(sales_file):
+    query = scan(sales_file).filter(min_amount=1000, max_amount=500000).filter(min_amount=5000, max_amount=900000)
+    valid, _ = reference(sales_file, min_amount=5000, max_amount=500000)
+
+    assert (query.min_amount, query.max_amount) == (5000, 500000)
+    assert query.count() == len(valid)
+
+    with pytest.raises(ValueError):
+        query.filter(region="East").filter(region="West")
@@ -0,0 +1,150 @@
+# tests/test_rollup.py
+
+import json
+
+import pytest
+
+from utils.aggregator import Aggregator
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.rollup import RollupCube, parse_date, period_key, DATE_CACHE_SIZE
+
+
+def txn(date, region, product, quantity, price):
+    return {
+        "TransactionID": "T001",
+        "Date": date,
+        "ProductID": "P101",
+        "ProductName": product,
+        "Quantity": quantity,
+        "UnitPrice": price,
+        "CustomerID": "C001",
+        "Region": region
+    }
+
+
+TRANSACTIONS = [
+    txn("2024-11-30", "East", "Mouse", 2, 100.0),     # 200
+    txn("2024-12-01", "East", "Mouse", 1, 100.0),     # 100
+    txn("2024-12-01", "West", "Laptop", 1, 1000.0),   # 1000
+    txn("2024-12-29", "West", "Mouse", 3, 100.0),     # 300, Sunday of 2024-W52
+    txn("2024-12-30", "East", "Laptop", 1, 500.0),    # 500, Monday of 2025-W01
+    txn("2025-01-02", "East", "Mouse", 5, 100.0),     # 500
+    txn("2024-12-1", "East", "Mouse", 1, 50.0),       # malformed date
+]
+
+
+def build_cube(transactions=TRANSACTIONS):
+    return Aggregator([RollupCube()]).consume(transactions).results()["rollup"]
+
+
+@pytest.mark.parametrize("text, week", [
+    ("2024-12-29", "2024-W52"),
+    ("2024-12-30", "2025-W01"),
+    ("2020-12-31", "2020-W53"),
+    ("2021-01-03", "2020-W53"),
+    ("2021-01-04", "2021-W01")
+])
+def test_iso_week_boundaries(text, week):
+    assert period_key(text, "week") == week
+
+
+def test_unparsable_dates_stay_at_day_level_only():
+    assert period_key("2024-12-1", "day") == "2024-12-1"
+    assert period_key("2024-12-1", "week") is None
+    assert period_key("2024-12-1", "month") is None
+
+    with pytest.raises(ValueError):
+        period_key("2024-12-01", "quarter")
+
+
+def test_series_at_each_level():
+    cube = build_cube()
+
+    assert cube.series("day") == {
+        "2024-11-30": 200.0,
+        "2024-12-01": 1100.0,
+        "2024-12-1": 50.0,
+        "2024-12-29": 300.0,
+        "2024-12-30": 500.0,
+        "2025-01-02": 500.0
+    }
+    assert cube.series("week") == {"2024-W48": 1300.0, "2024-W52": 300.0, "2025-W01": 1000.0}
+    assert cube.series("month") == {"2024-11": 200.0, "2024-12": 1900.0, "2025-01": 500.0}
+    assert cube.series("month", measure="quantity") == {"2024-11": 2, "2024-12": 6, "2025-01": 5}
+    assert cube.series("month", measure="transactions") == {"2024-11": 1, "2024-12": 4, "2025-01": 1}
+
+
+def test_series_slices_by_region_and_product():
+    cube = build_cube()
+
+    assert cube.series("month", region="West") == {"2024-12": 1300.0}
+    assert cube.series("month", product="Laptop") == {"2024-12": 1500.0}
+    assert cube.series("month", region="East", product="Mouse") == {
+        "2024-11": 200.0, "2024-12": 100.0, "2025-01": 500.0
+    }
+    assert cube.series("month", region="North") == {}
+    assert cube.regions() == ["East", "West"]
+    assert cube.products() == ["Laptop", "Mouse"]
+
+
+def test_peak():
+    cube = build_cube()
+
+    assert cube.peak("month") == ("2024-12", 1900.0)
+    assert cube.peak("week", measure="quantity") == ("2025-W01", 6)
+    # 2024-12-30 and 2025-01-02 tie at 500; the earlier one wins
+    assert cube.peak("day", region="East") == ("2024-12-30", 500.0)
+    assert cube.peak("day", region="North") == (None, 0.0)
+
+
+def test_period_over_period():
+    cube = build_cube([
+        txn("2024-10-05", "East", "Mouse", 0, 100.0),
+        txn("2024-11-05", "East", "Mouse", 2, 100.0),
+        txn("2024-12-05", "East", "Mouse", 1, 100.0)
+    ])
+
+    assert cube.period_over_period("month") == [
+        {"Period": "2024-10", "Value": 0.0, "Previous": None, "Change": None, "ChangePct": None},
+        {"Period": "2024-11", "Value": 200.0, "Previous": 0.0, "Change": 200.0, "ChangePct": None},
+        {"Period": "2024-12", "Value": 100.0, "Previous": 200.0, "Change": -100.0, "ChangePct": -50.0}
+    ]
+
+
+def test_cached_series_are_invalidated_by_new_rows():
+    aggregator = Aggregator([RollupCube()]).consume(TRANSACTIONS[:2])
+    cube = aggregator.results()["rollup"]
+    assert cube.series("month") == {"2024-11": 200.0, "2024-12": 100.0}
+
+    aggregator.consume(TRANSACTIONS[2:3])
+    assert cube.series("month") == {"2024-11": 200.0, "2024-12": 1100.0}
+
+    cube.merge(build_cube(TRANSACTIONS[5:6]))
+    assert cube.series("month") == {"2024-11": 200.0, "2024-12": 1100.0, "2025-01": 500.0}
+
+
+def test_merge_and_state_round_trip(sales_file):
+    valid, _, _ = validate_and_filter(iter_sales_records(sales_file))
+    whole = build_cube(valid)
+
+    half = len(valid) // 2
+    merged = build_cube(valid[:half])
+    merged.merge(build_cube(valid[half:]))
+    assert merged.cells == whole.cells
+
+    aggregator = Aggregator([RollupCube()]).consume(valid)
+    restored = Aggregator.from_state(json.loads(json.dumps(aggregator.state()))).results()["rollup"]
+    assert restored.cells == whole.cells
+    for level in ("day", "week", "month"):
+        assert restored.series(level, region="East") == whole.series(level, region="East")
+        assert restored.period_over_period(level) == whole.period_over_period(level)
+
+
+def test_date_caches_are_bounded():
+    for i in range(DATE_CACHE_SIZE + 100):
+        parse_date(f"not a date {i}")
+        period_key(f"not a date {i}", "week")
+
+    assert parse_date.cache_info().currsize <= DATE_CACHE_SIZE
+    info = period_key.cache_info()
+    assert info.maxsize is not None and info.currsize <= info.maxsize
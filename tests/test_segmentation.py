@@ -0,0 +1,155 @@
+# tests/test_segmentation.py
+
+import pytest
+
+import utils.segmentation
+import utils.transaction_table
+from utils.data_processor import customer_analysis, iter_sales_records, validate_and_filter
+from utils.segmentation import CustomerTable, UNKNOWN_DAY, quantile_scores, segment_customers
+
+
+def txn(date, customer, quantity, price):
+    return {
+        "TransactionID": "T001",
+        "Date": date,
+        "ProductID": "P101",
+        "ProductName": "Mouse",
+        "Quantity": quantity,
+        "UnitPrice": price,
+        "CustomerID": customer,
+        "Region": "East"
+    }
+
+
+TRANSACTIONS = [
+    txn("2024-12-01", "C1", 1, 60000.0),   # C1: 60000, 1 order, last 12-01
+    txn("2024-12-03", "C2", 1, 10000.0),   # C2: 11000, 2 orders, last 12-05
+    txn("2024-12-02", "C3", 1, 9999.0),    # C3: 9999, 1 order, last 12-02
+    txn("2024-12-05", "C4", 5, 100.0),     # C4: 600, 2 orders, last 12-05
+    txn("2024-12-05", "C2", 2, 500.0),
+    txn("2024-12-04", "C4", 1, 100.0),
+    txn("2024-12-1", "C5", 1, 50000.0)     # C5: 50000, 1 order, unparsable date
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_mode(request, monkeypatch):
+    """
+    Runs a test with NumPy, then again as if it were not installed.
+    """
+    if request.param == "python":
+        monkeypatch.setattr(utils.segmentation, "np", None)
+        monkeypatch.setattr(utils.transaction_table, "np", None)
+    return request.param
+
+
+@pytest.fixture(params=["sales_file", "fractional_sales_file"])
+def valid_rows(request):
+    valid, _, _ = validate_and_filter(iter_sales_records(request.getfixturevalue(request.param)))
+    return valid
+
+
+def report_segments(customers):
+    """
+    Segment counts in first-seen order, as the report builds them.
+    """
+    counts = {}
+    for customer in customers:
+        counts[customer["Segment"]] = counts.get(customer["Segment"], 0) + 1
+    return counts
+
+
+def as_list(column):
+    return [int(value) for value in column]
+
+
+def test_records_and_counts_match_customer_analysis(valid_rows, numpy_mode):
+    expected = customer_analysis(valid_rows)
+    table = CustomerTable.from_transactions(valid_rows)
+
+    assert table.to_records() == expected
+    assert table.segment_counts() == report_segments(expected)
+    assert segment_customers(valid_rows) == report_segments(expected)
+
+
+def test_customer_columns(numpy_mode):
+    table = CustomerTable.from_transactions(TRANSACTIONS)
+
+    # The fallback builds plain lists instead of arrays
+    assert isinstance(table.spend, list) == (numpy_mode == "python")
+    assert table.ids() == ["C1", "C2", "C3", "C4", "C5"]
+    assert list(table.spend) == [60000.0, 11000.0, 9999.0, 600.0, 50000.0]
+    assert as_list(table.frequency) == [1, 2, 1, 2, 1]
+    assert as_list(table.recency()) == [4, 0, 3, 0, table.last_day[1] - UNKNOWN_DAY]
+
+
+def test_threshold_segments(numpy_mode):
+    table = CustomerTable.from_transactions(TRANSACTIONS)
+
+    # 50000 sits on the High Value cut point and moves up
+    assert [r["Segment"] for r in table.to_records()] == [
+        "High Value", "Medium Value", "Low Value", "Low Value", "High Value"
+    ]
+    assert table.segment_counts() == {"High Value": 2, "Medium Value": 1, "Low Value": 2}
+    assert table.segment_counts(thresholds=(1000,), labels=("Small", "Large")) == {"Large": 4, "Small": 1}
+
+
+def test_quantile_segments(numpy_mode):
+    table = CustomerTable.from_transactions(TRANSACTIONS)
+
+    # Sorted spend 600, 9999, 11000, 50000, 60000: the median is 11000 and
+    # the 90th percentile 50000 + 0.6 * 10000
+    segments, edges = table.segments("quantile")
+    assert edges == [11000.0, 56000.0]
+    assert as_list(segments) == [2, 1, 0, 0, 1]
+    assert table.segment_counts("quantile") == {"High Value": 1, "Medium Value": 2, "Low Value": 2}
+
+    with pytest.raises(ValueError):
+        table.segments("kmeans")
+    with pytest.raises(ValueError):
+        table.segment_counts("quantile", labels=("Low", "High"))
+
+
+def test_rfm_scores(numpy_mode):
+    table = CustomerTable.from_transactions(TRANSACTIONS)
+
+    # Recency 4, 0, 3, 0 and "oldest" for the unparsable date. Frequency
+    # 1, 2, 1, 2, 1 has quintile edges 1, 1, 1.4, 2, so ties share a score
+    recency, frequency, monetary = table.rfm_scores()
+    assert as_list(recency) == [2, 4, 3, 4, 1]
+    assert as_list(frequency) == [3, 5, 3, 5, 3]
+    assert as_list(monetary) == [5, 3, 2, 1, 4]
+
+    assert [r["RFM"] for r in table.to_records(rfm=True)] == ["235", "453", "332", "451", "134"]
+    assert list(table.rfm_counts().items()) == [("453", 1), ("451", 1), ("332", 1), ("235", 1), ("134", 1)]
+
+
+def test_quantile_scores(numpy_mode):
+    assert as_list(quantile_scores([10, 20, 30, 40], bins=4)) == [1, 2, 3, 4]
+    assert as_list(quantile_scores([10, 20, 30, 40], bins=4, reverse=True)) == [4, 3, 2, 1]
+    assert as_list(quantile_scores([7, 7, 7], bins=3)) == [3, 3, 3]
+
+
+def test_empty_table(numpy_mode):
+    table = CustomerTable.from_transactions([])
+
+    assert len(table) == 0
+    assert table.to_records() == []
+    assert table.segment_counts() == {}
+    assert table.segment_counts("quantile") == {}
+
+
+def test_numpy_and_python_agree(valid_rows, monkeypatch):
+    def run():
+        table = CustomerTable.from_transactions(valid_rows)
+        return (
+            table.to_records("quantile", rfm=True),
+            table.segment_counts("quantile", quantiles=(0.25, 0.75)),
+            table.rfm_counts(bins=3)
+        )
+
+    with_numpy = run()
+    monkeypatch.setattr(utils.segmentation, "np", None)
+    monkeypatch.setattr(utils.transaction_table, "np", None)
+
+    assert run() == with_numpy
@@ -0,0 +1,135 @@
+# tests/test_server.py
+
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from utils.aggregator import Aggregator, rank_top_products, filter_low_products
+from utils.api_handler import create_product_mapping, enrich_sales_data
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.server import SalesQueryService, load_dataset, start_server
+
+
+class ServerThread:
+    """
+    Runs start_server on its own event loop in a background thread.
+    """
+
+    def __init__(self, service, unix_path=None):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+        self.server = asyncio.run_coroutine_threadsafe(
+            start_server(service, "127.0.0.1", 0, unix_path), self.loop
+        ).result(timeout=10)
+        self.address = unix_path or self.server.sockets[0].getsockname()[:2]
+
+    def request(self, raw):
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(10)
+            sock.connect(self.address)
+            sock.sendall(raw)
+
+            response = b""
+            while chunk := sock.recv(65536):
+                response += chunk
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    def get(self, target):
+        return self.request(f"GET {target} HTTP/1.1\r\nHost: test\r\n\r\n".encode("latin-1"))
+
+    def close(self):
+        self.server.close()
+        asyncio.run_coroutine_threadsafe(self.server.wait_closed(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+        self.loop.close()
+
+
+@pytest.fixture
+def service(sales_file):
+    return SalesQueryService(load_dataset(sales_file, products=[]))
+
+
+@pytest.fixture
+def server(service):
+    running = ServerThread(service)
+    yield running
+    running.close()
+
+
+def expected_response(sales_file, region=None, min_amount=None, max_amount=None, top_n=5, threshold=10):
+    valid, _, summary = validate_and_filter(
+        enrich_sales_data(iter_sales_records(sales_file), create_product_mapping([])),
+        region, min_amount, max_amount
+    )
+    results = Aggregator().consume(valid).results()
+
+    return json.loads(json.dumps({
+        "filters": {"region": region, "min_amount": min_amount, "max_amount": max_amount},
+        "summary": summary,
+        "total_revenue": results["total_revenue"],
+        "regions": results["regions"],
+        "top_products": rank_top_products(results["products"], top_n),
+        "low_products": filter_low_products(results["products"], threshold),
+        "customers": results["customers"],
+        "daily": results["daily"]
+    }))
+
+
+@pytest.mark.parametrize("target, filters", [
+    ("/query", {}),
+    ("/query?region=East", {"region": "East"}),
+    ("/query?min_amount=1000&max_amount=200000&top_n=3",
+     {"min_amount": 1000.0, "max_amount": 200000.0, "top_n": 3}),
+    ("/query?region=West&min_amount=5000&threshold=50", {"region": "West", "min_amount": 5000.0, "threshold": 50})
+])
+def test_query_matches_batch_pipeline(server, sales_file, target, filters):
+    status, body = server.get(target)
+
+    assert status == 200
+    assert body == expected_response(sales_file, **filters)
+
+
+def test_repeated_queries_are_served_from_cache(server):
+    _, before = server.get("/stats")
+    first = server.get("/query?region=North")
+    second = server.get("/query?region=North")
+    _, after = server.get("/stats")
+
+    assert first == second
+    assert before["rows"] == after["rows"] > 0
+    assert after["cache"]["misses"] == before["cache"]["misses"] + 1
+    assert after["cache"]["hits"] == before["cache"]["hits"] + 1
+    assert after["cache"]["entries"] == before["cache"]["entries"] + 1
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GET /query?min_amount=abc HTTP/1.1\r\n\r\n", 400),
+    (b"GET /nowhere HTTP/1.1\r\n\r\n", 404),
+    (b"POST /query HTTP/1.1\r\nContent-Length: 0\r\n\r\n", 405),
+    (b"garbage\r\n\r\n", 400)
+])
+def test_bad_requests_get_json_errors(server, raw, status):
+    code, body = server.request(raw)
+
+    assert code == status
+    assert "error" in body
+
+
+def test_unix_socket(service, tmp_path, sales_file):
+    running = ServerThread(service, unix_path=str(tmp_path / "sales.sock"))
+    try:
+        status, body = running.get("/query?region=South")
+    finally:
+        running.close()
+
+    assert status == 200
+    assert body == expected_response(sales_file, region="South")
@@ -0,0 +1,140 @@
+# tests/test_sketches.py
+
+import math
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from utils.aggregator import Aggregator, default_accumulators
+from utils.data_processor import iter_sales_records, validate_and_filter
+from utils.sketches import (
+    HyperLogLog,
+    HeavyHitterProducts,
+    HeavyRevenueProducts,
+    DistinctCustomers,
+    CustomerSpendSketch,
+    AmountQuantiles,
+    sketch_accumulators,
+    approximate_results
+)
+
+
+@pytest.fixture
+def transactions(sales_file):
+    valid, _, _ = validate_and_filter(iter_sales_records(sales_file))
+    return valid
+
+
+@pytest.fixture
+def exact(transactions):
+    return Aggregator(default_accumulators()).consume(transactions).results()
+
+
+def test_count_min_never_underestimates_and_stays_within_epsilon(transactions, exact):
+    epsilon, delta = 0.01, 0.01
+    sketch = Aggregator([CustomerSpendSketch(epsilon, delta)]).consume(transactions).results()["customer_spend"]
+    bound = epsilon * exact["total_revenue"]
+
+    errors = [
+        sketch.estimate(customer["CustomerID"]) - customer["TotalSpend"]
+        for customer in exact["customers"]
+    ]
+
+    # 200 customers in 272 columns per row: some buckets collide
+    assert max(errors) > 0
+    assert min(errors) >= 0
+    within = sum(1 for error in errors if error <= bound)
+    assert within >= (1 - delta) * len(errors)
+
+
+@pytest.mark.parametrize("cls, measure", [
+    (HeavyHitterProducts, "TotalQuantity"),
+    (HeavyRevenueProducts, "Revenue")
+])
+def test_space_saving_bounds_and_keeps_heavy_products(transactions, exact, cls, measure):
+    capacity = 8
+    accumulator = cls(capacity=capacity, top_n=capacity)
+    heavy = Aggregator([accumulator]).consume(transactions).results()[accumulator.name]
+
+    truth = {p["ProductName"]: p[measure] for p in exact["products"]}
+    total = sum(truth.values())
+    assert len(truth) > capacity
+
+    for product in heavy:
+        actual = truth[product["ProductName"]]
+        assert product["MaxError"] <= total / capacity
+        assert actual <= product[measure] + 1e-6
+        assert product[measure] - product["MaxError"] <= actual + 1e-6
+
+    # Every product above the N / capacity guarantee is tracked
+    tracked = {product["ProductName"] for product in heavy}
+    assert {name for name, value in truth.items() if value > total / capacity} <= tracked
+
+
+def test_space_saving_is_exact_with_room_for_every_product(transactions, exact):
+    heavy = Aggregator([HeavyRevenueProducts(top_n=5)]).consume(transactions).results()["heavy_revenue"]
+    expected = sorted(exact["products"], key=lambda p: p["Revenue"], reverse=True)[:5]
+
+    assert [(p["ProductName"], p["Revenue"], p["MaxError"]) for p in heavy] == [
+        (p["ProductName"], p["Revenue"], 0) for p in expected
+    ]
+
+
+def test_hyperloglog_within_three_standard_errors():
+    precision = 12
+    standard_error = 1.04 / math.sqrt(1 << precision)
+
+    for distinct in (1_000, 50_000):
+        sketch = HyperLogLog(precision)
+        for i in range(distinct):
+            sketch.add(f"C{i:07d}")
+            sketch.add(f"C{i:07d}")
+
+        assert abs(sketch.count() - distinct) <= 3 * standard_error * distinct
+
+
+def test_distinct_customers_matches_exact_count(transactions, exact):
+    estimate = Aggregator([DistinctCustomers()]).consume(transactions).results()["distinct_customers"]
+
+    assert abs(estimate - len(exact["customers"])) <= 0.03 * len(exact["customers"])
+
+
+def test_tdigest_quantiles_within_rank_error(transactions):
+    fractions = (0.01, 0.1, 0.5, 0.9, 0.99)
+    accumulator = AmountQuantiles(fractions)
+    estimates = Aggregator([accumulator]).consume(transactions).results()["amount_quantiles"]
+
+    amounts = sorted(txn["Quantity"] * txn["UnitPrice"] for txn in transactions)
+    rank_error = 0.01
+    for q in fractions:
+        below = bisect_left(amounts, estimates[q]) / len(amounts)
+        at_or_below = bisect_right(amounts, estimates[q]) / len(amounts)
+        assert below - rank_error <= q <= at_or_below + rank_error
+
+    assert accumulator.digest.min == amounts[0]
+    assert accumulator.digest.max == amounts[-1]
+
+
+def test_merged_sketches_match_single_pass(transactions, exact):
+    half = len(transactions) // 2
+    whole = Aggregator(sketch_accumulators()).consume(transactions)
+    merged = Aggregator(sketch_accumulators()).consume(transactions[:half]).merge(
+        Aggregator(sketch_accumulators()).consume(transactions[half:])
+    )
+
+    single, combined = whole.results(), merged.results()
+    assert combined["total_revenue"] == exact["total_revenue"]
+    assert combined["regions"] == exact["regions"]
+    assert combined["distinct_customers"] == single["distinct_customers"]
+    assert combined["customer_spend"].rows == single["customer_spend"].rows
+
+    amounts = sorted(txn["Quantity"] * txn["UnitPrice"] for txn in transactions)
+    median = bisect_left(amounts, combined["amount_quantiles"][0.5]) / len(amounts)
+    assert abs(median - 0.5) <= 0.02
+
+
+def test_approximate_results_fill_report_sections(transactions):
+    results = approximate_results(Aggregator(sketch_accumulators()).consume(transactions).results())
+
+    assert results["products"] == results["heavy_revenue"]
+    assert list(results["segments"].values()) == [results["distinct_customers"]]
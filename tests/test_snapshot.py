@@ -0,0 +1,81 @@
+# tests/test_snapshot.py
+
+import pytest
+
+from utils.aggregator import Aggregator, default_accumulators
+from utils.data_processor import iter_sales_records, iter_valid_transactions, new_filter_stats
+from utils.file_handler import new_decode_stats
+from utils.rollup import RollupCube
+from utils.snapshot import load_sales_table, load_snapshot, snapshot_is_current, TransactionIDs
+
+FILTERS = [
+    {},
+    {"region": "East"},
+    {"min_amount": 1000, "max_amount": 200000},
+    {"region": "Nowhere"}
+]
+
+
+@pytest.fixture(params=["sales_file", "fractional_sales_file"])
+def source(request):
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture
+def snapshot(source, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    load_sales_table(source, directory)
+    assert snapshot_is_current(source, directory)
+    return load_snapshot(directory)
+
+
+def test_transaction_ids_are_mapped_lazily(source, snapshot):
+    expected = [txn["TransactionID"] for txn in iter_sales_records(source)]
+
+    assert isinstance(snapshot.transaction_ids, TransactionIDs)
+    assert list(snapshot.transaction_ids) == expected
+    assert list(snapshot.transaction_ids.startswith("T")) == [txn_id.startswith("T") for txn_id in expected]
+
+    positions = [len(expected) - 1, 0, 5]
+    assert list(snapshot.transaction_ids.take(positions)) == [expected[p] for p in positions]
+
+
+def test_reused_snapshot_reports_the_source_encoding(source, tmp_path):
+    directory = str(tmp_path / "snapshot")
+    parsed = new_decode_stats()
+    load_sales_table(source, directory, parsed)
+
+    reused = new_decode_stats()
+    load_sales_table(source, directory, reused)
+
+    assert parsed["encoding"] == "utf-8"
+    assert reused == parsed
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_columnar_validation_matches_row_pipeline(source, snapshot, filters):
+    expected_stats = new_filter_stats()
+    rows = list(iter_valid_transactions(iter_sales_records(source), expected_stats, **filters))
+
+    stats = new_filter_stats()
+    valid = snapshot.validate(stats, **filters)
+
+    assert stats == expected_stats
+    assert [dict(row) for row in valid] == rows
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_columnar_results_match_aggregator(source, snapshot, filters):
+    rows = list(iter_valid_transactions(iter_sales_records(source), new_filter_stats(), **filters))
+    expected = Aggregator(default_accumulators() + [RollupCube()]).consume(rows).results()
+
+    valid = snapshot.validate(new_filter_stats(), **filters)
+    results = valid.results()
+    cube = valid.rollup_cube()
+
+    # Per-group sums run in row order on both paths, so even fractional
+    # amounts match exactly
+    for name in ("total_revenue", "regions", "products", "customers", "daily"):
+        assert results[name] == expected[name]
+    assert cube.cells == expected["rollup"].cells
+    assert list(cube.cells) == list(expected["rollup"].cells)
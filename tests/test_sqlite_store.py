@@ -0,0 +1,90 @@
+# tests/test_sqlite_store.py
+
+import sqlite3
+
+import pytest
+
+from utils.aggregator import Aggregator, ProductSales
+from utils.data_processor import (
+    iter_sales_records,
+    iter_valid_transactions,
+    new_filter_stats,
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    low_performing_products
+)
+from utils.sqlite_store import SQLiteStore
+
+# SQLite 3.43+ sums with Kahan-Babuska compensation instead of a plain
+# running total, so fractional sums may differ in the last bits there
+EXACT_SUMS = sqlite3.sqlite_version_info < (3, 43, 0)
+
+
+def _same(actual, expected):
+    if EXACT_SUMS:
+        return actual == expected
+    return actual == pytest.approx(expected, rel=1e-12)
+
+
+def _load(path, tmp_path, batch_size):
+    transactions = list(iter_valid_transactions(iter_sales_records(path), new_filter_stats()))
+    store = SQLiteStore(str(tmp_path / "sales.db"))
+    store.load(iter(transactions), batch_size)
+    return transactions, store
+
+
+def _approx_rows(rows):
+    return rows if EXACT_SUMS else [
+        {key: pytest.approx(value, rel=1e-12) if isinstance(value, float) else value for key, value in row.items()}
+        for row in rows
+    ]
+
+
+@pytest.mark.parametrize("data", ["sales_file", "fractional_sales_file"])
+def test_every_aggregation_matches_dict_path(data, request, tmp_path):
+    # A small batch size makes the load span many executemany batches
+    transactions, store = _load(request.getfixturevalue(data), tmp_path, batch_size=97)
+
+    assert len(store) == len(transactions)
+    assert _same(store.calculate_total_revenue(), calculate_total_revenue(transactions))
+    assert store.region_wise_sales() == _approx_rows(region_wise_sales(transactions))
+    assert store.product_summary() == _approx_rows(
+        Aggregator([ProductSales()]).consume(transactions).results()["products"]
+    )
+    for top_n in (1, 3, 20):
+        assert store.top_selling_products(top_n) == _approx_rows(top_selling_products(transactions, top_n))
+    for threshold in (10, 700, 10**6):
+        assert store.low_performing_products(threshold) == _approx_rows(
+            low_performing_products(transactions, threshold)
+        )
+    assert store.customer_analysis() == _approx_rows(customer_analysis(transactions))
+
+    daily = daily_sales_trend(transactions)
+    assert list(store.daily_sales_trend()) == list(daily)
+    assert all(_same(store.daily_sales_trend()[date], revenue) for date, revenue in daily.items())
+
+    expected = Aggregator().consume(transactions).results()
+    assert store.results().keys() == expected.keys()
+    store.close()
+
+
+def test_fractional_prices_are_stored_as_given(fractional_sales_file, tmp_path):
+    transactions, store = _load(fractional_sales_file, tmp_path, batch_size=1000)
+
+    assert any(txn["UnitPrice"] != int(txn["UnitPrice"]) for txn in transactions)
+    assert _same(store.calculate_total_revenue(), calculate_total_revenue(transactions))
+    store.close()
+
+
+def test_from_transactions_replaces_previous_rows(sales_file, tmp_path):
+    path = str(tmp_path / "sales.db")
+    transactions = list(iter_valid_transactions(iter_sales_records(sales_file), new_filter_stats()))
+
+    SQLiteStore.from_transactions(transactions, path).close()
+    store = SQLiteStore.from_transactions(iter(transactions[:10]), path)
+
+    assert len(store) == 10
+    store.close()
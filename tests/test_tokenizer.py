@@ -0,0 +1,85 @@
+# tests/test_tokenizer.py
+#
+# Golden tests: the legacy parse_sales_lines/clean_sales_records path,
+# parse_transactions and the streaming reader must all agree with the
+# tokenizer and with the hand-checked expected rows below.
+
+from conftest import SAMPLE_FILE
+
+from utils.data_processor import (
+    parse_sales_lines,
+    clean_sales_records,
+    parse_transactions,
+    iter_sales_records
+)
+from utils.file_handler import read_sales_data
+from utils.tokenizer import FIELD_NAMES, tokenize_fields, tokenize_line, parse_price
+
+HEADER = "|".join(FIELD_NAMES)
+
+EDGE_CASES = [
+    # (raw line, expected cleaned row or None)
+    ("T001|2024-12-01|P101|Laptop|2|45000|C001|North",
+     ["T001", "2024-12-01", "P101", "Laptop", 2, 45000.0, "C001", "North"]),
+    ("T002|2024-12-02|P101|Laptop,Premium|1|60000|C002|East",
+     ["T002", "2024-12-02", "P101", "LaptopPremium", 1, 60000.0, "C002", "East"]),
+    ("T003|2024-12-03|P110|Laptop Charger|6|1,916|C022|East",
+     ["T003", "2024-12-03", "P110", "Laptop Charger", 6, 1916.0, "C022", "East"]),
+    ("T004|2024-12-04|P104|Monitor,LED|1|1,234,567|C004|West",
+     ["T004", "2024-12-04", "P104", "MonitorLED", 1, 1234567.0, "C004", "West"]),
+    ("T005|2024-12-05|P102|Mouse|3|799.5|C005|South",
+     ["T005", "2024-12-05", "P102", "Mouse", 3, 799.5, "C005", "South"]),
+    ("T006|2024-12-06|P103| Keyboard, |4|2000|C006|North",
+     ["T006", "2024-12-06", "P103", "Keyboard", 4, 2000.0, "C006", "North"]),
+    # Invalid but well-formed rows are kept; validation happens later
+    ("X007|2024-12-07|P105|Webcam|0|-2500|C007|",
+     ["X007", "2024-12-07", "P105", "Webcam", 0, -2500.0, "C007", ""]),
+    # Wrong field counts
+    ("T008|2024-12-08|P106|Headphones|2|2800|C008", None),
+    ("T009|2024-12-09|P106|Head|phones|2|2800|C009|East", None),
+    ("", None),
+    # Non-numeric values
+    ("T010|2024-12-10|P107|USB Cable|two|300|C010|West", None),
+    ("T011|2024-12-11|P107|USB Cable|2|3OO|C011|West", None),
+    ("T012|2024-12-12|P107|USB Cable|2.5|300|C012|West", None),
+    ("T013|2024-12-13|P107|USB Cable|2||C013|West", None)
+]
+
+
+def test_tokenize_line_golden():
+    for line, expected in EDGE_CASES:
+        row = tokenize_line(line)
+        assert (None if row is None else list(row.values())) == expected, line
+
+
+def test_tokenize_fields_golden():
+    for line, expected in EDGE_CASES:
+        assert tokenize_fields(line.split("|")) == expected, line
+
+
+def test_legacy_clean_path_matches_tokenizer():
+    lines = [line for line, _ in EDGE_CASES]
+    expected = [row for _, row in EDGE_CASES if row is not None]
+
+    legacy = clean_sales_records(parse_sales_lines([HEADER] + lines))
+    parsed = [list(txn.values()) for txn in parse_transactions(lines)]
+
+    assert legacy == expected
+    assert parsed == expected
+
+
+def test_sample_file_paths_agree():
+    lines = read_sales_data(SAMPLE_FILE)
+
+    legacy = clean_sales_records(parse_sales_lines([HEADER] + lines))
+    parsed = [list(txn.values()) for txn in parse_transactions(lines)]
+    streamed = [list(txn.values()) for txn in iter_sales_records(SAMPLE_FILE)]
+
+    assert len(legacy) == 80
+    assert legacy == parsed == streamed
+
+
+def test_parse_price():
+    assert parse_price("1,916") == 1916.0
+    assert parse_price("173.5") == 173.5
+    assert parse_price("-2500") == -2500.0
@@ -0,0 +1,218 @@
+# utils/agg_cache.py
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+
+from utils.aggregator import Aggregator, rank_top_products, filter_low_products
+from utils.data_processor import iter_valid_transactions, new_filter_stats, filter_summary
+from utils.lru import LRUCache
+from utils.tokenizer import FIELD_NAMES
+from utils.transaction_table import TransactionTable
+
+AGG_CACHE_DIR = "output/cache/aggregates"
+HASH_BLOCK = 1024 * 1024
+
+
+def source_fingerprint(filename):
+    """
+    Content hash of a raw sales file. Hashing the bytes is much cheaper
+    than parsing them, so a cache hit skips reading the rows altogether.
+    Returns hex string
+    """
+    digest = hashlib.sha256(b"file")
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+def dataset_fingerprint(transactions):
+    """
+    Content hash of a transaction set (list of dicts or TransactionTable).
+    Compute it once per dataset and pass it to AggregationCache.get_results
+    to avoid re-hashing on every call.
+    One-shot iterators are rejected: hashing would consume the rows.
+    Returns hex string
+    """
+    if iter(transactions) is transactions:
+        raise TypeError("dataset_fingerprint needs a re-iterable dataset (list or TransactionTable), not an iterator")
+
+    digest = hashlib.sha256()
+
+    if isinstance(transactions, TransactionTable):
+        digest.update(b"table")
+        columns = [transactions.quantity, transactions.unit_price]
+        columns += [transactions.codes[name] for name in sorted(transactions.codes)]
+        for column in columns:
+            digest.update(memoryview(column).cast("B"))
+
+        dictionaries = {name: d.values for name, d in transactions.dictionaries.items()}
+        digest.update(json.dumps(dictionaries, sort_keys=True).encode("utf-8"))
+        digest.update("\n".join(transactions.transaction_ids).encode("utf-8"))
+    else:
+        for txn in transactions:
+            row = tuple(txn.get(name) for name in FIELD_NAMES)
+            digest.update(repr(row).encode("utf-8"))
+            digest.update(b"\n")
+
+    return digest.hexdigest()
+def compute_results(
+    transactions,
+    region=None,
+    min_amount=None,
+    max_amount=None,
+    top_n=5,
+    threshold=10,
+    validate=True,
+    decode_stats=None
+):
+    """
+    Validates, filters and aggregates in one pass. With validate=False the
+    rows are aggregated as given, like the data_processor functions.
+    decode_stats, filled while the rows are read (see iter_sales_records),
+    adds the encoding and undecodable_bytes to the summary.
+    Returns dict with summary, total_revenue, regions, products,
+    top_products, low_products, customers and daily.
+    """
+    stats = new_filter_stats()
+    if validate:
+        transactions = iter_valid_transactions(transactions, stats, region, min_amount, max_amount)
+
+    aggregator = Aggregator().consume(transactions)
+    results = aggregator.results()
+
+    if not validate:
+        stats["total_input"] = stats["final_count"] = aggregator.count
+
+    return {
+        "summary": filter_summary(stats, decode_stats),
+        "total_revenue": results["total_revenue"],
+        "regions": results["regions"],
+        "products": results["products"],
+        "top_products": rank_top_products(results["products"], top_n),
+        "low_products": filter_low_products(results["products"], threshold),
+        "customers": results["customers"],
+        "daily": results["daily"]
+    }
+
+
+class AggregationCache:
+    """
+    Memoizes compute_results keyed by dataset fingerprint and
+    (region, min_amount, max_amount, top_n, threshold, validate).
+    Memory tier: size-bounded LRU. Optional disk tier: one pickle file
+    per key under disk_dir, consulted on memory misses.
+    """
+
+    def __init__(self, max_entries=128, disk_dir=None):
+        self.memory = LRUCache(max_entries)
+        self.disk_dir = disk_dir
+        self.disk_stats = {"hits": 0, "misses": 0, "writes": 0}
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.pkl")
+
+    def _disk_get(self, key):
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.disk_stats["misses"] += 1
+            return None
+
+        if stored_key != key:
+            self.disk_stats["misses"] += 1
+            return None
+
+        self.disk_stats["hits"] += 1
+        return value
+
+    def _disk_put(self, key, value):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, path)
+        self.disk_stats["writes"] += 1
+
+    def get_results(
+        self,
+        transactions,
+        region=None,
+        min_amount=None,
+        max_amount=None,
+        top_n=5,
+        threshold=10,
+        fingerprint=None,
+        validate=True,
+        decode_stats=None
+    ):
+        """
+        Returns compute_results(...) for these arguments, from cache when
+        the same dataset and parameters were seen before.
+        Pass fingerprint (e.g. source_fingerprint of the file) to use a
+        generator such as iter_sales_records; without one, an iterator is
+        materialized first so hashing does not consume it.
+        decode_stats is only filled on a miss; the summary it adds is
+        cached, so hits report the same encoding and undecodable_bytes.
+        """
+        if fingerprint is None:
+            if iter(transactions) is transactions:
+                transactions = list(transactions)
+            fingerprint = dataset_fingerprint(transactions)
+
+        key = (fingerprint, region, min_amount, max_amount, top_n, threshold, validate)
+
+        value = self.memory.get(key)
+        if value is None and self.disk_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                self.memory.put(key, value)
+
+        if value is None:
+            value = compute_results(
+                transactions, region, min_amount, max_amount, top_n, threshold, validate, decode_stats
+            )
+            self.memory.put(key, value)
+            if self.disk_dir:
+                self._disk_put(key, value)
+
+        # Callers may mutate the summaries; never hand out the cached objects
+        return copy.deepcopy(value)
+
+    # Memoized versions of the data_processor functions: same arguments,
+    # same results (rows are aggregated as given, without validation)
+
+    def calculate_total_revenue(self, transactions, fingerprint=None):
+        return self.get_results(transactions, fingerprint=fingerprint, validate=False)["total_revenue"]
+
+    def region_wise_sales(self, transactions, fingerprint=None):
+        return self.get_results(transactions, fingerprint=fingerprint, validate=False)["regions"]
+
+    def top_selling_products(self, transactions, top_n=5, fingerprint=None):
+        return self.get_results(transactions, top_n=top_n, fingerprint=fingerprint, validate=False)["top_products"]
+
+    def customer_analysis(self, transactions, fingerprint=None):
+        return self.get_results(transactions, fingerprint=fingerprint, validate=False)["customers"]
+
+    def daily_sales_trend(self, transactions, fingerprint=None):
+        return self.get_results(transactions, fingerprint=fingerprint, validate=False)["daily"]
+
+    def low_performing_products(self, transactions, threshold=10, fingerprint=None):
+        return self.get_results(transactions, threshold=threshold, fingerprint=fingerprint, validate=False)["low_products"]
+
+    def stats(self):
+        """
+        Returns hit/miss counters for both tiers.
+        """
+        return {
+            "memory": self.memory.info(),
+            "disk": dict(self.disk_stats) if self.disk_dir else None
+        }
@@ -0,0 +1,338 @@
+# utils/aggregator.py
+
+import heapq
+
+HIGH_VALUE_SPEND = 50000
+MEDIUM_VALUE_SPEND = 10000
+
+
+class TotalRevenue:
+    """
+    Accumulates total revenue across all transactions.
+    Result: float
+    """
+    name = "total_revenue"
+
+    def __init__(self):
+        self.total = 0.0
+
+    def add(self, txn, amount):
+        self.total += amount
+
+    def merge(self, other):
+        self.total += other.total
+
+    def state(self):
+        return self.total
+
+    def load_state(self, state):
+        self.total = state
+
+    def result(self):
+        return self.total
+
+
+class RegionSales:
+    """
+    Accumulates revenue and transaction counts per region.
+    Result: list of region summaries sorted by revenue descending
+    (same shape as region_wise_sales).
+    """
+    name = "regions"
+
+    def __init__(self):
+        self.total = 0.0
+        self.regions = {}
+
+    def add(self, txn, amount):
+        self.total += amount
+
+        region = txn["Region"]
+
+        # Skip empty region
+        if not region:
+            return
+
+        data = self.regions.get(region)
+        if data is None:
+            data = self.regions[region] = [0.0, 0]
+
+        data[0] += amount
+        data[1] += 1
+
+    def merge(self, other):
+        self.total += other.total
+
+        for region, (revenue, count) in other.regions.items():
+            data = self.regions.setdefault(region, [0.0, 0])
+            data[0] += revenue
+            data[1] += count
+
+    def state(self):
+        return {"total": self.total, "regions": self.regions}
+
+    def load_state(self, state):
+        self.total = state["total"]
+        self.regions = {region: list(data) for region, data in state["regions"].items()}
+
+    def result(self):
+        result = []
+        for region, (revenue, count) in self.regions.items():
+            percentage = (
+                (revenue / self.total) * 100
+                if self.total > 0 else 0
+            )
+            result.append({
+                "Region": region,
+                "Revenue": revenue,
+                "Transactions": count,
+                "Percentage": round(percentage, 2)
+            })
+
+        result.sort(key=lambda x: x["Revenue"], reverse=True)
+        return result
+
+
+class ProductSales:
+    """
+    Accumulates quantity and revenue per product name.
+    Result: list of product summaries in first-seen order.
+    """
+    name = "products"
+
+    def __init__(self):
+        self.products = {}
+
+    def add(self, txn, amount):
+        product = txn["ProductName"]
+
+        data = self.products.get(product)
+        if data is None:
+            data = self.products[product] = [0, 0.0]
+
+        data[0] += txn["Quantity"]
+        data[1] += amount
+
+    def merge(self, other):
+        for product, (quantity, revenue) in other.products.items():
+            data = self.products.setdefault(product, [0, 0.0])
+            data[0] += quantity
+            data[1] += revenue
+
+    def state(self):
+        return self.products
+
+    def load_state(self, state):
+        self.products = {product: list(data) for product, data in state.items()}
+
+    def result(self):
+        return [
+            {
+                "ProductName": product,
+                "TotalQuantity": quantity,
+                "Revenue": revenue
+            }
+            for product, (quantity, revenue) in self.products.items()
+        ]
+
+
+class CustomerSales:
+    """
+    Accumulates spend and transaction counts per customer.
+    Result: list of customer summaries with a spend segment
+    (same shape as customer_analysis).
+    """
+    name = "customers"
+
+    def __init__(self):
+        self.customers = {}
+
+    def add(self, txn, amount):
+        customer = txn["CustomerID"]
+
+        data = self.customers.get(customer)
+        if data is None:
+            data = self.customers[customer] = [0.0, 0]
+
+        data[0] += amount
+        data[1] += 1
+
+    def merge(self, other):
+        for customer, (spend, count) in other.customers.items():
+            data = self.customers.setdefault(customer, [0.0, 0])
+            data[0] += spend
+            data[1] += count
+
+    def state(self):
+        return self.customers
+
+    def load_state(self, state):
+        self.customers = {customer: list(data) for customer, data in state.items()}
+
+    def result(self):
+        return [
+            {
+                "CustomerID": customer,
+                "TotalSpend": spend,
+                "Transactions": count,
+                "Segment": spend_segment(spend)
+            }
+            for customer, (spend, count) in self.customers.items()
+        ]
+
+
+class DailySales:
+    """
+    Accumulates revenue per date.
+    Result: dict with Date as key and revenue as value.
+    """
+    name = "daily"
+
+    def __init__(self):
+        self.daily = {}
+
+    def add(self, txn, amount):
+        date = txn["Date"]
+        self.daily[date] = self.daily.get(date, 0.0) + amount
+
+    def merge(self, other):
+        for date, revenue in other.daily.items():
+            self.daily[date] = self.daily.get(date, 0.0) + revenue
+
+    def state(self):
+        return self.daily
+
+    def load_state(self, state):
+        self.daily = dict(state)
+
+    def result(self):
+        return dict(self.daily)
+
+
+ACCUMULATOR_TYPES = {
+    cls.name: cls
+    for cls in (TotalRevenue, RegionSales, ProductSales, CustomerSales, DailySales)
+}
+
+
+def default_accumulators():
+    """
+    Returns a fresh set of all built-in metric accumulators.
+    """
+    return [
+        TotalRevenue(),
+        RegionSales(),
+        ProductSales(),
+        CustomerSales(),
+        DailySales()
+    ]
+
+
+class Aggregator:
+    """
+    Computes every configured summary in a single pass over the
+    transactions. Each accumulator receives the transaction together
+    with its precomputed amount (Quantity * UnitPrice).
+    """
+
+    def __init__(self, accumulators=None):
+        if accumulators is None:
+            accumulators = default_accumulators()
+
+        self.accumulators = list(accumulators)
+        self.count = 0
+
+    def add(self, txn):
+        amount = txn["Quantity"] * txn["UnitPrice"]
+        self.count += 1
+
+        for accumulator in self.accumulators:
+            accumulator.add(txn, amount)
+
+    def consume(self, transactions):
+        """
+        Feeds an iterable (list or generator) of transactions through
+        all accumulators. Returns self so calls can be chained.
+        """
+        accumulators = self.accumulators
+        count = 0
+
+        for txn in transactions:
+            amount = txn["Quantity"] * txn["UnitPrice"]
+            count += 1
+
+            for accumulator in accumulators:
+                accumulator.add(txn, amount)
+
+        self.count += count
+        return self
+
+    def merge(self, other):
+        """
+        Merges the partial state of another Aggregator built with the
+        same accumulator types into this one.
+        """
+        for mine, theirs in zip(self.accumulators, other.accumulators):
+            mine.merge(theirs)
+
+        self.count += other.count
+        return self
+
+    def state(self):
+        """
+        Returns the JSON-serializable partial state of every accumulator,
+        e.g. for checkpointing between runs.
+        """
+        return {
+            "count": self.count,
+            "accumulators": [
+                [accumulator.name, accumulator.state()]
+                for accumulator in self.accumulators
+            ]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Rebuilds an Aggregator from the output of state().
+        """
+        accumulators = []
+        for name, accumulator_state in state["accumulators"]:
+            accumulator = ACCUMULATOR_TYPES[name]()
+            accumulator.load_state(accumulator_state)
+            accumulators.append(accumulator)
+
+        aggregator = cls(accumulators)
+        aggregator.count = state["count"]
+        return aggregator
+
+    def results(self):
+        """
+        Returns a dictionary of accumulator name -> result.
+        """
+        return {
+            accumulator.name: accumulator.result()
+            for accumulator in self.accumulators
+        }
+
+
+def spend_segment(total_spend):
+    """
+    Maps a customer's total spend to a value segment.
+    """
+    if total_spend >= HIGH_VALUE_SPEND:
+        return "High Value"
+    if total_spend >= MEDIUM_VALUE_SPEND:
+        return "Medium Value"
+    return "Low Value"
+def rank_top_products(products, top_n=5):
+    """
+    Returns top N product summaries by quantity sold.
+    Bounded heap selection: same order as a full stable sort, O(n log N).
+    """
+    return heapq.nlargest(top_n, products, key=lambda x: x["TotalQuantity"])
+def filter_low_products(products, threshold=10):
+    """
+    Returns product summaries with total quantity below the threshold.
+    """
+    return [p for p in products if p["TotalQuantity"] < threshold]
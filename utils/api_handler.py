@@ -1,33 +1,113 @@
 # utils/api_handler.py
 
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+PRODUCTS_URL = "https://dummyjson.com/products"
+PAGE_SIZE = 100
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+PRODUCT_FIELDS = ["title", "category", "brand", "price", "rating"]
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def create_session(pool_size=MAX_WORKERS):
+    """
+    Creates a requests.Session with a keep-alive connection pool
+    large enough for pool_size concurrent requests.
+    Returns: requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+def project_product(p, fields=PRODUCT_FIELDS):
+    """
+    Keeps only the product id and the requested fields.
+    Returns: dict
+    """
+    product = {"id": p.get("id")}
+    for field in fields:
+        product[field] = p.get(field)
+    return product
+def fetch_products_page(session, url, skip, limit, fields=PRODUCT_FIELDS, headers=None):
+    """
+    Fetches one page of products, retrying transient failures
+    with exponential backoff.
+    Returns: requests.Response
+    """
+    params = {"limit": limit, "skip": skip}
+    if fields:
+        params["select"] = ",".join(fields)
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=10)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+
+        time.sleep(RETRY_BACKOFF * (2 ** attempt))
+def fetch_product_pages(
+    url=PRODUCTS_URL,
+    page_size=PAGE_SIZE,
+    max_workers=MAX_WORKERS,
+    fields=PRODUCT_FIELDS,
+    session=None,
+    first_page=None
+):
+    """
+    Walks limit/skip pagination, fetching the remaining pages concurrently
+    over a shared session once the first page reports the total.
+    Raises requests.exceptions.RequestException on failure.
+    Returns: list of product dictionaries in catalog order
+    """
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers)
 
-def fetch_all_products():
+    try:
+        if first_page is None:
+            first_page = fetch_products_page(session, url, 0, page_size, fields).json()
+
+        pages = [first_page.get("products", [])]
+        total = first_page.get("total", len(pages[0]))
+        skips = range(page_size, total, page_size)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = executor.map(
+                lambda skip: fetch_products_page(session, url, skip, page_size, fields),
+                skips
+            )
+            for response in responses:
+                pages.append(response.json().get("products", []))
+
+    finally:
+        if own_session:
+            session.close()
+
+    return [project_product(p, fields) for page in pages for p in page]
+def fetch_all_products(
+    url=PRODUCTS_URL,
+    page_size=PAGE_SIZE,
+    max_workers=MAX_WORKERS,
+    fields=PRODUCT_FIELDS
+):
     """
     Fetches all products from DummyJSON API
     Returns: list of product dictionaries
     """
-    url = "https://dummyjson.com/products?limit=100"
-
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
-        products = data.get("products", [])
-
-        result = []
-        for p in products:
-            result.append({
-                "id": p.get("id"),
-                "title": p.get("title"),
-                "category": p.get("category"),
-                "brand": p.get("brand"),
-                "price": p.get("price"),
-                "rating": p.get("rating")
-            })
-
-        return result
+        return fetch_product_pages(url, page_size, max_workers, fields)
 
     except requests.exceptions.RequestException as e:
         print(f"API ERROR: {e}")
@@ -59,32 +139,84 @@ def extract_numeric_product_id(product_id):
         return int(numeric_part)
 
     return None
+
+
+# Enriched column name -> catalog field
+ENRICHMENT_FIELDS = {
+    "ProductTitle": "title",
+    "Category": "category",
+    "Brand": "brand",
+    "API_Price": "price",
+    "Rating": "rating"
+}
+
+
+class ProductIndex:
+    """
+    Maps sales ProductIDs ('P107') to catalog rows.
+    Each distinct ProductID is resolved once and then served from a dict.
+    """
+
+    def __init__(self, product_mapping):
+        self.product_mapping = product_mapping
+        self.rows = {}
+
+    def lookup(self, product_id):
+        try:
+            return self.rows[product_id]
+        except KeyError:
+            row = self.product_mapping.get(extract_numeric_product_id(product_id))
+            self.rows[product_id] = row
+            return row
+
+
+class EnrichedTransaction(Mapping):
+    """
+    Read-only join of a transaction with its catalog row.
+    Enrichment columns are read through the shared product reference,
+    so nothing is copied into (or mutated on) the transaction.
+    """
+    __slots__ = ("txn", "product")
+
+    def __init__(self, txn, product):
+        self.txn = txn
+        self.product = product
+
+    def __getitem__(self, key):
+        field = ENRICHMENT_FIELDS.get(key)
+        if field is not None:
+            return self.product.get(field) if self.product else None
+        return self.txn[key]
+
+    def __iter__(self):
+        for key in self.txn:
+            if key not in ENRICHMENT_FIELDS:
+                yield key
+        yield from ENRICHMENT_FIELDS
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return f"EnrichedTransaction({dict(self)!r})"
+
+
+def iter_enriched(transactions, product_mapping):
+    """
+    Lazily enriches transactions one row at a time, so a stream can be
+    joined with the catalog without building a list.
+    """
+    index = ProductIndex(product_mapping)
+
+    for txn in transactions:
+        yield EnrichedTransaction(txn, index.lookup(txn.get("ProductID")))
 def enrich_sales_data(transactions, product_mapping):
     """
     Enriches sales transactions with API product details.
+    Builds the ProductID index once and joins each row by reference.
     Returns list of enriched transactions.
     """
-    enriched_transactions = []
-
-    for txn in transactions:
-        enriched_txn = txn.copy()
-
-        numeric_id = extract_numeric_product_id(txn.get("ProductID"))
-        product = product_mapping.get(numeric_id)
-
-        if product:
-            enriched_txn["ProductTitle"] = product.get("title")
-            enriched_txn["Category"] = product.get("category")
-            enriched_txn["Brand"] = product.get("brand")
-            enriched_txn["API_Price"] = product.get("price")
-            enriched_txn["Rating"] = product.get("rating")
-        else:
-            enriched_txn["ProductTitle"] = None
-            enriched_txn["Category"] = None
-            enriched_txn["Brand"] = None
-            enriched_txn["API_Price"] = None
-            enriched_txn["Rating"] = None
-
-        enriched_transactions.append(enriched_txn)
-
-    return enriched_transactions
+    return list(iter_enriched(transactions, product_mapping))
@@ -0,0 +1,250 @@
+# utils/catalog_cache.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from utils.api_handler import (
+    PRODUCTS_URL,
+    PAGE_SIZE,
+    MAX_WORKERS,
+    create_session,
+    fetch_products_page,
+    project_product
+)
+
+CACHE_FILE = "output/cache/products.json"
+DEFAULT_TTL = 24 * 60 * 60              # serve from cache for 1 day
+DEFAULT_STALE_WINDOW = 7 * 24 * 60 * 60  # then serve stale while revalidating
+REVALIDATION_TIMEOUT = 5                # seconds to let a background refresh finish at exit
+
+CACHE_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "stale": 0,
+    "revalidated": 0,
+    "refreshed": 0,
+    "errors": 0
+}
+
+_refresh_lock = threading.Lock()
+_revalidation = None
+
+
+def load_cache(cache_path=CACHE_FILE):
+    """
+    Loads the cached catalog entry from disk.
+    Returns dict or None if missing/corrupt.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(entry, dict) or "products" not in entry:
+        return None
+
+    return entry
+def save_cache(entry, cache_path=CACHE_FILE):
+    """
+    Writes the catalog entry atomically (temp file + rename).
+    """
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+    os.replace(tmp_path, cache_path)
+def _conditional_headers(page):
+    headers = {}
+    if page and page.get("etag"):
+        headers["If-None-Match"] = page["etag"]
+    if page and page.get("last_modified"):
+        headers["If-Modified-Since"] = page["last_modified"]
+    return headers
+def _page_validators(skip, response):
+    return {
+        "skip": skip,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified")
+    }
+def _fetch_pages(session, url, pages, page_size):
+    """
+    Requests every page concurrently over the shared session, conditionally
+    when the page dict carries validators.
+    Returns the responses in page order
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(
+            lambda page: fetch_products_page(
+                session, url, page["skip"], page_size, headers=_conditional_headers(page)
+            ),
+            pages
+        ))
+def _fetch_catalog(session, url):
+    """
+    Unconditional paginated fetch, keeping each page's validators.
+    Returns (products, pages, total)
+    """
+    first = fetch_products_page(session, url, 0, PAGE_SIZE)
+    body = first.json()
+    total = body.get("total", len(body.get("products", [])))
+
+    skips = range(PAGE_SIZE, total, PAGE_SIZE)
+    rest = _fetch_pages(session, url, [{"skip": skip} for skip in skips], PAGE_SIZE)
+    responses = [first] + rest
+    bodies = [body] + [response.json() for response in rest]
+
+    products = [project_product(p) for page in bodies for p in page.get("products", [])]
+    pages = [_page_validators(i * PAGE_SIZE, response) for i, response in enumerate(responses)]
+    return products, pages, total
+def _revalidate_pages(session, url, entry):
+    """
+    Sends a conditional request for every cached page. Pages answered with
+    304 keep their cached products; changed pages replace theirs.
+    Returns (products, pages, changed page count), or None when the
+    catalog total changed and the pagination has to be redone.
+    """
+    page_size = entry["page_size"]
+    responses = _fetch_pages(session, url, entry["pages"], page_size)
+
+    products = []
+    pages = []
+    changed = 0
+    for page, response in zip(entry["pages"], responses):
+        skip = page["skip"]
+        if response.status_code == 304:
+            products.extend(entry["products"][skip:skip + page_size])
+            pages.append(page)
+            continue
+
+        body = response.json()
+        if body.get("total") != entry["total"]:
+            return None
+        products.extend(project_product(p) for p in body.get("products", []))
+        pages.append(_page_validators(skip, response))
+        changed += 1
+
+    return products, pages, changed
+def revalidate(entry, url=PRODUCTS_URL, cache_path=CACHE_FILE):
+    """
+    Revalidates every cached page with its own ETag / Last-Modified: the
+    API computes validators per response body, so a change to a product
+    on a later page leaves the first page's ETag unchanged. If all pages
+    answer 304 only the timestamp is refreshed; changed pages are
+    replaced, and a changed total (or no usable entry) triggers a full
+    paginated fetch.
+    Returns the up-to-date entry, or None if a request failed.
+    """
+    session = create_session()
+    try:
+        result = None
+        if entry and entry.get("pages") and entry.get("page_size") == PAGE_SIZE:
+            result = _revalidate_pages(session, url, entry)
+
+        if result is None:
+            products, pages, total = _fetch_catalog(session, url)
+            changed = len(pages)
+        else:
+            products, pages, changed = result
+            total = entry["total"]
+
+        if changed:
+            CACHE_STATS["refreshed"] += 1
+        else:
+            CACHE_STATS["revalidated"] += 1
+
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "page_size": PAGE_SIZE,
+            "total": total,
+            "pages": pages,
+            "products": products
+        }
+        save_cache(entry, cache_path)
+        return entry
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        CACHE_STATS["errors"] += 1
+        print(f"API ERROR: {e}")
+        return None
+
+    finally:
+        session.close()
+def _background_revalidate(entry, url, cache_path):
+    try:
+        revalidate(entry, url, cache_path)
+    finally:
+        _refresh_lock.release()
+def get_products(
+    url=PRODUCTS_URL,
+    cache_path=CACHE_FILE,
+    ttl=DEFAULT_TTL,
+    stale_window=DEFAULT_STALE_WINDOW
+):
+    """
+    Returns the product catalog, going to the network only when needed.
+    - fresh cache (age < ttl): served directly, no network round-trip
+    - stale within stale_window: served immediately, revalidated in background
+    - older or missing: revalidated synchronously; on failure the stale copy
+      is used if one exists
+    Returns: list of product dictionaries
+    """
+    global _revalidation
+
+    entry = load_cache(cache_path)
+    if entry and entry.get("url") != url:
+        entry = None
+
+    if entry:
+        age = time.time() - entry.get("fetched_at", 0)
+
+        if age < ttl:
+            CACHE_STATS["hits"] += 1
+            return entry["products"]
+
+        if age < ttl + stale_window:
+            CACHE_STATS["stale"] += 1
+            if _refresh_lock.acquire(blocking=False):
+                # Daemon: never keeps the process alive; the cache file is
+                # replaced atomically, so an interrupted refresh is harmless
+                _revalidation = threading.Thread(
+                    target=_background_revalidate,
+                    args=(entry, url, cache_path),
+                    daemon=True
+                )
+                _revalidation.start()
+            return entry["products"]
+    else:
+        CACHE_STATS["misses"] += 1
+
+    fresh = revalidate(entry, url, cache_path)
+    if fresh:
+        return fresh["products"]
+
+    if entry:
+        CACHE_STATS["stale"] += 1
+        return entry["products"]
+
+    return []
+def wait_for_revalidation(timeout=REVALIDATION_TIMEOUT):
+    """
+    Waits up to timeout seconds for a background revalidation started by
+    get_products, e.g. before the process exits.
+    Returns True if none is still running
+    """
+    thread = _revalidation
+    if thread is None:
+        return True
+
+    thread.join(timeout)
+    return not thread.is_alive()
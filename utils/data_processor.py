@@ -1,5 +1,21 @@
 # utils/data_processor.py
 
+from utils.file_handler import iter_sales_lines
+from utils.tokenizer import tokenize_fields, tokenize_line, iter_tokenized
+from utils.aggregator import (
+    Aggregator,
+    TotalRevenue,
+    RegionSales,
+    ProductSales,
+    CustomerSales,
+    DailySales,
+    rank_top_products,
+    filter_low_products
+)
+from utils.sqlite_store import SQLiteStore
+from utils.transaction_table import TransactionTable
+
+
 def parse_sales_lines(lines):
     """
     Parses raw sales lines into structured records.
@@ -24,34 +40,17 @@ def clean_sales_records(records):
     """
     Cleans parsed sales records:
     - Removes commas from ProductName
-    - Converts Quantity and UnitPrice to integers
+    - Converts Quantity to int and UnitPrice to float
+    Uses the same tokenizer rules as parse_transactions.
     """
     cleaned_records = []
 
     for record in records:
-        transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region = record
-
-        # Clean product name (remove commas)
-        product_name = product_name.replace(",", "").strip()
-
-        # Clean numeric fields
-        try:
-            quantity = int(quantity)
-            unit_price = int(unit_price.replace(",", ""))
-        except ValueError:
-            # Skip records where numeric conversion fails
-            continue
+        cleaned = tokenize_fields(record)
 
-        cleaned_records.append([
-            transaction_id,
-            date,
-            product_id,
-            product_name,
-            quantity,
-            unit_price,
-            customer_id,
-            region
-        ])
+        # Skip records where numeric conversion fails
+        if cleaned is not None:
+            cleaned_records.append(cleaned)
 
     return cleaned_records
 def validate_sales_records(records):
@@ -81,266 +80,203 @@ def validate_sales_records(records):
         valid_records.append(record)
 
     return valid_records, invalid_count
+def parse_transaction_line(line):
+    """
+    Parses a single raw sales line into a transaction dictionary.
+    Returns None for malformed rows.
+    """
+    return tokenize_line(line)
+def iter_transactions(raw_lines):
+    """
+    Lazily parses raw sales lines, yielding one transaction dictionary
+    at a time. Malformed rows are skipped.
+    """
+    return iter_tokenized(raw_lines)
 def parse_transactions(raw_lines):
     """
     Parses raw sales lines into a clean list of dictionaries.
     """
-    transactions = []
-
-    for line in raw_lines:
-        fields = line.split("|")
-
-        # Skip malformed rows
-        if len(fields) != 8:
-            continue
-
-        (
-            transaction_id,
-            date,
-            product_id,
-            product_name,
-            quantity,
-            unit_price,
-            customer_id,
-            region
-        ) = fields
-
-        # Clean product name
-        product_name = product_name.replace(",", "").strip()
-
-        # Clean numeric fields
-        try:
-            quantity = int(quantity)
-            unit_price = float(unit_price.replace(",", ""))
-        except ValueError:
-            continue
+    return list(iter_transactions(raw_lines))
+def iter_sales_records(filename, decode_stats=None):
+    """
+    Streams parsed transactions straight from the sales file.
+    Memory use stays bounded regardless of file size.
+    Pass new_decode_stats() to learn the detected encoding and how many
+    bytes needed the fallback decoder.
+    """
+    return iter_transactions(iter_sales_lines(filename, decode_stats=decode_stats))
+def new_filter_stats():
+    """
+    Returns an empty set of validation/filter counters.
+    """
+    return {
+        "total_input": 0,
+        "invalid": 0,
+        "filtered_by_region": 0,
+        "filtered_by_amount": 0,
+        "final_count": 0,
+        "regions_available": set(),
+        "min_amount_seen": None,
+        "max_amount_seen": None
+    }
+def merge_filter_stats(stats, other):
+    """
+    Merges counters from another partial run (e.g. a worker chunk) into stats.
+    """
+    for key in ("total_input", "invalid", "filtered_by_region", "filtered_by_amount", "final_count"):
+        stats[key] += other[key]
 
-        transaction = {
-            "TransactionID": transaction_id,
-            "Date": date,
-            "ProductID": product_id,
-            "ProductName": product_name,
-            "Quantity": quantity,
-            "UnitPrice": unit_price,
-            "CustomerID": customer_id,
-            "Region": region
-        }
+    stats["regions_available"] |= other["regions_available"]
 
-        transactions.append(transaction)
+    if other["min_amount_seen"] is not None:
+        if stats["min_amount_seen"] is None or other["min_amount_seen"] < stats["min_amount_seen"]:
+            stats["min_amount_seen"] = other["min_amount_seen"]
+        if stats["max_amount_seen"] is None or other["max_amount_seen"] > stats["max_amount_seen"]:
+            stats["max_amount_seen"] = other["max_amount_seen"]
 
-    return transactions
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+    return stats
+def iter_valid_transactions(transactions, stats, region=None, min_amount=None, max_amount=None):
     """
-    Validates transactions and applies optional filters.
-    Returns (valid_transactions, invalid_count, summary)
+    Lazily validates and filters transactions, yielding the ones that pass.
+    Counters are recorded into the stats dict from new_filter_stats().
     """
-    valid_transactions = []
-    invalid_count = 0
+    regions_available = stats["regions_available"]
 
-    regions_available = set()
-    amounts = []
-
-    # ---------- VALIDATION ----------
     for txn in transactions:
+        stats["total_input"] += 1
+
+        # ---------- VALIDATION ----------
         try:
             if not txn["TransactionID"].startswith("T"):
-                invalid_count += 1
+                stats["invalid"] += 1
                 continue
 
             if not txn["ProductID"].startswith("P"):
-                invalid_count += 1
+                stats["invalid"] += 1
                 continue
 
             if not txn["CustomerID"].startswith("C"):
-                invalid_count += 1
+                stats["invalid"] += 1
                 continue
 
             if not txn["Region"]:
-                invalid_count += 1
+                stats["invalid"] += 1
                 continue
 
             if txn["Quantity"] <= 0 or txn["UnitPrice"] <= 0:
-                invalid_count += 1
+                stats["invalid"] += 1
                 continue
 
-            regions_available.add(txn["Region"])
-            amounts.append(txn["Quantity"] * txn["UnitPrice"])
-            valid_transactions.append(txn)
-
         except KeyError:
-            invalid_count += 1
+            stats["invalid"] += 1
             continue
 
-    # ---------- DISPLAY INFO ----------
-    print("Available Regions:", sorted(regions_available))
-    if amounts:
-        print(f"Transaction Amount Range: {min(amounts)} - {max(amounts)}")
-
-    # ---------- FILTERING ----------
-    filtered_transactions = valid_transactions
-    filtered_by_region = 0
-    filtered_by_amount = 0
-
-    if region:
-        before = len(filtered_transactions)
-        filtered_transactions = [
-            t for t in filtered_transactions if t["Region"] == region
-        ]
-        filtered_by_region = before - len(filtered_transactions)
-
-    if min_amount is not None:
-        before = len(filtered_transactions)
-        filtered_transactions = [
-            t for t in filtered_transactions
-            if (t["Quantity"] * t["UnitPrice"]) >= min_amount
-        ]
-        filtered_by_amount += before - len(filtered_transactions)
-
-    if max_amount is not None:
-        before = len(filtered_transactions)
-        filtered_transactions = [
-            t for t in filtered_transactions
-            if (t["Quantity"] * t["UnitPrice"]) <= max_amount
-        ]
-        filtered_by_amount += before - len(filtered_transactions)
+        amount = txn["Quantity"] * txn["UnitPrice"]
+        regions_available.add(txn["Region"])
+        if stats["min_amount_seen"] is None or amount < stats["min_amount_seen"]:
+            stats["min_amount_seen"] = amount
+        if stats["max_amount_seen"] is None or amount > stats["max_amount_seen"]:
+            stats["max_amount_seen"] = amount
+
+        # ---------- FILTERING ----------
+        if region and txn["Region"] != region:
+            stats["filtered_by_region"] += 1
+            continue
+
+        if min_amount is not None and amount < min_amount:
+            stats["filtered_by_amount"] += 1
+            continue
 
+        if max_amount is not None and amount > max_amount:
+            stats["filtered_by_amount"] += 1
+            continue
+
+        stats["final_count"] += 1
+        yield txn
+def print_filter_info(stats):
+    """
+    Displays the regions and amount range seen among valid transactions.
+    """
+    print("Available Regions:", sorted(stats["regions_available"]))
+    if stats["min_amount_seen"] is not None:
+        print(f"Transaction Amount Range: {stats['min_amount_seen']} - {stats['max_amount_seen']}")
+def filter_summary(stats, decode_stats=None):
+    """
+    Returns the validation summary dictionary from the filter counters,
+    plus the detected encoding and undecodable_bytes when decode_stats
+    (see new_decode_stats) is given.
+    """
     summary = {
-        "total_input": len(transactions),
-        "invalid": invalid_count,
-        "filtered_by_region": filtered_by_region,
-        "filtered_by_amount": filtered_by_amount,
-        "final_count": len(filtered_transactions)
+        "total_input": stats["total_input"],
+        "invalid": stats["invalid"],
+        "filtered_by_region": stats["filtered_by_region"],
+        "filtered_by_amount": stats["filtered_by_amount"],
+        "final_count": stats["final_count"]
     }
+    if decode_stats is not None:
+        summary["encoding"] = decode_stats["encoding"]
+        summary["undecodable_bytes"] = decode_stats["undecodable_bytes"]
+    return summary
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+    """
+    Validates transactions and applies optional filters.
+    Accepts any iterable (including a generator) and makes a single pass.
+    Returns (valid_transactions, invalid_count, summary)
+    """
+    stats = new_filter_stats()
+    filtered_transactions = list(
+        iter_valid_transactions(transactions, stats, region, min_amount, max_amount)
+    )
+
+    # ---------- DISPLAY INFO ----------
+    print_filter_info(stats)
 
-    return filtered_transactions, invalid_count, summary
+    return filtered_transactions, stats["invalid"], filter_summary(stats)
 def calculate_total_revenue(transactions):
     """
     Calculates total revenue from all transactions
     Returns: float
     """
-    total_revenue = 0.0
-
-    for txn in transactions:
-        total_revenue += txn["Quantity"] * txn["UnitPrice"]
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.calculate_total_revenue()
 
-    return total_revenue
+    return Aggregator([TotalRevenue()]).consume(transactions).results()["total_revenue"]
 def region_wise_sales(transactions):
     """
     Calculates region-wise sales summary.
     Returns a list of dictionaries sorted by revenue descending.
     """
-    region_summary = {}
-    total_revenue = 0.0
-
-    for txn in transactions:
-        total_revenue += txn["Quantity"] * txn["UnitPrice"]
-
-    for txn in transactions:
-        region = txn["Region"]
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.region_wise_sales()
 
-        # Skip empty region
-        if not region:
-            continue
-
-        revenue = txn["Quantity"] * txn["UnitPrice"]
-
-        if region not in region_summary:
-            region_summary[region] = {
-                "Region": region,
-                "Revenue": 0.0,
-                "Transactions": 0
-            }
-
-        region_summary[region]["Revenue"] += revenue
-        region_summary[region]["Transactions"] += 1
-
-    result = []
-    for data in region_summary.values():
-        percentage = (
-            (data["Revenue"] / total_revenue) * 100
-            if total_revenue > 0 else 0
-        )
-        data["Percentage"] = round(percentage, 2)
-        result.append(data)
-
-    result.sort(key=lambda x: x["Revenue"], reverse=True)
-    return result
+    return Aggregator([RegionSales()]).consume(transactions).results()["regions"]
 def top_selling_products(transactions, top_n=5):
     """
     Returns top N selling products by quantity.
     """
-    product_summary = {}
-
-    for txn in transactions:
-        product = txn["ProductName"]
-        quantity = txn["Quantity"]
-        revenue = txn["Quantity"] * txn["UnitPrice"]
-
-        if product not in product_summary:
-            product_summary[product] = {
-                "ProductName": product,
-                "TotalQuantity": 0,
-                "Revenue": 0.0
-            }
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.top_selling_products(top_n)
 
-        product_summary[product]["TotalQuantity"] += quantity
-        product_summary[product]["Revenue"] += revenue
-
-    result = list(product_summary.values())
-    result.sort(key=lambda x: x["TotalQuantity"], reverse=True)
-
-    return result[:top_n]
+    products = Aggregator([ProductSales()]).consume(transactions).results()["products"]
+    return rank_top_products(products, top_n)
 def customer_analysis(transactions):
     """
     Performs customer-wise analysis and segmentation.
     Returns a list of customer summaries.
     """
-    customer_summary = {}
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.customer_analysis()
 
-    for txn in transactions:
-        customer = txn["CustomerID"]
-        spend = txn["Quantity"] * txn["UnitPrice"]
-
-        if customer not in customer_summary:
-            customer_summary[customer] = {
-                "CustomerID": customer,
-                "TotalSpend": 0.0,
-                "Transactions": 0
-            }
-
-        customer_summary[customer]["TotalSpend"] += spend
-        customer_summary[customer]["Transactions"] += 1
-
-    result = []
-    for data in customer_summary.values():
-        if data["TotalSpend"] >= 50000:
-            segment = "High Value"
-        elif data["TotalSpend"] >= 10000:
-            segment = "Medium Value"
-        else:
-            segment = "Low Value"
-
-        data["Segment"] = segment
-        result.append(data)
-
-    return result
+    return Aggregator([CustomerSales()]).consume(transactions).results()["customers"]
 def daily_sales_trend(transactions):
     """
     Calculates daily sales revenue.
     Returns a dictionary with Date as key and TotalRevenue as value.
     """
-    daily_sales = {}
-
-    for txn in transactions:
-        date = txn["Date"]
-        revenue = txn["Quantity"] * txn["UnitPrice"]
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.daily_sales_trend()
 
-        if date not in daily_sales:
-            daily_sales[date] = 0.0
-
-        daily_sales[date] += revenue
-
-    return daily_sales
+    return Aggregator([DailySales()]).consume(transactions).results()["daily"]
 def find_peak_sales_day(daily_sales):
     """
     Identifies the day with the highest sales.
@@ -358,28 +294,8 @@ def low_performing_products(transactions, threshold=10):
     Identifies products with total quantity sold below the given threshold.
     Returns a list of product summaries.
     """
-    product_summary = {}
-
-    for txn in transactions:
-        product = txn["ProductName"]
-        quantity = txn["Quantity"]
-        revenue = txn["Quantity"] * txn["UnitPrice"]
-
-        if product not in product_summary:
-            product_summary[product] = {
-                "ProductName": product,
-                "TotalQuantity": 0,
-                "Revenue": 0.0
-            }
-
-        product_summary[product]["TotalQuantity"] += quantity
-        product_summary[product]["Revenue"] += revenue
-
-    low_products = [
-        data for data in product_summary.values()
-        if data["TotalQuantity"] < threshold
-    ]
-
-    return low_products
-
+    if isinstance(transactions, (TransactionTable, SQLiteStore)):
+        return transactions.low_performing_products(threshold)
 
+    products = Aggregator([ProductSales()]).consume(transactions).results()["products"]
+    return filter_low_products(products, threshold)
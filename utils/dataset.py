@@ -0,0 +1,190 @@
+# utils/dataset.py
+
+import glob
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from utils.aggregator import Aggregator
+from utils.file_handler import iter_decoded_lines, new_decode_stats, merge_decode_stats
+from utils.data_processor import (
+    iter_transactions,
+    iter_valid_transactions,
+    new_filter_stats,
+    merge_filter_stats,
+    print_filter_info,
+    filter_summary
+)
+
+DATA_SUFFIXES = (".txt", ".txt.gz", ".txt.zst")
+DEFAULT_WORKERS = 4
+
+# date=2024-12-01, 2024-12-01, 2024/12/01 or date=20241201 anywhere in the path
+PARTITION_DATE = re.compile(
+    r"(?<!\d)(\d{4})([-/])(\d{2})\2(\d{2})(?!\d)|date=(\d{4})(\d{2})(\d{2})(?!\d)"
+)
+
+
+def list_dataset_files(source):
+    """
+    Resolves a file, a directory (searched recursively for DATA_SUFFIXES)
+    or a glob pattern to a sorted list of data files.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(DATA_SUFFIXES):
+                    paths.append(os.path.join(root, name))
+        return paths
+
+    if glob.has_magic(source):
+        return sorted(p for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+
+    if os.path.isfile(source):
+        return [source]
+
+    print(f"ERROR: No data files found for -> {source}")
+    return []
+def normalize_date(text):
+    """
+    Validates a start/end date. Dates are compared as strings, so a
+    shorthand such as '2024-12-1' is zero-padded.
+    Raises ValueError if the text is not a Y-M-D calendar date.
+    Returns 'YYYY-MM-DD'
+    """
+    return datetime.strptime(text, "%Y-%m-%d").date().isoformat()
+def partition_date(path):
+    """
+    Extracts the date partition from a path (the last date-like segment).
+    Returns 'YYYY-MM-DD' or None
+    """
+    date = None
+
+    for match in PARTITION_DATE.finditer(path):
+        if match.group(1):
+            year, month, day = match.group(1), match.group(3), match.group(4)
+        else:
+            year, month, day = match.group(5), match.group(6), match.group(7)
+
+        if 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
+            date = f"{year}-{month}-{day}"
+
+    return date
+def prune_by_date(paths, start_date=None, end_date=None):
+    """
+    Drops files whose path partition date falls outside [start_date, end_date].
+    Files without a date partition are kept.
+    Returns (kept_paths, pruned_count)
+    """
+    if start_date is None and end_date is None:
+        return list(paths), 0
+
+    kept = []
+    for path in paths:
+        date = partition_date(path)
+        if date is not None and (
+            (start_date is not None and date < start_date)
+            or (end_date is not None and date > end_date)
+        ):
+            continue
+        kept.append(path)
+
+    return kept, len(paths) - len(kept)
+def _filter_dates(transactions, start_date, end_date, counter):
+    for txn in transactions:
+        date = txn["Date"]
+        if (start_date is not None and date < start_date) or (end_date is not None and date > end_date):
+            counter["filtered_by_date"] += 1
+            continue
+        yield txn
+def process_file(path, region=None, min_amount=None, max_amount=None, start_date=None, end_date=None):
+    """
+    Worker: streams, validates, filters and aggregates one (possibly
+    compressed) file. Rows outside the date range are dropped before
+    validation, since partitions may hold rows from neighbouring days.
+    Returns (filter stats, decode stats, filtered_by_date, partial Aggregator)
+    """
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    counter = {"filtered_by_date": 0}
+
+    transactions = iter_transactions(iter_decoded_lines(path, decode_stats=decode_stats))
+    if start_date is not None or end_date is not None:
+        transactions = _filter_dates(transactions, start_date, end_date, counter)
+
+    aggregator = Aggregator().consume(
+        iter_valid_transactions(transactions, stats, region, min_amount, max_amount)
+    )
+
+    return stats, decode_stats, counter["filtered_by_date"], aggregator
+def aggregate_dataset(
+    source,
+    workers=DEFAULT_WORKERS,
+    region=None,
+    min_amount=None,
+    max_amount=None,
+    start_date=None,
+    end_date=None
+):
+    """
+    Aggregates every file of a dataset (directory, glob or single file).
+    start_date / end_date are inclusive and validated with normalize_date.
+    Files are pruned by their date partition first, then processed by a
+    bounded pool of worker processes with at most 2 * workers files in
+    flight. Partial aggregates are merged in sorted path order, so results
+    do not depend on scheduling. Float revenue totals are summed per file
+    first: exact for whole-number amounts, otherwise equal to one combined
+    pass up to float rounding (relative error around 1e-15 per merged
+    file, tested at 1e-12). Each file's encoding is sniffed on its own;
+    the summary lists the distinct encodings found.
+    Returns (Aggregator, summary)
+    """
+    if start_date is not None:
+        start_date = normalize_date(start_date)
+    if end_date is not None:
+        end_date = normalize_date(end_date)
+
+    paths, pruned = prune_by_date(list_dataset_files(source), start_date, end_date)
+    args = (region, min_amount, max_amount, start_date, end_date)
+
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    aggregator = Aggregator()
+    filtered_by_date = 0
+
+    def merge(result):
+        nonlocal filtered_by_date
+        partial_stats, partial_decode_stats, partial_dates, partial_aggregator = result
+        merge_filter_stats(stats, partial_stats)
+        merge_decode_stats(decode_stats, partial_decode_stats)
+        aggregator.merge(partial_aggregator)
+        filtered_by_date += partial_dates
+
+    if workers <= 1:
+        for path in paths:
+            merge(process_file(path, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            for path in paths:
+                if len(pending) >= 2 * workers:
+                    merge(pending.popleft().result())
+                pending.append(executor.submit(process_file, path, *args))
+
+            while pending:
+                merge(pending.popleft().result())
+
+    # ---------- DISPLAY INFO ----------
+    print_filter_info(stats)
+
+    summary = filter_summary(stats, decode_stats)
+    summary["files"] = len(paths)
+    summary["files_pruned"] = pruned
+    summary["filtered_by_date"] = filtered_by_date
+
+    return aggregator, summary
@@ -0,0 +1,254 @@
+# utils/external_groupby.py
+#
+# Bounded-memory group-by for high-cardinality keys (CustomerID,
+# ProductName with tens of millions of distinct values).
+#
+# Rows are aggregated into an in-memory buffer of partial aggregates
+# (first-seen row, count, quantity, revenue) until its estimated size
+# reaches the memory budget; the buffer is then written as a run file
+# sorted by key and cleared. Run size grows with the number of groups,
+# not rows. At the end the runs are k-way merged with heapq.merge, so only
+# one record per run is held in memory.
+# Counts and quantities are exact. Revenue partial sums are added per run,
+# like the per-chunk merges in utils/parallel.py and utils/dataset.py:
+# exact for whole-number amounts, otherwise equal to the in-memory sums
+# up to float rounding (relative error around 1e-15 per merged run).
+
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+
+from utils.aggregator import spend_segment
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024  # bytes
+MAX_MERGE_RUNS = 64  # run files open at once during a merge pass
+
+# Rough CPython cost of one buffered group (dict slot, key string,
+# group list and counters), used to estimate the buffer size
+GROUP_BYTES = 240
+
+
+def _write_run(path, records):
+    with open(path, "wb") as file:
+        for record in records:
+            pickle.dump(record, file, pickle.HIGHEST_PROTOCOL)
+def _read_run(path):
+    with open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+def _combine(records):
+    """
+    Folds consecutive records with the same key (in run order) into one.
+    """
+    current = None
+    for key, first, count, quantity, revenue in records:
+        if current is not None and key == current[0]:
+            current[2] += count
+            current[3] += quantity
+            current[4] += revenue
+            continue
+
+        if current is not None:
+            yield tuple(current)
+        current = [key, first, count, quantity, revenue]
+
+    if current is not None:
+        yield tuple(current)
+
+
+class ExternalGroupBy:
+    """
+    Groups rows by one key column under a memory budget (bytes, estimated).
+    Each group tracks its first-seen row index, row count, total quantity
+    and revenue; only these partial aggregates are spilled. Use as a context manager (or call close) to remove the
+    spill files.
+    """
+
+    def __init__(self, key, memory_limit=DEFAULT_MEMORY_LIMIT, spill_dir=None):
+        self.key = key
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.buffer = {}
+        self.buffered_bytes = 0
+        self.rows = 0
+        self.runs = []
+        self._tmp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
+        self.runs = []
+
+    def add(self, txn):
+        key = txn[self.key]
+        quantity = txn["Quantity"]
+        amount = quantity * txn["UnitPrice"]
+
+        group = self.buffer.get(key)
+        if group is None:
+            group = self.buffer[key] = [self.rows, 0, 0, 0.0]
+            self.buffered_bytes += GROUP_BYTES
+
+        group[1] += 1
+        group[2] += quantity
+        group[3] += amount
+        self.rows += 1
+
+        if self.buffered_bytes >= self.memory_limit:
+            self.spill()
+
+    def consume(self, transactions):
+        """
+        Feeds an iterable of transactions. Returns self so calls can be chained.
+        """
+        for txn in transactions:
+            self.add(txn)
+        return self
+
+    def _new_run_path(self):
+        if self._tmp is None:
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._tmp = tempfile.mkdtemp(prefix="groupby_", dir=self.spill_dir)
+        return os.path.join(self._tmp, f"run_{len(self.runs):05d}.bin")
+
+    def _spill_records(self, records):
+        path = self._new_run_path()
+        _write_run(path, records)
+        self.runs.append(path)
+
+    def spill(self):
+        """
+        Writes the buffer as a run sorted by (key, first-seen row) and clears it.
+        """
+        if not self.buffer:
+            return
+
+        self._spill_records(
+            (key, first, count, quantity, revenue)
+            for key, (first, count, quantity, revenue) in sorted(self.buffer.items())
+        )
+        self.buffer = {}
+        self.buffered_bytes = 0
+
+    # ---------- MERGE ----------
+
+    def _reduce_runs(self):
+        """
+        Merges consecutive batches of runs into longer runs until at most
+        MAX_MERGE_RUNS remain, keeping open files bounded. Same-key records
+        are combined on the way, in run order.
+        """
+        while len(self.runs) > MAX_MERGE_RUNS:
+            merged = []
+            for start in range(0, len(self.runs), MAX_MERGE_RUNS):
+                batch = self.runs[start:start + MAX_MERGE_RUNS]
+                if len(batch) == 1:
+                    merged.append(batch[0])
+                    continue
+
+                path = os.path.join(self._tmp, f"merge_{os.path.basename(batch[0])}")
+                _write_run(path, _combine(heapq.merge(*map(_read_run, batch))))
+                for run in batch:
+                    os.remove(run)
+                merged.append(path)
+
+            self.runs = merged
+
+    def iter_groups(self):
+        """
+        Yields (key, first_seen, count, quantity, revenue) per group, in key
+        order once anything was spilled (first-seen order otherwise).
+        """
+        if not self.runs:
+            for key, (first, count, quantity, revenue) in self.buffer.items():
+                yield key, first, count, quantity, revenue
+            return
+
+        self.spill()
+        self._reduce_runs()
+
+        # Records sort by (key, first-seen row), so same-key partials
+        # arrive in run order
+        yield from _combine(heapq.merge(*map(_read_run, self.runs)))
+
+    def iter_first_seen(self):
+        """
+        Yields the same groups as iter_groups in first-seen order (the dict
+        insertion order of the in-memory functions). With spills, merged
+        groups are externally sorted again by first-seen row, in runs
+        bounded by the same memory budget.
+        """
+        if not self.runs:
+            yield from self.iter_groups()
+            return
+
+        per_run = max(1, self.memory_limit // GROUP_BYTES)
+        order_runs = []
+        chunk = []
+
+        for group in self.iter_groups():
+            chunk.append((group[1],) + group)
+            if len(chunk) >= per_run:
+                chunk.sort()
+                path = os.path.join(self._tmp, f"order_{len(order_runs):05d}.bin")
+                _write_run(path, chunk)
+                order_runs.append(path)
+                chunk = []
+
+        chunk.sort()
+        for record in heapq.merge(chunk, *map(_read_run, order_runs)):
+            yield record[1:]
+
+
+def iter_customer_analysis(transactions, memory_limit=DEFAULT_MEMORY_LIMIT, spill_dir=None):
+    """
+    Streams customer summaries (same dicts and order as customer_analysis,
+    TotalSpend within float rounding) using a spill-to-disk group-by.
+    """
+    with ExternalGroupBy("CustomerID", memory_limit, spill_dir) as groups:
+        groups.consume(transactions)
+
+        for customer, _, count, _, spend in groups.iter_first_seen():
+            yield {
+                "CustomerID": customer,
+                "TotalSpend": spend,
+                "Transactions": count,
+                "Segment": spend_segment(spend)
+            }
+def customer_analysis_external(transactions, memory_limit=DEFAULT_MEMORY_LIMIT, spill_dir=None):
+    """
+    Bounded-memory customer_analysis.
+    Returns a list of customer summaries
+    """
+    return list(iter_customer_analysis(transactions, memory_limit, spill_dir))
+def top_selling_products_external(transactions, top_n=5, memory_limit=DEFAULT_MEMORY_LIMIT, spill_dir=None):
+    """
+    Bounded-memory top_selling_products: merged groups stream through a
+    heap of size top_n; ties keep first-seen order, as in rank_top_products.
+    """
+    with ExternalGroupBy("ProductName", memory_limit, spill_dir) as groups:
+        groups.consume(transactions)
+
+        top = heapq.nsmallest(
+            top_n,
+            groups.iter_groups(),
+            key=lambda group: (-group[3], group[1])
+        )
+
+    return [
+        {"ProductName": product, "TotalQuantity": quantity, "Revenue": revenue}
+        for product, _, _, quantity, revenue in top
+    ]
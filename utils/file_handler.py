@@ -1,5 +1,29 @@
 # utils/file_handler.py
 
+import codecs
+import csv
+import gzip
+import hashlib
+import io
+import os
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst inputs
+    zstandard = None
+
+BLOCK_SIZE = 1024 * 1024  # bytes read and decoded per block
+SNIFF_BYTES = 64 * 1024    # prefix inspected when detecting the encoding
+
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be")
+]
+ASCII_COMPATIBLE = {"utf-8", "cp1252", "latin-1"}
+FALLBACK_ENCODINGS = {"utf-8": "cp1252", "cp1252": "latin-1"}
+CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
 def read_sales_file(file_path):
     """
     Reads the sales data file safely by handling encoding issues
@@ -22,38 +46,323 @@ def read_sales_file(file_path):
         print(f"ERROR while reading file: {e}")
 
     return lines
-def read_sales_data(filename):
+def read_sales_data(filename, decode_stats=None):
     """
     Reads sales data from file handling encoding issues.
+    The encoding is sniffed from the first block and the file is read
+    exactly once; lines that do not decode fall back per line
+    (see iter_decoded_lines).
     Returns list of raw transaction lines (without header).
     """
-    encodings = ["utf-8", "latin-1", "cp1252"]
+    return list(iter_decoded_lines(filename, decode_stats=decode_stats))
+def new_decode_stats():
+    """
+    Returns empty decoding counters, filled in by iter_decoded_lines:
+    the detected encoding, lines decoded with the fallback encoding and
+    bytes the detected encoding could not decode (those lines are decoded
+    whole with the fallback, so the count is not of U+FFFD replacements).
+    """
+    return {"encoding": None, "fallback_lines": 0, "undecodable_bytes": 0}
+def merge_decode_stats(decode_stats, other):
+    """
+    Merges counters from another partial read (a worker's byte range or a
+    dataset file) into decode_stats. Distinct encodings are listed
+    comma-separated.
+    Returns decode_stats
+    """
+    encodings = {
+        encoding
+        for stats in (decode_stats, other) if stats["encoding"]
+        for encoding in stats["encoding"].split(", ")
+    }
+    decode_stats["encoding"] = ", ".join(sorted(encodings)) or None
+    decode_stats["fallback_lines"] += other["fallback_lines"]
+    decode_stats["undecodable_bytes"] += other["undecodable_bytes"]
+    return decode_stats
+def sniff_encoding(prefix, truncated=True):
+    """
+    Guesses the encoding from a bounded prefix of the file.
+    A BOM wins; otherwise utf-8 if the prefix decodes (ignoring a
+    multi-byte sequence cut at the end when truncated, i.e. more of the
+    file follows), cp1252 if it contains cp1252 punctuation bytes
+    (0x80-0x9F), else latin-1.
+    Returns (encoding, bom_length)
+    """
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom)
 
-    for encoding in encodings:
-        try:
-            with open(filename, mode="r", encoding=encoding) as file:
-                lines = file.readlines()
+    try:
+        prefix.decode("utf-8")
+        return "utf-8", 0
+    except UnicodeDecodeError as e:
+        if truncated and e.reason == "unexpected end of data" and e.start >= len(prefix) - 3:
+            return "utf-8", 0
 
-            cleaned_lines = []
-            for line in lines[1:]:  # skip header
-                line = line.strip()
-                if line:
-                    cleaned_lines.append(line)
+    c1_bytes = {b for b in prefix if 0x80 <= b <= 0x9F}
+    if c1_bytes and not c1_bytes & CP1252_UNDEFINED:
+        return "cp1252", 0
 
-            return cleaned_lines
+    return "latin-1", 0
+def detect_encoding(filename):
+    """
+    Sniffs the encoding from the start of the file.
+    Returns (encoding, bom_length)
+    """
+    with open_binary(filename) as file:
+        prefix = file.read(SNIFF_BYTES + 1)
+    return sniff_encoding(prefix[:SNIFF_BYTES], len(prefix) > SNIFF_BYTES)
+def byte_ranges_supported(encoding):
+    """
+    Byte-range readers split lines on raw b"\n" bytes, which is only
+    safe for ASCII-compatible encodings (not utf-16).
+    """
+    return encoding in ASCII_COMPATIBLE
+def _count_undecodable(raw, encoding):
+    count = 0
+    position = 0
 
+    while True:
+        try:
+            raw[position:].decode(encoding)
+            return count
+        except UnicodeDecodeError as e:
+            count += e.end - e.start
+            position += e.end
+def _decode_per_line(chunk, encoding, decode_stats):
+    """
+    Decodes a block line by line after a whole-block decode failed:
+    good lines use the detected encoding, bad ones the fallback.
+    """
+    fallback = FALLBACK_ENCODINGS.get(encoding, "latin-1")
+    lines = []
+
+    for raw in chunk.split(b"\n"):
+        try:
+            lines.append(raw.decode(encoding))
         except UnicodeDecodeError:
-            continue
-        except FileNotFoundError:
-            print(f"ERROR: File not found -> {filename}")
-            return []
-        except Exception as e:
-            print(f"ERROR while reading file: {e}")
-            return []
-
-    print("ERROR: Unable to read file with supported encodings.")
-    return []
-import csv
+            lines.append(raw.decode(fallback, errors="replace"))
+            if decode_stats is not None:
+                decode_stats["fallback_lines"] += 1
+                decode_stats["undecodable_bytes"] += _count_undecodable(raw, encoding)
+
+    return "\n".join(lines)
+def open_binary(filename):
+    """
+    Opens a sales file for binary reading, decompressing .gz and .zst
+    transparently (.zst needs the optional zstandard package).
+    Raises FileNotFoundError / RuntimeError.
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode="rb")
+
+    if filename.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("the zstandard package is required to read .zst files")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(filename, mode="rb"), closefd=True)
+        return io.BufferedReader(reader)  # adds readline() for header skipping
+
+    return open(filename, mode="rb")
+def iter_decoded_lines(
+    filename,
+    start=None,
+    end=None,
+    encoding=None,
+    block_size=BLOCK_SIZE,
+    decode_stats=None
+):
+    """
+    Streams stripped, non-empty text lines from the byte range [start, end)
+    of the sales file (from after the header to EOF by default).
+    The file is read as bytes in large blocks and each block is decoded
+    once, instead of decoding line by line.
+    With encoding=None the encoding is sniffed from the first block (or a
+    bounded prefix when reading a byte range), so the file is read once.
+    A block that does not decode is decoded per line, and only the bad
+    lines use the fallback encoding; counts go into decode_stats.
+    Compressed files are decompressed on the fly; offsets then refer to
+    the decompressed stream.
+    """
+    try:
+        file = open_binary(filename)
+    except FileNotFoundError:
+        print(f"ERROR: File not found -> {filename}")
+        return
+    except RuntimeError as e:
+        print(f"ERROR: {e} -> {filename}")
+        return
+
+    with file:
+        requested = block_size if start is None else SNIFF_BYTES
+        block = file.read(requested)
+        bom_length = 0
+        if encoding is None:
+            truncated = len(block) > SNIFF_BYTES or len(block) == requested
+            encoding, bom_length = sniff_encoding(block[:SNIFF_BYTES], truncated)
+
+        if decode_stats is not None:
+            decode_stats["encoding"] = encoding
+
+        if start is None and encoding not in ASCII_COMPATIBLE:
+            yield from _iter_incremental(file, block[bom_length:], encoding, block_size, None, True)
+            return
+
+        if start is None:
+            block = block[bom_length:]
+            header_end = block.find(b"\n")
+            while header_end < 0:  # header longer than one block
+                more = file.read(block_size)
+                if not more:
+                    return
+                block += more
+                header_end = block.find(b"\n")
+            block = block[header_end + 1:]
+            remaining = None
+        else:
+            file.seek(start)
+            remaining = None if end is None else end - start
+            block = b""
+
+        if encoding not in ASCII_COMPATIBLE:
+            yield from _iter_incremental(file, block, encoding, block_size, remaining, False)
+            return
+
+        pending = b""
+
+        while True:
+            if not block:
+                size = block_size if remaining is None else min(block_size, remaining)
+                block = file.read(size) if size > 0 else b""
+                if remaining is not None:
+                    remaining -= len(block)
+                final = not block
+            else:
+                final = False
+
+            data = pending + block
+            block = b""
+
+            if final:
+                chunk, pending = data, b""
+            else:
+                cut = data.rfind(b"\n") + 1
+                chunk, pending = data[:cut], data[cut:]
+
+            if chunk:
+                try:
+                    text = chunk.decode(encoding)
+                except UnicodeDecodeError:
+                    text = _decode_per_line(chunk, encoding, decode_stats)
+
+                for line in text.split("\n"):
+                    line = line.strip()
+                    if line:
+                        yield line
+
+            if final:
+                break
+def _iter_incremental(file, block, encoding, block_size, remaining, skip_header):
+    """
+    Block decoding for encodings that are not ASCII-compatible (utf-16),
+    where lines cannot be split on raw newline bytes.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+
+    while True:
+        if not block:
+            size = block_size if remaining is None else min(block_size, remaining)
+            block = file.read(size) if size > 0 else b""
+            if remaining is not None:
+                remaining -= len(block)
+            final = not block
+        else:
+            final = False
+
+        lines = (pending + decoder.decode(block, final)).split("\n")
+        block = b""
+        pending = "" if final else lines.pop()
+
+        if skip_header and (lines or final):
+            lines = lines[1:]
+            skip_header = False
+
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+
+        if final:
+            break
+def iter_sales_lines(filename, encoding=None, decode_stats=None):
+    """
+    Streams raw transaction lines (without header) from the sales file.
+    Only one block of the file is held in memory at a time.
+    """
+    return iter_decoded_lines(filename, encoding=encoding, decode_stats=decode_stats)
+
+FINGERPRINT_BLOCK = 64 * 1024
+FINGERPRINT_SAMPLES = 32     # blocks hashed between the head and tail
+FINGERPRINT_SAMPLE_BLOCK = 4 * 1024
+FINGERPRINT_CONTENT = ("length", "inode", "head", "tail", "samples")
+
+def file_fingerprint(filename, length=None):
+    """
+    Content fingerprint of the first `length` bytes of a file (whole file
+    by default): the length and inode, hashes of its first and last 64 KB
+    and of FINGERPRINT_SAMPLES 4 KB blocks spaced evenly between them,
+    plus the size and mtime of the whole file when it was taken. Used to
+    detect truncation or rewrites between runs.
+    Returns dict
+    """
+    stat = os.stat(filename)
+    if length is None:
+        length = stat.st_size
+
+    samples = hashlib.sha256()
+    with open(filename, "rb") as f:
+        head = f.read(min(length, FINGERPRINT_BLOCK))
+
+        tail_start = max(0, length - FINGERPRINT_BLOCK)
+        f.seek(tail_start)
+        tail = f.read(length - tail_start)
+
+        for i in range(1, FINGERPRINT_SAMPLES + 1):
+            position = length * i // (FINGERPRINT_SAMPLES + 1)
+            f.seek(position)
+            samples.update(f.read(min(FINGERPRINT_SAMPLE_BLOCK, length - position)))
+
+    return {
+        "length": length,
+        "inode": stat.st_ino,
+        "head": hashlib.sha256(head).hexdigest(),
+        "tail": hashlib.sha256(tail).hexdigest(),
+        "samples": samples.hexdigest(),
+        "file_size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+def fingerprint_matches(filename, fingerprint):
+    """
+    Checks whether the file still starts with the fingerprinted bytes,
+    i.e. it has only been appended to since the fingerprint was taken.
+    A file that was replaced (new inode), truncated, or modified without
+    growing (same size, new mtime) never matches; nor does a change to
+    any of the hashed blocks.
+    Not caught: an in-place edit that keeps the length, misses every
+    hashed block and lands together with an append (or restores the
+    mtime). At most 256 KB of the prefix is hashed.
+    """
+    try:
+        stat = os.stat(filename)
+        if stat.st_size < fingerprint["length"]:
+            return False  # truncated
+        if stat.st_size == fingerprint.get("file_size") and stat.st_mtime_ns != fingerprint.get("mtime_ns"):
+            return False  # rewritten in place
+        current = file_fingerprint(filename, fingerprint["length"])
+    except OSError:
+        return False
+
+    return all(current[key] == fingerprint.get(key) for key in FINGERPRINT_CONTENT)
 
 def save_enriched_data(enriched_transactions, filename):
     """
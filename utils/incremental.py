@@ -0,0 +1,174 @@
+# utils/incremental.py
+
+import copy
+import json
+import os
+
+from utils.aggregator import Aggregator
+from utils.data_processor import (
+    new_filter_stats,
+    merge_filter_stats,
+    print_filter_info,
+    filter_summary
+)
+from utils.file_handler import (
+    file_fingerprint,
+    fingerprint_matches,
+    detect_encoding,
+    byte_ranges_supported,
+    new_decode_stats,
+    merge_decode_stats
+)
+from utils.parallel import process_byte_range
+
+CHECKPOINT_FILE = "output/cache/checkpoint.json"
+SCAN_BLOCK = 64 * 1024
+
+
+def load_checkpoint(checkpoint_path=CHECKPOINT_FILE):
+    """
+    Loads the saved checkpoint.
+    Returns dict or None if missing/corrupt.
+    """
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+def save_checkpoint(checkpoint, checkpoint_path=CHECKPOINT_FILE):
+    """
+    Writes the checkpoint atomically (temp file + rename).
+    """
+    directory = os.path.dirname(checkpoint_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{checkpoint_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+
+    os.replace(tmp_path, checkpoint_path)
+def data_start_offset(filename):
+    """
+    Returns the byte offset of the first line after the header.
+    """
+    with open(filename, "rb") as f:
+        f.readline()
+        return f.tell()
+def last_line_end(filename, start, end):
+    """
+    Returns the offset just past the last newline in [start, end),
+    or start if the range holds no complete line.
+    """
+    with open(filename, "rb") as f:
+        position = end
+        while position > start:
+            block_start = max(start, position - SCAN_BLOCK)
+            f.seek(block_start)
+            block = f.read(position - block_start)
+
+            index = block.rfind(b"\n")
+            if index != -1:
+                return block_start + index + 1
+
+            position = block_start
+
+    return start
+def _stats_state(stats):
+    state = dict(stats)
+    state["regions_available"] = sorted(stats["regions_available"])
+    return state
+def _stats_from_state(state):
+    stats = dict(state)
+    stats["regions_available"] = set(state["regions_available"])
+    return stats
+def incremental_aggregate(
+    filename,
+    region=None,
+    min_amount=None,
+    max_amount=None,
+    checkpoint_path=CHECKPOINT_FILE
+):
+    """
+    Aggregates only the bytes appended since the last checkpoint and merges
+    them into the saved accumulators. The checkpoint is discarded (full
+    rebuild) when the file was truncated, replaced or rewritten (see
+    fingerprint_matches for the rewrites it cannot see), or when the
+    filters differ from the ones it was built with.
+
+    Only complete lines are committed to the checkpoint; a trailing line
+    without a newline is included in this run's result but re-read next
+    time, so output always matches a full recompute.
+    Files in an encoding that is not ASCII-compatible (utf-16) cannot be
+    resumed at a byte offset; they are recomputed in full and no
+    checkpoint is written.
+    Decoding counters (encoding, undecodable_bytes) are checkpointed with
+    the filter counters, so the summary covers the whole file.
+    Returns (Aggregator, summary)
+    """
+    filters = {"region": region, "min_amount": min_amount, "max_amount": max_amount}
+    file_size = os.path.getsize(filename)
+
+    encoding, _ = detect_encoding(filename)
+    if not byte_ranges_supported(encoding):
+        print(f"Encoding {encoding} cannot be resumed at a byte offset; recomputing in full.")
+        stats, decode_stats, aggregator = process_byte_range(filename, None, None, region, min_amount, max_amount)
+        print_filter_info(stats)
+        return aggregator, filter_summary(stats, decode_stats)
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint and (
+        checkpoint.get("source") != os.path.abspath(filename)
+        or checkpoint.get("filters") != filters
+        or "decode" not in checkpoint
+        or not fingerprint_matches(filename, checkpoint["fingerprint"])
+    ):
+        print("Checkpoint does not match the data file; rebuilding from scratch.")
+        checkpoint = None
+
+    if checkpoint:
+        offset = checkpoint["fingerprint"]["length"]
+        stats = _stats_from_state(checkpoint["stats"])
+        decode_stats = checkpoint["decode"]
+        aggregator = Aggregator.from_state(checkpoint["aggregator"])
+    else:
+        offset = data_start_offset(filename)
+        stats = new_filter_stats()
+        decode_stats = new_decode_stats()
+        decode_stats["encoding"] = encoding
+        aggregator = Aggregator()
+
+    print(f"Processing bytes {offset}-{file_size} of {filename}")
+
+    # ---------- COMMIT COMPLETE LINES ----------
+    committed_end = last_line_end(filename, offset, file_size)
+    if committed_end > offset:
+        tail_stats, tail_decode_stats, tail_aggregator = process_byte_range(
+            filename, offset, committed_end, region, min_amount, max_amount, encoding
+        )
+        merge_filter_stats(stats, tail_stats)
+        merge_decode_stats(decode_stats, tail_decode_stats)
+        aggregator.merge(tail_aggregator)
+
+    save_checkpoint({
+        "source": os.path.abspath(filename),
+        "filters": filters,
+        "fingerprint": file_fingerprint(filename, committed_end),
+        "stats": _stats_state(stats),
+        "decode": decode_stats,
+        "aggregator": aggregator.state()
+    }, checkpoint_path)
+
+    # ---------- UNTERMINATED LAST LINE (not committed) ----------
+    if committed_end < file_size:
+        partial_stats, partial_decode_stats, partial_aggregator = process_byte_range(
+            filename, committed_end, file_size, region, min_amount, max_amount, encoding
+        )
+        stats = merge_filter_stats(_stats_from_state(_stats_state(stats)), partial_stats)
+        decode_stats = merge_decode_stats(dict(decode_stats), partial_decode_stats)
+        aggregator = copy.deepcopy(aggregator).merge(partial_aggregator)
+
+    # ---------- DISPLAY INFO ----------
+    print_filter_info(stats)
+
+    return aggregator, filter_summary(stats, decode_stats)
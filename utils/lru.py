@@ -0,0 +1,64 @@
+# utils/lru.py
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count and,
+    optionally, by the total size reported by a sizeof function.
+    Hit/miss/eviction counters are kept in self.stats.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, sizeof=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value, size = self.entries[key]
+            except KeyError:
+                self.stats["misses"] += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+            # Values larger than the whole budget are not cached at all
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+
+            while len(self.entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.stats["evictions"] += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def info(self):
+        """
+        Returns counters plus current occupancy.
+        """
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries), bytes=self.total_bytes)
@@ -0,0 +1,136 @@
+# utils/parallel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.aggregator import Aggregator
+from utils.file_handler import (
+    iter_decoded_lines,
+    detect_encoding,
+    byte_ranges_supported,
+    new_decode_stats,
+    merge_decode_stats
+)
+from utils.data_processor import (
+    iter_transactions,
+    iter_valid_transactions,
+    new_filter_stats,
+    merge_filter_stats,
+    print_filter_info,
+    filter_summary
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024  # 64 MB per byte range
+
+
+def split_byte_ranges(filename, chunk_count):
+    """
+    Splits the sales file (after the header) into newline-aligned byte ranges.
+    Each line belongs to the range in which it starts.
+    Returns a list of (start, end) offsets.
+    """
+    file_size = os.path.getsize(filename)
+
+    with open(filename, "rb") as file:
+        file.readline()  # skip header
+        data_start = file.tell()
+
+        if data_start >= file_size:
+            return []
+
+        chunk_count = max(1, chunk_count)
+        step = max(1, (file_size - data_start) // chunk_count)
+
+        boundaries = [data_start]
+        for i in range(1, chunk_count):
+            nominal = data_start + i * step
+            if nominal <= boundaries[-1]:
+                continue
+
+            # Land on the first line that starts at or after the nominal offset
+            file.seek(nominal - 1)
+            file.readline()
+            position = file.tell()
+
+            if position >= file_size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+
+        boundaries.append(file_size)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+def process_byte_range(filename, start, end, region=None, min_amount=None, max_amount=None, encoding=None):
+    """
+    Worker: parses, validates, filters and aggregates one byte range
+    (the whole file after the header when start is None). An encoding
+    detected by the caller skips sniffing in every worker.
+    Returns (filter stats, decode stats, partial Aggregator).
+    """
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    transactions = iter_transactions(
+        iter_decoded_lines(filename, start, end, encoding, decode_stats=decode_stats)
+    )
+
+    aggregator = Aggregator().consume(
+        iter_valid_transactions(transactions, stats, region, min_amount, max_amount)
+    )
+
+    return stats, decode_stats, aggregator
+def parallel_aggregate(
+    filename,
+    workers,
+    region=None,
+    min_amount=None,
+    max_amount=None,
+    chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Parses and aggregates the sales file across a pool of worker processes.
+    Partial results are merged in file order, so group ordering and all
+    summary counters match the serial path. Float revenue totals are summed
+    per chunk first: exact for whole-number amounts, otherwise equal to the
+    serial sums up to float rounding (relative error around 1e-15 per
+    merged chunk, tested at 1e-12).
+    Files in an encoding that is not ASCII-compatible (utf-16) cannot be
+    split on newline bytes and are aggregated serially in this process.
+    Returns (Aggregator, summary) where summary also carries the detected
+    encoding and the workers' undecodable_bytes.
+    """
+    encoding, _ = detect_encoding(filename)
+    if not byte_ranges_supported(encoding):
+        print(f"Encoding {encoding} cannot be split into byte ranges; aggregating serially.")
+        stats, decode_stats, aggregator = process_byte_range(filename, None, None, region, min_amount, max_amount)
+        print_filter_info(stats)
+        return aggregator, filter_summary(stats, decode_stats)
+
+    file_size = os.path.getsize(filename)
+    chunk_count = max(workers, -(-file_size // chunk_size))
+    ranges = split_byte_ranges(filename, chunk_count)
+
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    decode_stats["encoding"] = encoding
+    aggregator = Aggregator()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                process_byte_range, filename, start, end,
+                region, min_amount, max_amount, encoding
+            )
+            for start, end in ranges
+        ]
+
+        # Merge in submission (file) order to keep first-seen ordering
+        for future in futures:
+            partial_stats, partial_decode_stats, partial_aggregator = future.result()
+            merge_filter_stats(stats, partial_stats)
+            merge_decode_stats(decode_stats, partial_decode_stats)
+            aggregator.merge(partial_aggregator)
+
+    # ---------- DISPLAY INFO ----------
+    print_filter_info(stats)
+
+    return aggregator, filter_summary(stats, decode_stats)
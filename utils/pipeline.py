@@ -0,0 +1,199 @@
+# utils/pipeline.py
+#
+# Overlapped single-process pipeline:
+#
+#     catalog fetch (thread) ----------------------------+
+#                                                        v
+#     read -> parse -> validate/filter (thread) --[queue]--> enrich (thread) --[queue]--> aggregate
+#
+# The catalog fetch starts before the data file is opened, so its network
+# latency overlaps with reading, parsing and validation instead of adding
+# to them. Rows travel in batches through bounded queues; a stage blocks
+# when the next one falls behind, so at most QUEUE_SIZE batches wait in
+# each queue. Batches are consumed in file order, so results are
+# identical to the sequential pipeline.
+# Each stage runs in its own thread and is profiled there ("validate",
+# "enrich", "aggregate"), so its CPU time and --cprofile-stage capture only
+# that stage's work. Their wall times overlap and their memory peaks are
+# not separable, so they are recorded as concurrent stages.
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.aggregator import Aggregator
+from utils.api_handler import create_product_mapping, ProductIndex, EnrichedTransaction
+from utils.catalog_cache import get_products
+from utils.data_processor import (
+    iter_sales_records,
+    iter_valid_transactions,
+    new_filter_stats,
+    print_filter_info,
+    filter_summary
+)
+from utils.file_handler import new_decode_stats
+from utils.profiler import stage
+
+BATCH_SIZE = 10_000
+QUEUE_SIZE = 32  # batches parsed ahead while the catalog is still in flight
+PUT_TIMEOUT = 0.1  # seconds between checks for a cancelled run
+
+_DONE = object()
+
+
+def _put(batches, item, stop):
+    """
+    Blocks until the item is queued or the run is cancelled.
+    Returns True if queued
+    """
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+def _get(batches, stop):
+    """
+    Blocks until an item arrives or the run is cancelled.
+    Returns the item, or _DONE if cancelled
+    """
+    while not stop.is_set():
+        try:
+            return batches.get(timeout=PUT_TIMEOUT)
+        except queue.Empty:
+            continue
+    return _DONE
+def _produce(filename, filters, stats, decode_stats, batches, stop, batch_size):
+    """
+    Producer thread ("validate" stage): streams, parses, validates and
+    filters the file, queueing valid transactions in batches. Errors are
+    queued for the consumer to re-raise.
+    """
+    try:
+        with stage("validate", concurrent=True) as record:
+            transactions = iter_valid_transactions(
+                iter_sales_records(filename, decode_stats), stats, *filters
+            )
+
+            batch = []
+            for txn in transactions:
+                batch.append(txn)
+                if len(batch) >= batch_size:
+                    if not _put(batches, batch, stop):
+                        return
+                    batch = []
+
+            record["rows_in"] = stats["total_input"]
+            record["rows_out"] = stats["final_count"]
+
+        if batch and not _put(batches, batch, stop):
+            return
+        _put(batches, _DONE, stop)
+
+    except Exception as e:
+        _put(batches, e, stop)
+def _enrich(index, batches, enriched, stop):
+    """
+    Enricher thread ("enrich" stage): wraps every transaction of each
+    validated batch with its catalog entry and passes the batch on in
+    order. The producer's end marker or error is forwarded.
+    """
+    try:
+        with stage("enrich", concurrent=True) as record:
+            rows = 0
+            while True:
+                item = _get(batches, stop)
+                if item is _DONE or isinstance(item, Exception):
+                    break
+
+                batch = [EnrichedTransaction(txn, index.lookup(txn.get("ProductID"))) for txn in item]
+                rows += len(batch)
+                if not _put(enriched, batch, stop):
+                    return
+
+            record["rows_in"] = rows
+            record["rows_out"] = rows
+
+        _put(enriched, item, stop)
+
+    except Exception as e:
+        _put(enriched, e, stop)
+def overlapped_aggregate(
+    filename,
+    region=None,
+    min_amount=None,
+    max_amount=None,
+    accumulators=None,
+    fetch=get_products,
+    batch_size=BATCH_SIZE,
+    queue_size=QUEUE_SIZE
+):
+    """
+    Runs the catalog fetch, the parse/validate producer, the enricher and
+    the aggregating consumer concurrently.
+    The profile records "fetch" as the time spent waiting for the catalog
+    after the producer started, then "validate", "enrich" and "aggregate"
+    from their own threads.
+    Returns (Aggregator, summary) where summary also carries the detected
+    encoding, undecodable_bytes and catalog_products.
+    """
+    stats = new_filter_stats()
+    decode_stats = new_decode_stats()
+    batches = queue.Queue(maxsize=queue_size)
+    enriched = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    enricher = None
+
+    with ThreadPoolExecutor(max_workers=1) as fetcher:
+        catalog = fetcher.submit(fetch)
+
+        producer = threading.Thread(
+            target=_produce,
+            args=(filename, (region, min_amount, max_amount), stats, decode_stats, batches, stop, batch_size),
+            daemon=True
+        )
+        producer.start()
+
+        try:
+            with stage("fetch", concurrent=True) as record:
+                products = catalog.result()
+                record["rows_out"] = len(products)
+
+            enricher = threading.Thread(
+                target=_enrich,
+                args=(ProductIndex(create_product_mapping(products)), batches, enriched, stop),
+                daemon=True
+            )
+            enricher.start()
+            aggregator = Aggregator(accumulators)
+
+            with stage("aggregate", concurrent=True) as record:
+                batch_count = 0
+                while True:
+                    item = _get(enriched, stop)
+                    if item is _DONE:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    aggregator.consume(item)
+                    batch_count += 1
+
+                record["rows_in"] = aggregator.count
+                record["rows_out"] = aggregator.count
+                record["batches"] = batch_count
+
+        finally:
+            stop.set()
+            producer.join()
+            if enricher is not None:
+                enricher.join()
+
+    # ---------- DISPLAY INFO ----------
+    print_filter_info(stats)
+
+    summary = filter_summary(stats, decode_stats)
+    summary["catalog_products"] = len(products)
+
+    return aggregator, summary
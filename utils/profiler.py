@@ -0,0 +1,156 @@
+# utils/profiler.py
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_DIR = "output/profile"
+
+
+class RunProfile:
+    """
+    Collects per-stage wall time, CPU time, rows in/out and throughput for
+    one pipeline run, plus peak traced memory with trace_memory=True.
+    tracemalloc slows Python code several times over, so timings from a
+    memory-traced run are not comparable with untraced ones. A disabled
+    profile keeps the same interface but records nothing, so stages can
+    stay instrumented.
+    CPU time is the CPU of the thread that entered the stage, so stages
+    running side by side in threads are measured separately. Their memory
+    is not: a concurrent stage records peak_memory_bytes as None with
+    memory_shared set, and does not reset the traced peak. cProfile only
+    sees the thread that entered the stage.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False, cprofile_stage=None, output_dir=PROFILE_DIR):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.cprofile_stage = cprofile_stage
+        self.output_dir = output_dir
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started = time.perf_counter()
+        self.stages = []
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None, concurrent=False):
+        """
+        Times the enclosed block. The yielded dict may be updated with
+        rows_in / rows_out (or any extra counters) before the block ends.
+        concurrent marks a stage that overlaps other stages in time.
+        """
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None}
+
+        if not self.enabled:
+            yield record
+            return
+
+        profiler = None
+        if name == self.cprofile_stage:
+            profiler = cProfile.Profile()
+
+        trace_memory = self.trace_memory and not concurrent
+        if trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+
+            wall = time.perf_counter() - wall_start
+            record["wall_seconds"] = round(wall, 6)
+            record["cpu_seconds"] = round(time.thread_time() - cpu_start, 6)
+
+            rows = record["rows_in"] if record["rows_in"] is not None else record["rows_out"]
+            record["rows_per_second"] = round(rows / wall, 1) if rows and wall > 0 else None
+
+            if trace_memory:
+                record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - memory_before
+            elif self.trace_memory:
+                record["peak_memory_bytes"] = None
+                record["memory_shared"] = True
+
+            if profiler:
+                record["cprofile"] = self._dump_cprofile(profiler, name)
+
+            self.stages.append(record)
+
+    def _dump_cprofile(self, profiler, name):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.prof")
+        profiler.dump_stats(path)
+        return path
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at,
+            "total_wall_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": self.stages
+        }
+
+    def save(self, path=None):
+        """
+        Writes the run profile as JSON.
+        Returns the path written
+        """
+        if path is None:
+            path = os.path.join(self.output_dir, "run_profile.json")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+        return path
+
+    def print_summary(self):
+        """
+        Prints one line per stage, slowest stages easy to spot.
+        """
+        for record in self.stages:
+            line = (
+                f"{record['stage']:<12} wall {record['wall_seconds']:.3f}s"
+                f" | cpu {record['cpu_seconds']:.3f}s"
+            )
+            if record["rows_per_second"] is not None:
+                line += f" | {record['rows_per_second']:.0f} rows/s"
+            if record.get("peak_memory_bytes") is not None:
+                line += f" | peak {record['peak_memory_bytes'] / 1024:.0f} KB"
+            print(line)
+
+    def close(self):
+        if self.trace_memory:
+            tracemalloc.stop()
+
+
+_active = RunProfile(enabled=False)
+
+
+def start_profile(**kwargs):
+    """
+    Replaces the active profile (used by stage) with a new one.
+    Returns RunProfile
+    """
+    global _active
+    _active = RunProfile(**kwargs)
+    return _active
+def get_profile():
+    return _active
+def stage(name, rows_in=None, concurrent=False):
+    """
+    Context manager timing a stage on the active profile.
+    """
+    return _active.stage(name, rows_in, concurrent)
@@ -0,0 +1,330 @@
+# utils/query.py
+#
+# Lazy query plans over the raw sales file:
+#
+#     scan("data/sales_data.txt").filter(region="East", min_amount=1000) \
+#         .group_by("CustomerID").sum("amount")
+#
+# Nothing is read until a terminal operation (collect, count, sum, or a
+# grouped aggregate) runs. The plan is then executed in one streaming pass
+# with predicates pushed into the tokenizer:
+# - the Region predicate is checked on the raw last field before the line
+#   is split, so other regions are rejected without any parsing
+# - ID/Region validation runs on the split strings before numeric conversion
+# - only the columns the query touches are cleaned and materialized
+# Result rows are exactly those validate_and_filter would keep.
+
+from utils.file_handler import iter_sales_lines
+from utils.tokenizer import FIELD_NAMES, FIELD_COUNT, parse_price
+
+AMOUNT = "amount"
+COLUMNS = FIELD_NAMES + (AMOUNT,)
+FIELD_INDEX = {name: i for i, name in enumerate(FIELD_NAMES)}
+
+
+def scan(filename, encoding=None):
+    """
+    Starts a lazy query over a pipe-delimited sales file.
+    Returns Query
+    """
+    return Query(filename, encoding)
+def _check_columns(columns):
+    for column in columns:
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column '{column}' (expected one of {', '.join(COLUMNS)})")
+
+
+class Query:
+    """
+    Immutable query plan: each builder method returns a new Query.
+    After execution, self.stats holds the scan counters:
+    scanned, pushed_down (rejected by the raw Region check),
+    malformed (wrong field count or non-numeric Quantity/UnitPrice),
+    invalid (failed validation), filtered_by_amount, matched.
+    Rows are classified by the first check they fail, so invalid and
+    malformed counts differ from validate_and_filter's, but the matching
+    rows are the same.
+    """
+
+    def __init__(self, filename, encoding=None, region=None, min_amount=None, max_amount=None, columns=None):
+        self.filename = filename
+        self.encoding = encoding
+        self.region = region
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.columns = columns
+        self.stats = None
+
+    def _replace(self, **changes):
+        params = {
+            "region": self.region,
+            "min_amount": self.min_amount,
+            "max_amount": self.max_amount,
+            "columns": self.columns
+        }
+        params.update(changes)
+        return Query(self.filename, self.encoding, **params)
+
+    def filter(self, region=None, min_amount=None, max_amount=None):
+        """
+        Adds predicates; repeated calls narrow the amount range.
+        """
+        changes = {}
+
+        if region:
+            if self.region is not None and self.region != region:
+                raise ValueError(f"Conflicting region filters: {self.region!r} and {region!r}")
+            changes["region"] = region
+
+        if min_amount is not None:
+            changes["min_amount"] = min_amount if self.min_amount is None else max(self.min_amount, min_amount)
+
+        if max_amount is not None:
+            changes["max_amount"] = max_amount if self.max_amount is None else min(self.max_amount, max_amount)
+
+        return self._replace(**changes)
+
+    def select(self, *columns):
+        """
+        Projects the result rows onto the given columns.
+        """
+        _check_columns(columns)
+        return self._replace(columns=tuple(columns))
+
+    def group_by(self, *keys):
+        """
+        Returns GroupedQuery keyed by the given columns.
+        """
+        if not keys:
+            raise ValueError("group_by needs at least one column")
+        _check_columns(keys)
+        return GroupedQuery(self, keys)
+
+    def explain(self, needed=None):
+        """
+        Returns a readable description of the execution plan.
+        """
+        needed = needed or self.columns or COLUMNS
+        steps = [f"Scan {self.filename}"]
+
+        if self.region:
+            steps.append(f"  pushdown: raw last field == {self.region!r} (before split)")
+
+        steps.append("  validate: field count, ID prefixes, Region before numeric conversion")
+        steps.append("  validate: Quantity > 0, UnitPrice > 0")
+
+        if self.min_amount is not None:
+            steps.append(f"  filter: amount >= {self.min_amount}")
+        if self.max_amount is not None:
+            steps.append(f"  filter: amount <= {self.max_amount}")
+
+        steps.append(f"  project: {', '.join(needed)}")
+        return "\n".join(steps)
+
+    def iter_rows(self, columns):
+        """
+        Executes the plan, yielding one tuple per matching row with the
+        values of `columns` in order.
+        """
+        _check_columns(columns)
+        stats = self.stats = {
+            "scanned": 0,
+            "pushed_down": 0,
+            "malformed": 0,
+            "invalid": 0,
+            "filtered_by_amount": 0,
+            "matched": 0
+        }
+
+        region = self.region
+        min_amount = self.min_amount
+        max_amount = self.max_amount
+        clean_name = "ProductName" in columns
+
+        # Field positions to copy straight from the split line
+        extract = [
+            (position, FIELD_INDEX[name])
+            for position, name in enumerate(columns)
+            if name in FIELD_INDEX and name not in ("ProductName", "Quantity", "UnitPrice")
+        ]
+        name_position = columns.index("ProductName") if clean_name else None
+        quantity_position = columns.index("Quantity") if "Quantity" in columns else None
+        price_position = columns.index("UnitPrice") if "UnitPrice" in columns else None
+        amount_position = columns.index(AMOUNT) if AMOUNT in columns else None
+        width = len(columns)
+
+        for line in iter_sales_lines(self.filename, self.encoding):
+            stats["scanned"] += 1
+
+            # ---------- PUSHDOWN ----------
+            if region and line[line.rfind("|") + 1:] != region:
+                stats["pushed_down"] += 1
+                continue
+
+            fields = line.split("|")
+            if len(fields) != FIELD_COUNT:
+                stats["malformed"] += 1
+                continue
+
+            # ---------- VALIDATION (strings first) ----------
+            if not (
+                fields[0].startswith("T")
+                and fields[2].startswith("P")
+                and fields[6].startswith("C")
+                and fields[7]
+            ):
+                stats["invalid"] += 1
+                continue
+
+            try:
+                quantity = int(fields[4])
+                unit_price = parse_price(fields[5])
+            except ValueError:
+                stats["malformed"] += 1
+                continue
+
+            if quantity <= 0 or unit_price <= 0:
+                stats["invalid"] += 1
+                continue
+
+            # ---------- FILTERING ----------
+            amount = quantity * unit_price
+            if (min_amount is not None and amount < min_amount) or (
+                max_amount is not None and amount > max_amount
+            ):
+                stats["filtered_by_amount"] += 1
+                continue
+
+            stats["matched"] += 1
+
+            # ---------- PROJECTION ----------
+            row = [None] * width
+            for position, index in extract:
+                row[position] = fields[index]
+            if clean_name:
+                name = fields[3]
+                row[name_position] = (name.replace(",", "") if "," in name else name).strip()
+            if quantity_position is not None:
+                row[quantity_position] = quantity
+            if price_position is not None:
+                row[price_position] = unit_price
+            if amount_position is not None:
+                row[amount_position] = amount
+
+            yield tuple(row)
+
+    def collect(self):
+        """
+        Returns the matching rows as dictionaries of the selected columns.
+        """
+        columns = self.columns or COLUMNS
+        return [dict(zip(columns, row)) for row in self.iter_rows(columns)]
+
+    def count(self):
+        return sum(1 for _ in self.iter_rows(()))
+
+    def sum(self, column=AMOUNT):
+        """
+        Returns the total of a numeric column over matching rows.
+        """
+        total = 0.0 if column in (AMOUNT, "UnitPrice") else 0
+        for (value,) in self.iter_rows((column,)):
+            total += value
+        return total
+
+
+class GroupedQuery:
+    """
+    A Query grouped by key columns. Groups come back in first-seen order;
+    multi-column keys are tuples.
+    """
+
+    def __init__(self, query, keys):
+        self.query = query
+        self.keys = tuple(keys)
+
+    @property
+    def stats(self):
+        return self.query.stats
+
+    def explain(self, *values):
+        return (
+            self.query.explain(self.keys + values)
+            + f"\n  aggregate: group by {', '.join(self.keys)}"
+        )
+
+    def _groups(self, value_columns):
+        key_count = len(self.keys)
+
+        for row in self.query.iter_rows(self.keys + tuple(value_columns)):
+            key = row[0] if key_count == 1 else row[:key_count]
+            yield key, row[key_count:]
+
+    def sum(self, column=AMOUNT):
+        """
+        Returns dict key -> total of column.
+        """
+        _check_columns((column,))
+        totals = {}
+        zero = 0.0 if column in (AMOUNT, "UnitPrice") else 0
+
+        for key, (value,) in self._groups((column,)):
+            totals[key] = totals.get(key, zero) + value
+
+        return totals
+
+    def count(self):
+        """
+        Returns dict key -> number of matching rows.
+        """
+        counts = {}
+        for key, _ in self._groups(()):
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def agg(self, **outputs):
+        """
+        Several aggregates in one pass, e.g.
+        agg(revenue=("sum", "amount"), orders=("count", None)).
+        Returns dict key -> {output name: value}
+        """
+        value_columns = []
+        plan = []
+
+        for output, (func, column) in outputs.items():
+            if func not in ("sum", "count", "min", "max"):
+                raise ValueError(f"Unsupported aggregate '{func}'")
+            if func == "count":
+                plan.append((output, func, None))
+                continue
+            _check_columns((column,))
+            if column not in value_columns:
+                value_columns.append(column)
+            plan.append((output, func, value_columns.index(column)))
+
+        results = {}
+
+        for key, values in self._groups(value_columns):
+            group = results.get(key)
+            if group is None:
+                group = results[key] = {
+                    output: 0 if func == "count" else None for output, func, _ in plan
+                }
+
+            for output, func, position in plan:
+                if func == "count":
+                    group[output] += 1
+                    continue
+
+                value = values[position]
+                current = group[output]
+                if current is None:
+                    group[output] = value
+                elif func == "sum":
+                    group[output] = current + value
+                elif func == "min":
+                    group[output] = min(current, value)
+                else:
+                    group[output] = max(current, value)
+
+        return results
@@ -0,0 +1,117 @@
+# utils/query_index.py
+
+from bisect import bisect_left, bisect_right
+
+from utils.data_processor import iter_valid_transactions, new_filter_stats
+
+
+class SortedAmounts:
+    """
+    Row positions ordered by transaction amount, so a min/max amount
+    range can be located with two binary searches.
+    """
+
+    def __init__(self, positions, amounts):
+        ordered = sorted(positions, key=amounts.__getitem__)
+        self.positions = ordered
+        self.amounts = [amounts[p] for p in ordered]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def range(self, min_amount=None, max_amount=None):
+        """
+        Returns positions with min_amount <= amount <= max_amount.
+        """
+        lo = 0 if min_amount is None else bisect_left(self.amounts, min_amount)
+        hi = len(self.amounts) if max_amount is None else bisect_right(self.amounts, max_amount)
+        return self.positions[lo:hi] if hi > lo else []
+
+
+class TransactionIndex:
+    """
+    Validates a dataset once and builds secondary indexes over the valid
+    transactions: hash indexes by Region, CustomerID and ProductID, plus
+    amount-sorted positions (overall and per region) for range filters.
+    query() answers validate_and_filter-style questions without a full scan.
+    """
+
+    def __init__(self, transactions):
+        self.stats = new_filter_stats()
+        self.transactions = list(iter_valid_transactions(transactions, self.stats))
+        self.amounts = [t["Quantity"] * t["UnitPrice"] for t in self.transactions]
+
+        self.by_region = {}
+        self.by_customer = {}
+        self.by_product = {}
+
+        for position, txn in enumerate(self.transactions):
+            self.by_region.setdefault(txn["Region"], []).append(position)
+            self.by_customer.setdefault(txn["CustomerID"], []).append(position)
+            self.by_product.setdefault(txn["ProductID"], []).append(position)
+
+        all_positions = range(len(self.transactions))
+        self.amount_index = SortedAmounts(all_positions, self.amounts)
+        self.region_amount_index = {
+            region: SortedAmounts(positions, self.amounts)
+            for region, positions in self.by_region.items()
+        }
+
+    def print_info(self):
+        """
+        Displays the regions and amount range of the indexed data.
+        """
+        print("Available Regions:", sorted(self.stats["regions_available"]))
+        if self.amounts:
+            print(
+                f"Transaction Amount Range: "
+                f"{self.stats['min_amount_seen']} - {self.stats['max_amount_seen']}"
+            )
+
+    def query(self, region=None, min_amount=None, max_amount=None):
+        """
+        Filters the indexed transactions by region and amount range.
+        Rows come back in original order and the summary counters match
+        validate_and_filter exactly.
+        Returns (filtered_transactions, invalid_count, summary)
+        """
+        valid_count = len(self.transactions)
+
+        if region:
+            amount_index = self.region_amount_index.get(region)
+            region_count = len(amount_index) if amount_index else 0
+        else:
+            amount_index = self.amount_index
+            region_count = valid_count
+
+        if min_amount is None and max_amount is None:
+            # No amount filter: the hash index is already in original order
+            positions = self.by_region.get(region, []) if region else range(valid_count)
+        elif amount_index:
+            positions = sorted(amount_index.range(min_amount, max_amount))
+        else:
+            positions = []
+
+        filtered = [self.transactions[p] for p in positions]
+
+        summary = {
+            "total_input": self.stats["total_input"],
+            "invalid": self.stats["invalid"],
+            "filtered_by_region": valid_count - region_count,
+            "filtered_by_amount": region_count - len(filtered),
+            "final_count": len(filtered)
+        }
+
+        return filtered, self.stats["invalid"], summary
+
+    def for_customer(self, customer_id):
+        """
+        Returns the valid transactions of one customer.
+        """
+        return [self.transactions[p] for p in self.by_customer.get(customer_id, [])]
+
+    def for_product(self, product_id):
+        """
+        Returns the valid transactions of one product.
+        """
+        return [self.transactions[p] for p in self.by_product.get(product_id, [])]
@@ -1,104 +1,246 @@
+import csv
+import heapq
+import io
+import json
+import os
 from datetime import datetime
-
-def generate_sales_report(
-    transactions,
-    enriched_transactions,
-    output_file="output/sales_report.txt"
-):
+from string import Template
+
+from utils.data_processor import find_peak_sales_day
+
+RULE = "=" * 30
+SECTION_RULE = "-" * 30
+
+REPORT_FORMATS = {
+    "txt": ".txt",
+    "md": ".md",
+    "json": ".json",
+    "csv": ".csv"
+}
+
+# ---------- TEMPLATES ----------
+
+TEXT_TEMPLATE = Template(
+    "SALES ANALYTICS REPORT\n"
+    "$rule\n"
+    "Generated On: $generated_on\n"
+    "Total Transactions Processed: $total_transactions\n"
+    "\n"
+    "REGION-WISE SALES SUMMARY\n"
+    "$section_rule\n"
+    "$regions"
+    "\n"
+    "TOP SELLING PRODUCTS\n"
+    "$section_rule\n"
+    "$top_products"
+    "\n"
+    "CUSTOMER SEGMENTATION SUMMARY\n"
+    "$section_rule\n"
+    "$segments"
+    "\n"
+    "PEAK SALES DAY\n"
+    "$section_rule\n"
+    "Peak Sales Date: $peak_date\n"
+    "Revenue: $peak_revenue\n\n"
+    "$rule\n"
+    "END OF REPORT\n"
+)
+
+MARKDOWN_TEMPLATE = Template(
+    "# Sales Analytics Report\n"
+    "\n"
+    "- Generated On: $generated_on\n"
+    "- Total Transactions Processed: $total_transactions\n"
+    "\n"
+    "## Region-wise Sales Summary\n"
+    "\n"
+    "| Region | Revenue | Transactions |\n"
+    "|---|---:|---:|\n"
+    "$regions"
+    "\n"
+    "## Top Selling Products\n"
+    "\n"
+    "| # | Product | Revenue |\n"
+    "|---:|---|---:|\n"
+    "$top_products"
+    "\n"
+    "## Customer Segmentation Summary\n"
+    "\n"
+    "| Segment | Customers |\n"
+    "|---|---:|\n"
+    "$segments"
+    "\n"
+    "## Peak Sales Day\n"
+    "\n"
+    "- Peak Sales Date: $peak_date\n"
+    "- Revenue: $peak_revenue\n"
+)
+
+
+def build_report_data(results, total_transactions, top_n=5, generated_on=None):
     """
-    Generates a comprehensive formatted sales report
+    Derives every report section from precomputed Aggregator results once,
+    so each output format renders the same numbers without re-aggregating.
+    Returns dict
     """
-    with open(output_file, "w", encoding="utf-8") as f:
-        # Header
-        f.write("SALES ANALYTICS REPORT\n")
-        f.write("=" * 30 + "\n")
-        f.write(f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Total Transactions Processed: {len(transactions)}\n")
-        f.write("\n")
-        # Section 1: Region-wise Sales Summary
-        f.write("REGION-WISE SALES SUMMARY\n")
-        f.write("-" * 30 + "\n")
-
-        region_summary = {}
-
-        for txn in transactions:
-            region = txn.get("Region")
-            amount = txn.get("Quantity", 0) * txn.get("UnitPrice", 0)
-
-            if region not in region_summary:
-                region_summary[region] = {
-                    "revenue": 0.0,
-                    "transactions": 0
-                }
-
-            region_summary[region]["revenue"] += amount
-            region_summary[region]["transactions"] += 1
-
-        for region, data in region_summary.items():
-            f.write(
-                f"Region: {region} | "
-                f"Revenue: {data['revenue']:.2f} | "
-                f"Transactions: {data['transactions']}\n"
-            )
-
-        f.write("\n")
-        # Section 2: Top Selling Products
-        f.write("TOP SELLING PRODUCTS\n")
-        f.write("-" * 30 + "\n")
-
-        product_sales = {}
-
-        for txn in transactions:
-            product = txn.get("ProductName")
-            amount = txn.get("Quantity", 0) * txn.get("UnitPrice", 0)
-
-            if product not in product_sales:
-                product_sales[product] = 0.0
-
-            product_sales[product] += amount
-
-        top_products = sorted(
-            product_sales.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
-        for idx, (product, revenue) in enumerate(top_products, start=1):
-            f.write(f"{idx}. {product} | Revenue: {revenue:.2f}\n")
-
-        f.write("\n")
-        # Section 3: Customer Segmentation Summary
-        f.write("CUSTOMER SEGMENTATION SUMMARY\n")
-        f.write("-" * 30 + "\n")
+    top_products = heapq.nlargest(top_n, results["products"], key=lambda x: x["Revenue"])
 
+    # Approximate (sketch) results carry segment counts instead of customers
+    segment_count = results.get("segments")
+    if segment_count is None:
         segment_count = {}
+        for data in results["customers"]:
+            segment = data["Segment"]
+            segment_count[segment] = segment_count.get(segment, 0) + 1
+
+    peak_date, peak_revenue = find_peak_sales_day(results["daily"])
+
+    if generated_on is None:
+        generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    return {
+        "generated_on": generated_on,
+        "total_transactions": total_transactions,
+        "regions": results["regions"],
+        "top_products": [
+            {"Rank": idx, "ProductName": p["ProductName"], "Revenue": p["Revenue"]}
+            for idx, p in enumerate(top_products, start=1)
+        ],
+        "segments": segment_count,
+        "peak_day": {"Date": peak_date, "Revenue": peak_revenue}
+    }
+def render_text(data):
+    """
+    Renders the plain-text report.
+    """
+    return TEXT_TEMPLATE.substitute(
+        rule=RULE,
+        section_rule=SECTION_RULE,
+        generated_on=data["generated_on"],
+        total_transactions=data["total_transactions"],
+        regions="".join(
+            f"Region: {r['Region']} | Revenue: {r['Revenue']:.2f} | "
+            f"Transactions: {r['Transactions']}\n"
+            for r in data["regions"]
+        ),
+        top_products="".join(
+            f"{p['Rank']}. {p['ProductName']} | Revenue: {p['Revenue']:.2f}\n"
+            for p in data["top_products"]
+        ),
+        segments="".join(
+            f"{segment}: {count} customers\n"
+            for segment, count in data["segments"].items()
+        ),
+        peak_date=data["peak_day"]["Date"],
+        peak_revenue=f"{data['peak_day']['Revenue']:.2f}"
+    )
+def render_markdown(data):
+    """
+    Renders the report as Markdown tables.
+    """
+    return MARKDOWN_TEMPLATE.substitute(
+        generated_on=data["generated_on"],
+        total_transactions=data["total_transactions"],
+        regions="".join(
+            f"| {r['Region']} | {r['Revenue']:.2f} | {r['Transactions']} |\n"
+            for r in data["regions"]
+        ),
+        top_products="".join(
+            f"| {p['Rank']} | {p['ProductName'].replace('|', '/')} | {p['Revenue']:.2f} |\n"
+            for p in data["top_products"]
+        ),
+        segments="".join(
+            f"| {segment} | {count} |\n"
+            for segment, count in data["segments"].items()
+        ),
+        peak_date=data["peak_day"]["Date"],
+        peak_revenue=f"{data['peak_day']['Revenue']:.2f}"
+    )
+def render_json(data):
+    """
+    Renders the report sections as a JSON document.
+    """
+    return json.dumps(data, indent=2) + "\n"
+def render_csv(data):
+    """
+    Renders all sections as one long-format CSV:
+    Section, Key, Revenue, Count
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["Section", "Key", "Revenue", "Count"])
+
+    writer.writerow(["summary", "generated_on", "", data["generated_on"]])
+    writer.writerow(["summary", "total_transactions", "", data["total_transactions"]])
 
-        for txn in enriched_transactions:
-            segment = txn.get("Segment")
-            if segment:
-                segment_count[segment] = segment_count.get(segment, 0) + 1
+    for r in data["regions"]:
+        writer.writerow(["region", r["Region"], f"{r['Revenue']:.2f}", r["Transactions"]])
 
-        for segment, count in segment_count.items():
-            f.write(f"{segment}: {count} customers\n")
+    for p in data["top_products"]:
+        writer.writerow(["top_product", p["ProductName"], f"{p['Revenue']:.2f}", p["Rank"]])
 
-        f.write("\n")
-        # Section 4: Peak Sales Day
-        f.write("PEAK SALES DAY\n")
-        f.write("-" * 30 + "\n")
+    for segment, count in data["segments"].items():
+        writer.writerow(["segment", segment, "", count])
 
-        daily_sales = {}
+    peak = data["peak_day"]
+    writer.writerow(["peak_day", peak["Date"], f"{peak['Revenue']:.2f}", ""])
 
-        for txn in transactions:
-            date = txn.get("Date")
-            amount = txn.get("Quantity", 0) * txn.get("UnitPrice", 0)
-            daily_sales[date] = daily_sales.get(date, 0) + amount
+    return buffer.getvalue()
 
-        peak_date = max(daily_sales, key=daily_sales.get)
-        peak_revenue = daily_sales[peak_date]
 
-        f.write(f"Peak Sales Date: {peak_date}\n")
-        f.write(f"Revenue: {peak_revenue:.2f}\n\n")
-        # Footer
-        f.write("=" * 30 + "\n")
-        f.write("END OF REPORT\n")
+RENDERERS = {
+    "txt": render_text,
+    "md": render_markdown,
+    "json": render_json,
+    "csv": render_csv
+}
 
+
+def write_atomic(path, text):
+    """
+    Writes text to path in a single write via a temp file in the same
+    directory, then renames it into place so readers never see a
+    partially written report.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+def write_reports(results, total_transactions, output_file="output/sales_report.txt", formats=("txt",)):
+    """
+    Renders the requested formats (txt, md, json, csv) from one set of
+    aggregates and writes each atomically next to output_file.
+    Returns list of written paths
+    """
+    data = build_report_data(results, total_transactions)
+    base, _ = os.path.splitext(output_file)
+    paths = []
+
+    for fmt in formats:
+        if fmt not in RENDERERS:
+            print(f"ERROR: Unknown report format '{fmt}'")
+            continue
+
+        path = output_file if fmt == "txt" else base + REPORT_FORMATS[fmt]
+        write_atomic(path, RENDERERS[fmt](data))
+        paths.append(path)
+
+    return paths
+def generate_sales_report(
+    results,
+    total_transactions,
+    output_file="output/sales_report.txt"
+):
+    """
+    Generates a comprehensive formatted sales report
+    from precomputed Aggregator results
+    """
+    write_atomic(output_file, render_text(build_report_data(results, total_transactions)))
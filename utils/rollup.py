@@ -0,0 +1,188 @@
+# utils/rollup.py
+
+from datetime import date as Date
+from functools import lru_cache
+
+from utils.aggregator import ACCUMULATOR_TYPES
+
+LEVELS = ("day", "week", "month")
+MEASURES = ("quantity", "revenue", "transactions")
+DATE_CACHE_SIZE = 4096  # distinct Date strings kept parsed (over 10 years of days)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(text):
+    """
+    Parses a 'YYYY-MM-DD' string, remembering the most recent
+    DATE_CACHE_SIZE distinct values so malformed input cannot grow the
+    cache without bound.
+    Returns datetime.date or None if the string is not a valid date.
+    """
+    try:
+        return Date.fromisoformat(text)
+    except (TypeError, ValueError):
+        return None
+@lru_cache(maxsize=DATE_CACHE_SIZE * len(LEVELS))
+def period_key(text, level):
+    """
+    Maps a raw Date string to its period at the given level:
+    day 'YYYY-MM-DD', week 'YYYY-Www' (ISO week), month 'YYYY-MM'.
+    Unparsable dates stay as-is at day level and have no week/month.
+    Returns str or None
+    """
+    parsed = parse_date(text)
+
+    if level == "day":
+        return parsed.isoformat() if parsed else text
+    if parsed is None:
+        return None
+    if level == "week":
+        year, week, _ = parsed.isocalendar()
+        return f"{year}-W{week:02d}"
+    if level == "month":
+        return f"{parsed.year}-{parsed.month:02d}"
+
+    raise ValueError(f"Unknown rollup level '{level}' (expected one of {', '.join(LEVELS)})")
+
+
+class RollupCube:
+    """
+    Pre-aggregated date x region x product cube, filled during ingestion
+    as an Aggregator accumulator. Each cell holds [quantity, revenue,
+    transactions]; the cell count is bounded by days * regions * products,
+    not by the number of transactions.
+    Day/week/month series are rolled up from the cells once per
+    (level, region, product) slice and cached, so repeated trend, peak
+    and period-over-period queries cost O(periods). Period totals add
+    cell totals, which is exact for whole-number amounts.
+    Result: the cube itself (query it with series/peak/period_over_period).
+    """
+    name = "rollup"
+
+    def __init__(self):
+        self.cells = {}
+        self._series = {}
+
+    def add(self, txn, amount):
+        if self._series:
+            self._series.clear()
+
+        key = (txn["Date"], txn["Region"], txn["ProductName"])
+
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0, 0.0, 0]
+
+        cell[0] += txn["Quantity"]
+        cell[1] += amount
+        cell[2] += 1
+
+    def merge(self, other):
+        for key, (quantity, revenue, count) in other.cells.items():
+            cell = self.cells.setdefault(key, [0, 0.0, 0])
+            cell[0] += quantity
+            cell[1] += revenue
+            cell[2] += count
+
+        self._series.clear()
+
+    def state(self):
+        return [[date, region, product] + cell for (date, region, product), cell in self.cells.items()]
+
+    def load_state(self, state):
+        self.cells = {
+            (date, region, product): [quantity, revenue, count]
+            for date, region, product, quantity, revenue, count in state
+        }
+        self._series.clear()
+
+    def result(self):
+        return self
+
+    # ---------- QUERIES ----------
+
+    def _rollup(self, level, region, product):
+        cache_key = (level, region, product)
+        series = self._series.get(cache_key)
+        if series is not None:
+            return series
+
+        totals = {}
+        for (date, cell_region, cell_product), (quantity, revenue, count) in self.cells.items():
+            if region is not None and cell_region != region:
+                continue
+            if product is not None and cell_product != product:
+                continue
+
+            period = period_key(date, level)
+            if period is None:
+                continue
+
+            data = totals.get(period)
+            if data is None:
+                data = totals[period] = [0, 0.0, 0]
+            data[0] += quantity
+            data[1] += revenue
+            data[2] += count
+
+        series = self._series[cache_key] = {period: totals[period] for period in sorted(totals)}
+        return series
+
+    def series(self, level="day", region=None, product=None, measure="revenue"):
+        """
+        Returns dict period -> measure in chronological order, optionally
+        sliced to one region and/or product.
+        """
+        index = MEASURES.index(measure)
+        return {
+            period: data[index]
+            for period, data in self._rollup(level, region, product).items()
+        }
+
+    def peak(self, level="day", region=None, product=None, measure="revenue"):
+        """
+        Returns (period, value) with the highest measure; the earliest
+        period wins ties. (None, 0.0) when the slice is empty.
+        """
+        series = self.series(level, region, product, measure)
+        if not series:
+            return None, 0.0
+
+        period = max(series, key=series.get)
+        return period, series[period]
+
+    def period_over_period(self, level="month", region=None, product=None, measure="revenue"):
+        """
+        Returns one entry per period with the change against the previous
+        period present in the data:
+        {"Period", "Value", "Previous", "Change", "ChangePct"}
+        ChangePct is None for the first period or a zero previous value.
+        """
+        result = []
+        previous = None
+
+        for period, value in self.series(level, region, product, measure).items():
+            change = None if previous is None else value - previous
+            change_pct = (
+                round(change / previous * 100, 2)
+                if previous not in (None, 0) else None
+            )
+            result.append({
+                "Period": period,
+                "Value": value,
+                "Previous": previous,
+                "Change": change,
+                "ChangePct": change_pct
+            })
+            previous = value
+
+        return result
+
+    def regions(self):
+        return sorted({region for _, region, _ in self.cells})
+
+    def products(self):
+        return sorted({product for _, _, product in self.cells})
+
+
+ACCUMULATOR_TYPES[RollupCube.name] = RollupCube
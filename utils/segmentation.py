@@ -0,0 +1,305 @@
+# utils/segmentation.py
+#
+# Vectorized customer segmentation and RFM scoring.
+#
+# Transactions are grouped once into a columnar CustomerTable (spend,
+# frequency and last purchase day per customer) using integer customer
+# codes from TransactionTable, so the group-by is a few NumPy passes
+# instead of a per-transaction dict update. Segments and RFM scores are
+# then assigned to whole columns at once and counted directly.
+
+from bisect import bisect_right
+
+from utils.aggregator import HIGH_VALUE_SPEND, MEDIUM_VALUE_SPEND
+from utils.rollup import parse_date
+from utils.transaction_table import TransactionTable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python columns are used instead
+    np = None
+
+SEGMENT_LABELS = ("Low Value", "Medium Value", "High Value")
+SPEND_THRESHOLDS = (MEDIUM_VALUE_SPEND, HIGH_VALUE_SPEND)
+SPEND_QUANTILES = (0.5, 0.9)
+RFM_BINS = 5
+UNKNOWN_DAY = -1  # Unparsable dates count as the oldest possible purchase
+
+
+def day_numbers(dates):
+    """
+    Converts Date strings to proleptic ordinals (one parse per distinct value).
+    Returns list of int, UNKNOWN_DAY for unparsable dates
+    """
+    result = []
+    for text in dates:
+        parsed = parse_date(text)
+        result.append(parsed.toordinal() if parsed else UNKNOWN_DAY)
+    return result
+def _quantiles(values, fractions):
+    """
+    Linear-interpolation quantiles (NumPy's default method).
+    """
+    if not len(values):
+        return [0.0] * len(fractions)
+
+    if np is not None:
+        return np.quantile(values, fractions).tolist()
+
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    result = []
+    for fraction in fractions:
+        position = fraction * last
+        low = int(position)
+        high = min(low + 1, last)
+        result.append(ordered[low] + (ordered[high] - ordered[low]) * (position - low))
+    return result
+def _bucket(edges, values):
+    """
+    Returns, per value, how many edges are <= value (0..len(edges)).
+    """
+    if np is not None:
+        return np.searchsorted(np.asarray(edges, dtype=np.float64), values, side="right")
+
+    return [bisect_right(edges, value) for value in values]
+def quantile_scores(values, bins=RFM_BINS, reverse=False):
+    """
+    Scores values 1..bins by quantile: higher values get higher scores,
+    or lower scores with reverse=True. Ties always share a score.
+    """
+    edges = _quantiles(values, [i / bins for i in range(1, bins)])
+    buckets = _bucket(edges, values)
+
+    if np is not None:
+        return (bins - buckets if reverse else buckets + 1).astype(np.int8)
+
+    return [bins - b if reverse else b + 1 for b in buckets]
+
+
+class CustomerTable:
+    """
+    One row per customer in first-seen order, stored as parallel columns:
+    codes (into customer_ids), spend, frequency and last_day (date ordinal
+    of the latest purchase). Spend is summed per customer in row order,
+    so it matches customer_analysis exactly.
+    """
+
+    def __init__(self, customer_ids, codes, spend, frequency, last_day):
+        self.customer_ids = customer_ids
+        self.codes = codes
+        self.spend = spend
+        self.frequency = frequency
+        self.last_day = last_day
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """
+        Builds the customer table from a TransactionTable or any iterable
+        of transaction dictionaries.
+        """
+        if not isinstance(transactions, TransactionTable):
+            transactions = TransactionTable.from_transactions(transactions)
+
+        return cls.from_columns(
+            transactions.codes["CustomerID"],
+            transactions.dictionaries["CustomerID"].values,
+            transactions.amounts(),
+            transactions.codes["Date"],
+            day_numbers(transactions.dictionaries["Date"].values)
+        )
+
+    @classmethod
+    def from_columns(cls, customer_codes, customer_ids, amounts, date_codes, days):
+        """
+        Groups per-row columns by customer code. date_codes index into
+        days (date ordinals per distinct Date).
+        """
+        if np is None:
+            return cls._from_columns_python(customer_codes, customer_ids, amounts, date_codes, days)
+
+        rows = len(customer_codes)
+        size = len(customer_ids)
+        codes = np.asarray(customer_codes, dtype=np.int32)
+        row_days = np.asarray(days, dtype=np.int64)[np.asarray(date_codes, dtype=np.int32)]
+
+        frequency = np.bincount(codes, minlength=size)
+        spend = np.bincount(codes, weights=np.asarray(amounts, dtype=np.float64), minlength=size)
+
+        last_day = np.full(size, UNKNOWN_DAY, dtype=np.int64)
+        np.maximum.at(last_day, codes, row_days)
+
+        # First occurrence per customer gives the dict insertion order;
+        # marking those rows and reading their codes avoids a sort
+        first_seen = np.full(size, rows, dtype=np.int64)
+        np.minimum.at(first_seen, codes, np.arange(rows, dtype=np.int64))
+        first_rows = np.zeros(rows, dtype=bool)
+        first_rows[first_seen[frequency > 0]] = True
+        order = codes[first_rows]
+
+        return cls(customer_ids, order, spend[order], frequency[order], last_day[order])
+
+    @classmethod
+    def _from_columns_python(cls, customer_codes, customer_ids, amounts, date_codes, days):
+        groups = {}
+        for code, amount, date_code in zip(customer_codes, amounts, date_codes):
+            group = groups.get(code)
+            if group is None:
+                group = groups[code] = [0.0, 0, UNKNOWN_DAY]
+
+            group[0] += amount
+            group[1] += 1
+            if days[date_code] > group[2]:
+                group[2] = days[date_code]
+
+        return cls(
+            customer_ids,
+            list(groups),
+            [group[0] for group in groups.values()],
+            [group[1] for group in groups.values()],
+            [group[2] for group in groups.values()]
+        )
+
+    def __len__(self):
+        return len(self.codes)
+
+    def ids(self):
+        values = self.customer_ids
+        return [values[code] for code in self.codes]
+
+    # ---------- SEGMENTS ----------
+
+    def segments(self, method="threshold", thresholds=SPEND_THRESHOLDS, quantiles=SPEND_QUANTILES):
+        """
+        Assigns every customer a segment index into SEGMENT_LABELS (or any
+        labels list one longer than the cut points).
+        method="threshold": fixed ascending spend cut points; spend equal
+        to a cut point moves up, as in spend_segment.
+        method="quantile": cut points are the given spend quantiles.
+        Returns (segment indexes, cut points)
+        """
+        if method == "threshold":
+            edges = sorted(thresholds)
+        elif method == "quantile":
+            edges = _quantiles(self.spend, sorted(quantiles))
+        else:
+            raise ValueError(f"Unknown segmentation method '{method}' (expected threshold or quantile)")
+
+        return _bucket(edges, self.spend), edges
+
+    def segment_counts(self, method="threshold", labels=SEGMENT_LABELS, **options):
+        """
+        Returns dict label -> customer count, in the order each segment is
+        first seen (the same order as the report's segmentation summary).
+        """
+        segments, edges = self.segments(method, **options)
+        if len(labels) != len(edges) + 1:
+            raise ValueError(f"Expected {len(edges) + 1} segment labels, got {len(labels)}")
+
+        return _first_seen_counts(segments, labels)
+
+    def recency(self, as_of=None):
+        """
+        Days since each customer's last purchase, counted from as_of
+        (a date; defaults to the latest purchase in the table).
+        """
+        if as_of is None:
+            as_of = max(self.last_day) if len(self) else 0
+        else:
+            as_of = as_of.toordinal()
+
+        if np is not None:
+            return as_of - self.last_day
+
+        return [as_of - day for day in self.last_day]
+
+    def rfm_scores(self, bins=RFM_BINS, as_of=None):
+        """
+        Quantile-based recency, frequency and monetary scores (1..bins,
+        higher is better; recent purchases score high).
+        Returns (recency, frequency, monetary) score columns
+        """
+        return (
+            quantile_scores(self.recency(as_of), bins, reverse=True),
+            quantile_scores(self.frequency, bins),
+            quantile_scores(self.spend, bins)
+        )
+
+    def rfm_codes(self, bins=RFM_BINS, as_of=None):
+        """
+        Combines the three scores into one 'RFM' cell code, e.g. 545.
+        """
+        recency, frequency, monetary = self.rfm_scores(bins, as_of)
+
+        if np is not None:
+            return recency.astype(np.int32) * 100 + frequency.astype(np.int32) * 10 + monetary
+
+        return [r * 100 + f * 10 + m for r, f, m in zip(recency, frequency, monetary)]
+
+    def rfm_counts(self, bins=RFM_BINS, as_of=None):
+        """
+        Returns dict RFM code (str) -> customer count, highest codes first.
+        """
+        codes = self.rfm_codes(bins, as_of)
+
+        if np is not None:
+            counts = np.bincount(codes)
+            pairs = ((int(code), int(counts[code])) for code in np.flatnonzero(counts))
+        else:
+            counts = {}
+            for code in codes:
+                counts[code] = counts.get(code, 0) + 1
+            pairs = counts.items()
+
+        return {str(code): count for code, count in sorted(pairs, reverse=True)}
+
+    def to_records(self, method="threshold", labels=SEGMENT_LABELS, rfm=False, **options):
+        """
+        Returns customer summaries shaped like customer_analysis, with an
+        extra "RFM" code per customer when rfm=True.
+        """
+        segments, _ = self.segments(method, **options)
+        columns = [self.ids(), _to_list(self.spend), _to_list(self.frequency), _to_list(segments)]
+        if rfm:
+            columns.append(_to_list(self.rfm_codes()))
+
+        records = []
+        for row in zip(*columns):
+            record = {
+                "CustomerID": row[0],
+                "TotalSpend": row[1],
+                "Transactions": row[2],
+                "Segment": labels[row[3]]
+            }
+            if rfm:
+                record["RFM"] = str(row[4])
+            records.append(record)
+
+        return records
+
+
+def _to_list(column):
+    return column.tolist() if np is not None and isinstance(column, np.ndarray) else list(column)
+def _first_seen_counts(segments, labels):
+    if np is not None:
+        segments = np.asarray(segments)
+        if not len(segments):
+            return {}
+        counts = np.bincount(segments, minlength=len(labels))
+        present = np.flatnonzero(counts)
+        first_seen = [int(np.argmax(segments == index)) for index in present]
+        order = present[np.argsort(first_seen, kind="stable")]
+        return {labels[index]: int(counts[index]) for index in order}
+
+    counts = {}
+    for index in segments:
+        label = labels[index]
+        counts[label] = counts.get(label, 0) + 1
+    return counts
+def segment_customers(transactions, method="threshold", labels=SEGMENT_LABELS, **options):
+    """
+    One-call segmentation: groups the transactions by customer and counts
+    customers per segment.
+    Returns dict label -> customer count
+    """
+    return CustomerTable.from_transactions(transactions).segment_counts(method, labels, **options)
@@ -0,0 +1,191 @@
+# utils/server.py
+
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from utils.aggregator import Aggregator, rank_top_products, filter_low_products
+from utils.api_handler import create_product_mapping, enrich_sales_data
+from utils.catalog_cache import get_products
+from utils.data_processor import iter_sales_records
+from utils.lru import LRUCache
+from utils.query_index import TransactionIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 1024
+CACHE_BYTES = 64 * 1024 * 1024  # cached JSON response bodies
+MAX_HEADER_LINES = 100
+
+
+def load_dataset(filename, products=None):
+    """
+    Parses, enriches and indexes the sales file once.
+    Returns TransactionIndex
+    """
+    if products is None:
+        products = get_products()
+
+    enriched = enrich_sales_data(iter_sales_records(filename), create_product_mapping(products))
+    return TransactionIndex(enriched)
+def _optional_float(params, name):
+    value = params.get(name)
+    return float(value) if value not in (None, "") else None
+def _parse_query(params):
+    """
+    Normalizes query-string parameters into a hashable cache key.
+    Raises ValueError on malformed numbers.
+    """
+    return (
+        params.get("region") or None,
+        _optional_float(params, "min_amount"),
+        _optional_float(params, "max_amount"),
+        int(params.get("top_n") or 5),
+        int(params.get("threshold") or 10)
+    )
+
+
+class SalesQueryService:
+    """
+    Answers filter/aggregate queries from a warm, read-only TransactionIndex.
+    Serialized responses for repeated queries are memoized in a bounded LRU.
+    """
+
+    def __init__(self, index, cache_entries=CACHE_ENTRIES, cache_bytes=CACHE_BYTES):
+        self.index = index
+        self.cache = LRUCache(cache_entries, cache_bytes)
+
+        # Keep the unfiltered aggregates warm from the start
+        self.query({})
+
+    def compute(self, region, min_amount, max_amount, top_n, threshold):
+        transactions, invalid_count, summary = self.index.query(region, min_amount, max_amount)
+        results = Aggregator().consume(transactions).results()
+
+        return {
+            "filters": {
+                "region": region,
+                "min_amount": min_amount,
+                "max_amount": max_amount
+            },
+            "summary": summary,
+            "total_revenue": results["total_revenue"],
+            "regions": results["regions"],
+            "top_products": rank_top_products(results["products"], top_n),
+            "low_products": filter_low_products(results["products"], threshold),
+            "customers": results["customers"],
+            "daily": results["daily"]
+        }
+
+    def query(self, params):
+        """
+        Returns the JSON response body (bytes) for the given parameters.
+        """
+        key = _parse_query(params)
+
+        body = self.cache.get(key)
+        if body is None:
+            body = json.dumps(self.compute(*key)).encode("utf-8")
+            self.cache.put(key, body)
+
+        return body
+
+    def stats(self):
+        return json.dumps({
+            "rows": len(self.index.transactions),
+            "cache": self.cache.info()
+        }).encode("utf-8")
+
+
+async def _read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+
+    # Headers are read and ignored; only GET without a body is supported
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+    return request_line
+async def _write_response(writer, status, body):
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}[status]
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+def make_handler(service):
+    """
+    Builds the asyncio connection handler for the JSON API:
+    GET /query?region=&min_amount=&max_amount=&top_n=&threshold=
+    GET /stats
+    """
+    async def handle(reader, writer):
+        try:
+            request_line = await _read_request(reader)
+            parts = request_line.split()
+
+            if len(parts) != 3:
+                await _write_response(writer, 400, b'{"error": "malformed request"}')
+                return
+
+            method, target, _ = parts
+            if method != "GET":
+                await _write_response(writer, 405, b'{"error": "only GET is supported"}')
+                return
+
+            url = urlsplit(target)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if url.path == "/query":
+                loop = asyncio.get_running_loop()
+                try:
+                    body = await loop.run_in_executor(None, service.query, params)
+                except ValueError as e:
+                    body = json.dumps({"error": str(e)}).encode("utf-8")
+                    await _write_response(writer, 400, body)
+                    return
+                await _write_response(writer, 200, body)
+            elif url.path == "/stats":
+                await _write_response(writer, 200, service.stats())
+            else:
+                await _write_response(writer, 404, b'{"error": "not found"}')
+
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+async def start_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """
+    Starts the JSON API on TCP (host, port) or on a Unix socket.
+    Returns asyncio.Server
+    """
+    handler = make_handler(service)
+
+    if unix_path:
+        return await asyncio.start_unix_server(handler, path=unix_path)
+
+    return await asyncio.start_server(handler, host, port)
+def serve(filename, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """
+    Loads the dataset once and serves queries until interrupted.
+    """
+    print("Loading and indexing dataset...")
+    service = SalesQueryService(load_dataset(filename))
+    print(f"Indexed {len(service.index.transactions)} valid transactions")
+
+    async def run():
+        server = await start_server(service, host, port, unix_path)
+        address = unix_path or f"http://{host}:{port}"
+        print(f"Serving sales queries on {address} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("Server stopped.")
@@ -0,0 +1,480 @@
+# utils/sketches.py
+#
+# Bounded-memory summaries for very high cardinalities. All hashing goes
+# through blake2b so sketches are deterministic across processes and runs,
+# which keeps them mergeable (parallel workers) and checkpointable.
+
+import hashlib
+import heapq
+import math
+
+from utils.aggregator import ACCUMULATOR_TYPES
+
+
+def _hash128(value):
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch for approximate per-key totals.
+    With width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)),
+    estimate(key) never underestimates and exceeds the true total by at
+    most epsilon * (sum of all weights) with probability 1 - delta
+    (for non-negative weights).
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [[0.0] * self.width for _ in range(self.depth)]
+        self.total = 0.0
+
+    def _columns(self, key):
+        h1, h2 = _hash128(key)
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key, weight=1):
+        self.total += weight
+        for row, column in zip(self.rows, self._columns(key)):
+            row[column] += weight
+
+    def estimate(self, key):
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different sizes")
+
+        self.total += other.total
+        for mine, theirs in zip(self.rows, other.rows):
+            for i, value in enumerate(theirs):
+                mine[i] += value
+
+
+class SpaceSaving:
+    """
+    SpaceSaving heavy-hitter summary holding at most `capacity` keys.
+    Every key whose true total exceeds N / capacity (N = sum of weights)
+    is guaranteed to be tracked; a tracked key's count overestimates its
+    true total by at most its recorded error, which is <= N / capacity.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}  # key -> [count, error]
+        self.heap = []    # (count, key), may contain stale entries
+        self.total = 0
+
+    def _min_entry(self):
+        while True:
+            count, key = self.heap[0]
+            entry = self.counts.get(key)
+            if entry is not None and entry[0] == count:
+                return count, key
+            heapq.heappop(self.heap)
+
+    def add(self, key, weight=1):
+        self.total += weight
+
+        entry = self.counts.get(key)
+        if entry is not None:
+            entry[0] += weight
+        elif len(self.counts) < self.capacity:
+            entry = self.counts[key] = [weight, 0]
+        else:
+            min_count, min_key = self._min_entry()
+            heapq.heappop(self.heap)
+            del self.counts[min_key]
+            entry = self.counts[key] = [min_count + weight, min_count]
+
+        heapq.heappush(self.heap, (entry[0], key))
+
+        # Drop stale heap entries once they dominate
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, k) for k, (count, _) in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def min_count(self):
+        """
+        Upper bound on the total of any key that is not tracked.
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counts.values())
+
+    def merge(self, other):
+        """
+        Mergeable-summaries combine: keys missing from one side are
+        charged that side's min_count, then the top `capacity` keys are kept.
+        """
+        mine_min = self.min_count()
+        theirs_min = other.min_count()
+        merged = {}
+
+        for key in list(self.counts) + [k for k in other.counts if k not in self.counts]:
+            count_a, error_a = self.counts.get(key, (mine_min, mine_min))
+            count_b, error_b = other.counts.get(key, (theirs_min, theirs_min))
+            merged[key] = [count_a + count_b, error_a + error_b]
+
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda item: item[1][0])
+        self.counts = dict(kept)
+        self.heap = [(count, key) for key, (count, _) in self.counts.items()]
+        heapq.heapify(self.heap)
+        self.total += other.total
+
+    def top(self, k):
+        """
+        Returns up to k (key, estimated_count, max_error) sorted by count.
+        """
+        best = heapq.nlargest(k, self.counts.items(), key=lambda item: item[1][0])
+        return [(key, count, error) for key, (count, error) in best]
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2**precision one-byte registers.
+    Standard error is about 1.04 / sqrt(2**precision)
+    (0.81% at the default precision of 14, using 16 KB).
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        x, _ = _hash128(value)
+        index = x >> (64 - self.precision)
+        remaining = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small sets
+
+        return int(round(estimate))
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantiles using the k1 scale function.
+    Memory is O(compression). Rank error is typically well under
+    1 / compression around the median and much smaller in the tails;
+    the minimum and maximum are exact.
+    """
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, weight=1):
+        self.buffer.append((value, weight))
+        self.count += weight
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if len(self.buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _scale(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self.buffer:
+            return
+
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+
+        means = []
+        weights = []
+        total = self.count
+        weight_before = 0
+
+        mean, weight = points[0]
+        k_lower = self._scale(0)
+
+        for value, w in points[1:]:
+            if self._scale((weight_before + weight + w) / total) - k_lower <= 1:
+                mean += (value - mean) * w / (weight + w)
+                weight += w
+            else:
+                means.append(mean)
+                weights.append(weight)
+                weight_before += weight
+                k_lower = self._scale(weight_before / total)
+                mean, weight = value, w
+
+        means.append(mean)
+        weights.append(weight)
+
+        self.means = means
+        self.weights = weights
+
+    def merge(self, other):
+        other._compress()
+        self.buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+
+        for bound in (other.min, other.max):
+            if bound is None:
+                continue
+            if self.min is None or bound < self.min:
+                self.min = bound
+            if self.max is None or bound > self.max:
+                self.max = bound
+
+        self._compress()
+
+    def quantile(self, q):
+        """
+        Returns the estimated value at quantile q (0..1), or None if empty.
+        """
+        self._compress()
+        if not self.count:
+            return None
+
+        target = q * self.count
+        if target <= self.weights[0] / 2:
+            first = self.weights[0] / 2
+            return self.min + (self.means[0] - self.min) * (target / first if first else 0)
+
+        cumulative = 0
+        for i in range(len(self.means) - 1):
+            center = cumulative + self.weights[i] / 2
+            next_center = cumulative + self.weights[i] + self.weights[i + 1] / 2
+            if target <= next_center:
+                fraction = (target - center) / (next_center - center)
+                return self.means[i] + (self.means[i + 1] - self.means[i]) * fraction
+            cumulative += self.weights[i]
+
+        last_center = self.count - self.weights[-1] / 2
+        span = self.count - last_center
+        fraction = (target - last_center) / span if span else 1
+        return self.means[-1] + (self.max - self.means[-1]) * min(fraction, 1)
+
+
+# ---------- AGGREGATOR ACCUMULATORS ----------
+
+class HeavyHitterProducts:
+    """
+    Top products by quantity in bounded memory (SpaceSaving).
+    Result: list of {"ProductName", "TotalQuantity", "MaxError"} where
+    TotalQuantity is an upper estimate at most MaxError above the truth.
+    """
+    name = "heavy_products"
+
+    def __init__(self, capacity=1000, top_n=5):
+        self.top_n = top_n
+        self.summary = SpaceSaving(capacity)
+
+    def add(self, txn, amount):
+        self.summary.add(txn["ProductName"], txn["Quantity"])
+
+    def merge(self, other):
+        self.summary.merge(other.summary)
+
+    def state(self):
+        return {
+            "capacity": self.summary.capacity,
+            "top_n": self.top_n,
+            "total": self.summary.total,
+            "counts": self.summary.counts
+        }
+
+    def load_state(self, state):
+        self.top_n = state["top_n"]
+        self.summary = SpaceSaving(state["capacity"])
+        self.summary.total = state["total"]
+        self.summary.counts = {key: list(entry) for key, entry in state["counts"].items()}
+        self.summary.heap = [(count, key) for key, (count, _) in self.summary.counts.items()]
+        heapq.heapify(self.summary.heap)
+
+    def result(self):
+        return [
+            {"ProductName": product, "TotalQuantity": count, "MaxError": error}
+            for product, count, error in self.summary.top(self.top_n)
+        ]
+
+
+class HeavyRevenueProducts(HeavyHitterProducts):
+    """
+    Top products by revenue in bounded memory (SpaceSaving weighted by
+    amount). Result: list of {"ProductName", "Revenue", "MaxError"} where
+    Revenue is an upper estimate at most MaxError above the truth.
+    """
+    name = "heavy_revenue"
+
+    def add(self, txn, amount):
+        self.summary.add(txn["ProductName"], amount)
+
+    def result(self):
+        return [
+            {"ProductName": product, "Revenue": revenue, "MaxError": error}
+            for product, revenue, error in self.summary.top(self.top_n)
+        ]
+
+
+class DistinctCustomers:
+    """
+    Approximate number of distinct customers (HyperLogLog).
+    Result: int
+    """
+    name = "distinct_customers"
+
+    def __init__(self, precision=14):
+        self.sketch = HyperLogLog(precision)
+
+    def add(self, txn, amount):
+        self.sketch.add(txn["CustomerID"])
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+
+    def state(self):
+        return {"precision": self.sketch.precision, "registers": self.sketch.registers.hex()}
+
+    def load_state(self, state):
+        self.sketch = HyperLogLog(state["precision"])
+        self.sketch.registers = bytearray.fromhex(state["registers"])
+
+    def result(self):
+        return self.sketch.count()
+
+
+class CustomerSpendSketch:
+    """
+    Approximate per-customer spend (Count-Min) without a per-customer dict.
+    Result: the CountMinSketch; call .estimate(customer_id).
+    """
+    name = "customer_spend"
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.sketch = CountMinSketch(epsilon, delta)
+
+    def add(self, txn, amount):
+        self.sketch.add(txn["CustomerID"], amount)
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+
+    def state(self):
+        return {
+            "epsilon": self.sketch.epsilon,
+            "delta": self.sketch.delta,
+            "total": self.sketch.total,
+            "rows": self.sketch.rows
+        }
+
+    def load_state(self, state):
+        self.sketch = CountMinSketch(state["epsilon"], state["delta"])
+        self.sketch.total = state["total"]
+        self.sketch.rows = [list(row) for row in state["rows"]]
+
+    def result(self):
+        return self.sketch
+
+
+class AmountQuantiles:
+    """
+    Streaming transaction-amount quantiles (t-digest).
+    Result: dict of quantile -> estimated amount.
+    """
+    name = "amount_quantiles"
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99), compression=100):
+        self.quantiles = tuple(quantiles)
+        self.digest = TDigest(compression)
+
+    def add(self, txn, amount):
+        self.digest.add(amount)
+
+    def merge(self, other):
+        self.digest.merge(other.digest)
+
+    def state(self):
+        self.digest._compress()
+        return {
+            "quantiles": list(self.quantiles),
+            "compression": self.digest.compression,
+            "means": self.digest.means,
+            "weights": self.digest.weights,
+            "count": self.digest.count,
+            "min": self.digest.min,
+            "max": self.digest.max
+        }
+
+    def load_state(self, state):
+        self.quantiles = tuple(state["quantiles"])
+        self.digest = TDigest(state["compression"])
+        self.digest.means = list(state["means"])
+        self.digest.weights = list(state["weights"])
+        self.digest.count = state["count"]
+        self.digest.min = state["min"]
+        self.digest.max = state["max"]
+
+    def result(self):
+        return {q: self.digest.quantile(q) for q in self.quantiles}
+
+
+ACCUMULATOR_TYPES.update({
+    cls.name: cls
+    for cls in (HeavyHitterProducts, HeavyRevenueProducts, DistinctCustomers, CustomerSpendSketch, AmountQuantiles)
+})
+
+
+def sketch_accumulators(top_n=5):
+    """
+    Bounded-memory replacement for default_accumulators(): exact totals
+    for the low-cardinality region and date keys, sketches for products
+    and customers.
+    """
+    from utils.aggregator import TotalRevenue, RegionSales, DailySales
+
+    return [
+        TotalRevenue(),
+        RegionSales(),
+        DailySales(),
+        HeavyHitterProducts(top_n=top_n),
+        HeavyRevenueProducts(top_n=top_n),
+        DistinctCustomers(),
+        CustomerSpendSketch(),
+        AmountQuantiles()
+    ]
+def approximate_results(results):
+    """
+    Adds the report keys that sketch_accumulators() results lack:
+    "products" from the revenue heavy hitters and "segments" holding the
+    estimated distinct customer count (per-customer segments need exact
+    per-customer spend, which the sketches do not keep).
+    Returns the same dict
+    """
+    results["products"] = results["heavy_revenue"]
+    results["segments"] = {"Distinct customers (approx.)": results["distinct_customers"]}
+    return results
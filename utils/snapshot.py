@@ -0,0 +1,244 @@
+# utils/snapshot.py
+
+import json
+import mmap
+import os
+import shutil
+import sys
+from array import array
+
+from utils.data_processor import iter_sales_records
+from utils.file_handler import file_fingerprint, new_decode_stats
+from utils.transaction_table import TransactionTable, StringDictionary
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; prefix checks fall back to a loop
+    np = None
+
+SNAPSHOT_DIR = "output/cache/snapshot"
+SNAPSHOT_VERSION = 3
+
+
+class TransactionIDs:
+    """
+    Read-only sequence of TransactionID strings decoded on access from a
+    memory-mapped, newline-joined file. starts/ends are byte offsets of
+    each ID, so loading a snapshot reads no ID text and a filtered
+    subset (take) only copies offsets.
+    """
+
+    def __init__(self, data, starts, ends):
+        self.data = data
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, position):
+        return bytes(self.data[self.starts[position]:self.ends[position]]).decode("utf-8")
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def take(self, positions):
+        if np is not None:
+            positions = np.asarray(positions, dtype=np.int64)
+            return TransactionIDs(self.data, np.asarray(self.starts)[positions], np.asarray(self.ends)[positions])
+
+        return TransactionIDs(
+            self.data,
+            array("q", (self.starts[p] for p in positions)),
+            array("q", (self.ends[p] for p in positions))
+        )
+
+    def startswith(self, prefix):
+        """
+        Returns a per-row bool mask of IDs starting with prefix, comparing
+        bytes in the mapped file without decoding any ID.
+        """
+        if np is None:
+            return [txn_id.startswith(prefix) for txn_id in self]
+
+        data = np.frombuffer(self.data, dtype=np.uint8) if len(self.data) else np.zeros(1, dtype=np.uint8)
+        starts = np.asarray(self.starts, dtype=np.int64)
+        ends = np.asarray(self.ends, dtype=np.int64)
+
+        mask = np.ones(len(starts), dtype=bool)
+        for i, byte in enumerate(prefix.encode("utf-8")):
+            position = starts + i
+            mask &= (position < ends) & (data[np.minimum(position, len(data) - 1)] == byte)
+        return mask
+
+
+def id_spans(transaction_ids):
+    """
+    Byte offsets of each ID in the newline-joined ID file.
+    Returns (starts, ends) as array('q')
+    """
+    starts = array("q")
+    ends = array("q")
+    position = 0
+    for txn_id in transaction_ids:
+        starts.append(position)
+        position += len(txn_id.encode("utf-8"))
+        ends.append(position)
+        position += 1
+    return starts, ends
+def source_key(filename):
+    """
+    Identifies the exact source file contents a snapshot was built from.
+    Returns dict
+    """
+    return {
+        "path": os.path.abspath(filename),
+        "mtime_ns": os.stat(filename).st_mtime_ns,
+        "fingerprint": file_fingerprint(filename)
+    }
+def _column_files(table):
+    columns = {
+        "quantity": table.quantity,
+        "unit_price": table.unit_price
+    }
+    for name, codes in table.codes.items():
+        columns[f"codes_{name}"] = codes
+    return columns
+def save_snapshot(table, source, directory=SNAPSHOT_DIR, decode_stats=None):
+    """
+    Writes the table as typed column files (raw array dumps), a
+    newline-joined TransactionID file with its byte offsets and the
+    string dictionaries. decode_stats from parsing the source are kept
+    in the manifest.
+    The manifest is written last and marks the snapshot as complete.
+    """
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = _column_files(table)
+    columns["id_starts"], columns["id_ends"] = id_spans(table.transaction_ids)
+
+    typecodes = {}
+    for name, column in columns.items():
+        typecodes[name] = column.format if isinstance(column, memoryview) else column.typecode
+        with open(os.path.join(tmp_dir, f"{name}.bin"), "wb") as f:
+            f.write(column)
+
+    with open(os.path.join(tmp_dir, "transaction_ids.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(table.transaction_ids))
+
+    with open(os.path.join(tmp_dir, "dictionaries.json"), "w", encoding="utf-8") as f:
+        json.dump({name: d.values for name, d in table.dictionaries.items()}, f)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(table),
+        "typecodes": typecodes,
+        "itemsizes": {name: array(code).itemsize for name, code in typecodes.items()},
+        "source": source,
+        "decode": decode_stats
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+def load_manifest(directory=SNAPSHOT_DIR):
+    """
+    Returns the snapshot manifest, or None if missing/corrupt.
+    """
+    try:
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+def _map_column(path, typecode):
+    """
+    Memory-maps a raw column file as a typed, read-only memoryview.
+    """
+    if os.path.getsize(path) == 0:
+        return array(typecode)
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return memoryview(mapped).cast(typecode)
+def load_snapshot(directory=SNAPSHOT_DIR):
+    """
+    Loads a snapshot as a TransactionTable whose numeric and code columns
+    are memory-mapped from disk instead of read into memory. TransactionIDs
+    are decoded lazily from the mapped ID file.
+    Returns TransactionTable
+    """
+    manifest = load_manifest(directory)
+
+    with open(os.path.join(directory, "dictionaries.json"), "r", encoding="utf-8") as f:
+        dictionaries = {
+            name: StringDictionary(values)
+            for name, values in json.load(f).items()
+        }
+
+    table = TransactionTable(dictionaries)
+
+    columns = {
+        name: _map_column(os.path.join(directory, f"{name}.bin"), typecode)
+        for name, typecode in manifest["typecodes"].items()
+    }
+    table.quantity = columns["quantity"]
+    table.unit_price = columns["unit_price"]
+    table.codes = {name: columns[f"codes_{name}"] for name in dictionaries}
+
+    table.transaction_ids = TransactionIDs(
+        _map_column(os.path.join(directory, "transaction_ids.txt"), "B"),
+        columns["id_starts"],
+        columns["id_ends"]
+    )
+
+    return table
+def snapshot_is_current(filename, directory=SNAPSHOT_DIR):
+    """
+    Checks whether the snapshot was built from the file's current contents
+    on a machine with the same column layout.
+    """
+    manifest = load_manifest(directory)
+    if not manifest or manifest.get("version") != SNAPSHOT_VERSION:
+        return False
+
+    if manifest.get("byteorder") != sys.byteorder:
+        return False
+
+    for name, itemsize in manifest.get("itemsizes", {}).items():
+        if array(manifest["typecodes"][name]).itemsize != itemsize:
+            return False
+
+    try:
+        return manifest.get("source") == source_key(filename)
+    except OSError:
+        return False
+def load_sales_table(filename, directory=SNAPSHOT_DIR, decode_stats=None):
+    """
+    Returns the parsed sales data as a TransactionTable. The text parser
+    only runs when the source file changed since the last snapshot;
+    otherwise the snapshot is memory-mapped.
+    Pass new_decode_stats() to learn the source file's encoding; it is
+    taken from the manifest when the snapshot is reused.
+    """
+    if snapshot_is_current(filename, directory):
+        print(f"Loading snapshot from {directory}")
+        if decode_stats is not None:
+            decode_stats.update(load_manifest(directory)["decode"])
+        return load_snapshot(directory)
+
+    print("Source changed or no snapshot found; parsing text file...")
+    source = source_key(filename)
+    parse_stats = new_decode_stats()
+    table = TransactionTable.from_transactions(iter_sales_records(filename, parse_stats))
+    save_snapshot(table, source, directory, parse_stats)
+
+    if decode_stats is not None:
+        decode_stats.update(parse_stats)
+
+    return table
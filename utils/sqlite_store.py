@@ -0,0 +1,214 @@
+# utils/sqlite_store.py
+
+import os
+import sqlite3
+from itertools import islice
+
+from utils.aggregator import spend_segment
+
+BATCH_SIZE = 50_000
+DEFAULT_DB = "output/cache/sales.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    row_id INTEGER PRIMARY KEY,
+    transaction_id TEXT,
+    date TEXT,
+    product_id TEXT,
+    product_name TEXT,
+    quantity INTEGER,
+    unit_price REAL,
+    amount REAL,
+    customer_id TEXT,
+    region TEXT
+)
+"""
+
+# Single-column indexes keep rows in insertion (row_id) order within each
+# group, so floating-point sums add up in the same order as the Python path.
+INDEXES = {
+    "idx_transactions_region": "region",
+    "idx_transactions_customer": "customer_id",
+    "idx_transactions_product": "product_name",
+    "idx_transactions_date": "date"
+}
+
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144"  # 256 MB page cache during the load
+]
+
+
+class SQLiteStore:
+    """
+    Optional on-disk storage engine: transactions are bulk-loaded into an
+    indexed SQLite table and the analytics run as SQL aggregations.
+    Results have the same shapes and ordering as the in-memory functions
+    in data_processor (first-seen group order is recovered from row_id).
+    Float sums are exact-order sequential sums, matching the in-memory
+    path as long as SQLite's SUM is a plain running total (SQLite < 3.43).
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(SCHEMA)
+
+    @classmethod
+    def from_transactions(cls, transactions, path=":memory:", batch_size=BATCH_SIZE):
+        """
+        Creates (or replaces) a store holding the given transactions.
+        """
+        store = cls(path)
+        store.clear()
+        store.load(transactions, batch_size)
+        return store
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM transactions")
+
+    def load(self, transactions, batch_size=BATCH_SIZE):
+        """
+        Appends any iterable of transaction dictionaries using executemany
+        in batches inside one write transaction. Indexes are dropped for
+        the load and rebuilt afterwards.
+        Returns number of rows loaded
+        """
+        connection = self.connection
+        for pragma in BULK_LOAD_PRAGMAS:
+            connection.execute(pragma)
+
+        rows = (
+            (
+                txn["TransactionID"],
+                txn["Date"],
+                txn["ProductID"],
+                txn["ProductName"],
+                txn["Quantity"],
+                txn["UnitPrice"],
+                txn["Quantity"] * txn["UnitPrice"],
+                txn["CustomerID"],
+                txn["Region"]
+            )
+            for txn in transactions
+        )
+
+        loaded = 0
+
+        with connection:
+            for name in INDEXES:
+                connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                connection.executemany(
+                    "INSERT INTO transactions (transaction_id, date, product_id, product_name, "
+                    "quantity, unit_price, amount, customer_id, region) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+                loaded += len(batch)
+
+            for name, column in INDEXES.items():
+                connection.execute(f"CREATE INDEX {name} ON transactions ({column})")
+
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("ANALYZE")
+
+        return loaded
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    # ---------- AGGREGATIONS ----------
+
+    def calculate_total_revenue(self):
+        return self.connection.execute("SELECT TOTAL(amount) FROM transactions").fetchone()[0]
+
+    def region_wise_sales(self):
+        total = self.calculate_total_revenue()
+        rows = self.connection.execute(
+            "SELECT region, TOTAL(amount), COUNT(*) FROM transactions "
+            "WHERE region != '' "
+            "GROUP BY region "
+            "ORDER BY TOTAL(amount) DESC, MIN(row_id)"
+        )
+
+        return [
+            {
+                "Region": region,
+                "Revenue": revenue,
+                "Transactions": count,
+                "Percentage": round((revenue / total) * 100 if total > 0 else 0, 2)
+            }
+            for region, revenue, count in rows
+        ]
+
+    def _products(self, order, having="", limit=None, params=()):
+        sql = (
+            "SELECT product_name, SUM(quantity), TOTAL(amount) FROM transactions "
+            f"GROUP BY product_name {having} ORDER BY {order}"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + (limit,)
+
+        return [
+            {"ProductName": product, "TotalQuantity": quantity, "Revenue": revenue}
+            for product, quantity, revenue in self.connection.execute(sql, params)
+        ]
+
+    def product_summary(self):
+        return self._products("MIN(row_id)")
+
+    def top_selling_products(self, top_n=5):
+        return self._products("SUM(quantity) DESC, MIN(row_id)", limit=top_n)
+
+    def low_performing_products(self, threshold=10):
+        return self._products("MIN(row_id)", "HAVING SUM(quantity) < ?", params=(threshold,))
+
+    def customer_analysis(self):
+        rows = self.connection.execute(
+            "SELECT customer_id, TOTAL(amount), COUNT(*) FROM transactions "
+            "GROUP BY customer_id ORDER BY MIN(row_id)"
+        )
+
+        return [
+            {
+                "CustomerID": customer,
+                "TotalSpend": spend,
+                "Transactions": count,
+                "Segment": spend_segment(spend)
+            }
+            for customer, spend, count in rows
+        ]
+
+    def daily_sales_trend(self):
+        rows = self.connection.execute(
+            "SELECT date, TOTAL(amount) FROM transactions GROUP BY date ORDER BY MIN(row_id)"
+        )
+        return dict(rows.fetchall())
+
+    def results(self):
+        """
+        Returns the same dictionary as Aggregator().consume(...).results().
+        """
+        return {
+            "total_revenue": self.calculate_total_revenue(),
+            "regions": self.region_wise_sales(),
+            "products": self.product_summary(),
+            "customers": self.customer_analysis(),
+            "daily": self.daily_sales_trend()
+        }
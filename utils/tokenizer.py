@@ -0,0 +1,84 @@
+# utils/tokenizer.py
+
+FIELD_NAMES = (
+    "TransactionID",
+    "Date",
+    "ProductID",
+    "ProductName",
+    "Quantity",
+    "UnitPrice",
+    "CustomerID",
+    "Region"
+)
+FIELD_COUNT = len(FIELD_NAMES)
+
+
+def parse_price(text):
+    """
+    Converts a price such as '1,916' or '173.5' to float.
+    A cleaned copy is only built when a thousands separator is present.
+    Raises ValueError if the text is not numeric.
+    """
+    if "," in text:
+        text = text.replace(",", "")
+    return float(text)
+def tokenize_fields(fields, as_dict=False):
+    """
+    Cleans one row of split fields:
+    - removes commas from ProductName and strips it
+    - converts Quantity to int and UnitPrice to float
+    Returns a list in FIELD_NAMES order (a dict keyed by FIELD_NAMES with
+    as_dict=True), or None for malformed rows.
+    """
+    if len(fields) != FIELD_COUNT:
+        return None
+
+    transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region = fields
+
+    try:
+        quantity = int(quantity)
+        unit_price = parse_price(unit_price)
+    except ValueError:
+        return None
+
+    if "," in product_name:
+        product_name = product_name.replace(",", "")
+    product_name = product_name.strip()
+
+    if as_dict:
+        return {
+            "TransactionID": transaction_id,
+            "Date": date,
+            "ProductID": product_id,
+            "ProductName": product_name,
+            "Quantity": quantity,
+            "UnitPrice": unit_price,
+            "CustomerID": customer_id,
+            "Region": region
+        }
+
+    return [
+        transaction_id,
+        date,
+        product_id,
+        product_name,
+        quantity,
+        unit_price,
+        customer_id,
+        region
+    ]
+def tokenize_line(line):
+    """
+    Parses one pipe-delimited sales line into a transaction dictionary
+    with the tokenize_fields rules.
+    Returns None for malformed rows.
+    """
+    return tokenize_fields(line.split("|"), as_dict=True)
+def iter_tokenized(lines):
+    """
+    Lazily tokenizes sales lines, skipping malformed rows.
+    """
+    for line in lines:
+        transaction = tokenize_line(line)
+        if transaction is not None:
+            yield transaction
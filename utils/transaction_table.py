@@ -0,0 +1,466 @@
+# utils/transaction_table.py
+
+from array import array
+from collections.abc import Mapping
+
+from utils.aggregator import spend_segment, rank_top_products, filter_low_products
+from utils.rollup import RollupCube
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python group-by is used instead
+    np = None
+
+COLUMNS = [
+    "TransactionID",
+    "Date",
+    "ProductID",
+    "ProductName",
+    "Quantity",
+    "UnitPrice",
+    "CustomerID",
+    "Region"
+]
+
+# Same rules as iter_valid_transactions, checked once per distinct value
+DICTIONARY_RULES = [("ProductID", "P"), ("CustomerID", "C"), ("Region", "")]
+
+
+class StringDictionary:
+    """
+    Dictionary-encodes repeated strings as small integer codes.
+    Codes are assigned in first-seen order.
+    """
+
+    def __init__(self, values=None):
+        self.values = []
+        self.index = {}
+
+        for value in values or []:
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TransactionRow(Mapping):
+    """
+    Read-only dict-like view of one row of a TransactionTable.
+    Lets existing callers keep using txn["Quantity"] style access.
+    """
+    __slots__ = ("table", "position")
+
+    def __init__(self, table, position):
+        self.table = table
+        self.position = position
+
+    def __getitem__(self, key):
+        return self.table.value(key, self.position)
+
+    def __iter__(self):
+        return iter(COLUMNS)
+
+    def __len__(self):
+        return len(COLUMNS)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return f"TransactionRow({dict(self)!r})"
+
+
+class TransactionTable:
+    """
+    Columnar, array-backed store of parsed transactions.
+    Quantity and UnitPrice live in typed arrays; Date, ProductID,
+    ProductName, CustomerID and Region are stored as integer codes
+    into shared StringDictionary instances. Columns may also be read-only
+    memoryviews over a memory-mapped snapshot (see utils/snapshot.py).
+    """
+
+    def __init__(self, dictionaries=None):
+        if dictionaries is None:
+            dictionaries = {
+                "Date": StringDictionary(),
+                "ProductID": StringDictionary(),
+                "ProductName": StringDictionary(),
+                "CustomerID": StringDictionary(),
+                "Region": StringDictionary()
+            }
+
+        self.dictionaries = dictionaries
+        self.codes = {name: array("i") for name in dictionaries}
+        self.transaction_ids = []
+        self.quantity = array("q")
+        self.unit_price = array("d")
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """
+        Builds a table from any iterable of transaction dictionaries
+        (including the iter_sales_records generator).
+        """
+        table = cls()
+        table.extend(transactions)
+        return table
+
+    def append(self, txn):
+        self.transaction_ids.append(txn["TransactionID"])
+        self.quantity.append(txn["Quantity"])
+        self.unit_price.append(txn["UnitPrice"])
+
+        for name, dictionary in self.dictionaries.items():
+            self.codes[name].append(dictionary.encode(txn[name]))
+
+    def extend(self, transactions):
+        for txn in transactions:
+            self.append(txn)
+
+    def take(self, positions):
+        """
+        Returns a new table holding the given rows, in the given order.
+        String dictionaries are shared with this table, not copied.
+        """
+        subset = TransactionTable(self.dictionaries)
+
+        for position in positions:
+            subset.transaction_ids.append(self.transaction_ids[position])
+            subset.quantity.append(self.quantity[position])
+            subset.unit_price.append(self.unit_price[position])
+
+            for name, codes in self.codes.items():
+                subset.codes[name].append(codes[position])
+
+        return subset
+
+    def select(self, positions):
+        """
+        Vectorized take(): gathers the rows with NumPy indexing. The new
+        table's columns are read-only arrays, like a snapshot's.
+        """
+        if np is None:
+            return self.take(positions)
+
+        positions = np.asarray(positions, dtype=np.int64)
+        subset = TransactionTable(self.dictionaries)
+        subset.quantity = _as_numpy(self.quantity, np.int64)[positions]
+        subset.unit_price = _as_numpy(self.unit_price, np.float64)[positions]
+        subset.codes = {name: _as_numpy(codes, np.int32)[positions] for name, codes in self.codes.items()}
+
+        ids = self.transaction_ids
+        if isinstance(ids, list):
+            subset.transaction_ids = [ids[position] for position in positions.tolist()]
+        else:
+            subset.transaction_ids = ids.take(positions)
+
+        return subset
+
+    def value(self, column, position):
+        if column == "Quantity":
+            return self.quantity[position]
+        if column == "UnitPrice":
+            return self.unit_price[position]
+        if column == "TransactionID":
+            return self.transaction_ids[position]
+
+        codes = self.codes.get(column)
+        if codes is None:
+            raise KeyError(column)
+
+        return self.dictionaries[column].values[codes[position]]
+
+    def __len__(self):
+        return len(self.quantity)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("TransactionTable index out of range")
+        return TransactionRow(self, position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield TransactionRow(self, position)
+
+    # ---------- VECTORIZED VALIDATION ----------
+
+    def validate(self, stats, region=None, min_amount=None, max_amount=None):
+        """
+        Column-wise iter_valid_transactions: applies the same validation
+        rules and filters to whole columns and records the same counters
+        into stats (from new_filter_stats()).
+        Returns a TransactionTable of the rows that pass, in file order
+        """
+        if np is None:
+            from utils.data_processor import iter_valid_transactions
+
+            rows = (TransactionRow(self, position) for position in range(len(self)))
+            valid = iter_valid_transactions(rows, stats, region, min_amount, max_amount)
+            return self.take([row.position for row in valid])
+
+        rows = len(self)
+        stats["total_input"] += rows
+        if not rows:
+            return self.select([])
+
+        ids = self.transaction_ids
+        if isinstance(ids, list):
+            valid = np.fromiter((txn_id.startswith("T") for txn_id in ids), dtype=bool, count=rows)
+        else:
+            valid = ids.startswith("T")
+
+        for column, prefix in DICTIONARY_RULES:
+            allowed = np.array(
+                [bool(value) and value.startswith(prefix) for value in self.dictionaries[column].values],
+                dtype=bool
+            )
+            valid &= allowed[_as_numpy(self.codes[column], np.int32)]
+
+        quantity = _as_numpy(self.quantity, np.int64)
+        unit_price = _as_numpy(self.unit_price, np.float64)
+        valid &= (quantity > 0) & (unit_price > 0)
+        stats["invalid"] += rows - int(valid.sum())
+
+        if not valid.any():
+            return self.select([])
+
+        amounts = self.amounts()
+        valid_amounts = amounts[valid]
+        low, high = float(valid_amounts.min()), float(valid_amounts.max())
+        if stats["min_amount_seen"] is None or low < stats["min_amount_seen"]:
+            stats["min_amount_seen"] = low
+        if stats["max_amount_seen"] is None or high > stats["max_amount_seen"]:
+            stats["max_amount_seen"] = high
+
+        region_codes = _as_numpy(self.codes["Region"], np.int32)
+        regions = self.dictionaries["Region"]
+        stats["regions_available"].update(regions.values[code] for code in np.unique(region_codes[valid]))
+
+        keep = valid
+        if region:
+            in_region = region_codes == regions.index.get(region, -1)
+            stats["filtered_by_region"] += int((keep & ~in_region).sum())
+            keep = keep & in_region
+
+        for out_of_range in (
+            amounts < min_amount if min_amount is not None else None,
+            amounts > max_amount if max_amount is not None else None
+        ):
+            if out_of_range is not None:
+                stats["filtered_by_amount"] += int((keep & out_of_range).sum())
+                keep = keep & ~out_of_range
+
+        stats["final_count"] += int(keep.sum())
+        return self.select(np.flatnonzero(keep))
+
+    # ---------- VECTORIZED AGGREGATIONS ----------
+
+    def amounts(self):
+        """
+        Returns Quantity * UnitPrice for every row.
+        """
+        if np is not None:
+            return _as_numpy(self.quantity, np.int64) * _as_numpy(self.unit_price, np.float64)
+
+        return array("d", (q * p for q, p in zip(self.quantity, self.unit_price)))
+
+    def calculate_total_revenue(self):
+        return _running_total(self.amounts())
+
+    def region_wise_sales(self):
+        amounts = self.amounts()
+        total_revenue = _running_total(amounts)
+        groups = _group_by(self.codes["Region"], [amounts])
+
+        result = []
+        for code, count, (revenue,) in groups:
+            region = self.dictionaries["Region"].values[code]
+
+            # Skip empty region
+            if not region:
+                continue
+
+            percentage = (
+                (revenue / total_revenue) * 100
+                if total_revenue > 0 else 0
+            )
+            result.append({
+                "Region": region,
+                "Revenue": revenue,
+                "Transactions": count,
+                "Percentage": round(percentage, 2)
+            })
+
+        result.sort(key=lambda x: x["Revenue"], reverse=True)
+        return result
+
+    def product_summary(self):
+        groups = _group_by(self.codes["ProductName"], [self.quantity, self.amounts()])
+        names = self.dictionaries["ProductName"].values
+
+        return [
+            {
+                "ProductName": names[code],
+                "TotalQuantity": int(quantity),
+                "Revenue": revenue
+            }
+            for code, count, (quantity, revenue) in groups
+        ]
+
+    def top_selling_products(self, top_n=5):
+        return rank_top_products(self.product_summary(), top_n)
+
+    def low_performing_products(self, threshold=10):
+        return filter_low_products(self.product_summary(), threshold)
+
+    def customer_analysis(self):
+        groups = _group_by(self.codes["CustomerID"], [self.amounts()])
+        customers = self.dictionaries["CustomerID"].values
+
+        return [
+            {
+                "CustomerID": customers[code],
+                "TotalSpend": spend,
+                "Transactions": count,
+                "Segment": spend_segment(spend)
+            }
+            for code, count, (spend,) in groups
+        ]
+
+    def daily_sales_trend(self):
+        groups = _group_by(self.codes["Date"], [self.amounts()])
+        dates = self.dictionaries["Date"].values
+
+        return {dates[code]: revenue for code, count, (revenue,) in groups}
+
+    def results(self):
+        """
+        Returns the same keys as Aggregator(default_accumulators()).results(),
+        computed column-wise.
+        """
+        return {
+            "total_revenue": self.calculate_total_revenue(),
+            "regions": self.region_wise_sales(),
+            "products": self.product_summary(),
+            "customers": self.customer_analysis(),
+            "daily": self.daily_sales_trend()
+        }
+
+    def rollup_cube(self):
+        """
+        Fills a RollupCube with one group-by over combined (date, region,
+        product) codes instead of a per-row add(). Cells and their order
+        match feeding the rows through RollupCube.add.
+        """
+        cube = RollupCube()
+        if not len(self):
+            return cube
+
+        date_codes, region_codes, product_codes = (
+            self.codes[name] for name in ("Date", "Region", "ProductName")
+        )
+        regions = len(self.dictionaries["Region"])
+        products = len(self.dictionaries["ProductName"])
+
+        if np is not None:
+            combined = (
+                _as_numpy(date_codes, np.int32).astype(np.int64) * regions
+                + _as_numpy(region_codes, np.int32)
+            ) * products + _as_numpy(product_codes, np.int32)
+
+            # Renumber the cells densely so bincount stays small
+            present, cells = np.unique(combined, return_inverse=True)
+            groups = _group_by(cells.astype(np.int32), [self.quantity, self.amounts()])
+            keys = [int(present[code]) for code, _, _ in groups]
+        else:
+            combined = [
+                (date * regions + region) * products + product
+                for date, region, product in zip(date_codes, region_codes, product_codes)
+            ]
+            groups = _group_by(combined, [self.quantity, self.amounts()])
+            keys = [code for code, _, _ in groups]
+
+        dates, region_names, product_names = (
+            self.dictionaries[name].values for name in ("Date", "Region", "ProductName")
+        )
+        for key, (_, count, (quantity, revenue)) in zip(keys, groups):
+            rest, product = divmod(key, products)
+            date, region = divmod(rest, regions)
+            cube.cells[(dates[date], region_names[region], product_names[product])] = [
+                int(quantity), revenue, count
+            ]
+
+        return cube
+
+
+def _as_numpy(column, dtype):
+    """
+    Wraps an array/memoryview column as a NumPy array without copying.
+    """
+    if isinstance(column, np.ndarray):
+        return column
+    if len(column) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.frombuffer(column, dtype=dtype)
+def _running_total(values):
+    """
+    Sums values left to right, matching the float rounding of a plain loop.
+    """
+    if not len(values):
+        return 0.0
+
+    if np is not None:
+        return float(np.add.accumulate(values)[-1])
+
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+def _group_by(codes, value_columns):
+    """
+    Groups rows by integer code and sums each value column per group.
+    Returns a list of (code, row_count, sums) in first-seen order,
+    matching the insertion order of the dict-based functions.
+    """
+    if not len(codes):
+        return []
+
+    if np is not None:
+        codes = _as_numpy(codes, np.int32)
+        size = int(codes.max()) + 1
+
+        counts = np.bincount(codes, minlength=size)
+        sums = [
+            np.bincount(codes, weights=np.asarray(values, dtype=np.float64), minlength=size)
+            for values in value_columns
+        ]
+
+        # First occurrence of each code gives the dict insertion order
+        present, first_seen = np.unique(codes, return_index=True)
+        order = present[np.argsort(first_seen, kind="stable")]
+
+        return [
+            (int(code), int(counts[code]), tuple(float(s[code]) for s in sums))
+            for code in order
+        ]
+
+    groups = {}
+    for position, code in enumerate(codes):
+        group = groups.get(code)
+        if group is None:
+            group = groups[code] = [0] + [0.0] * len(value_columns)
+
+        group[0] += 1
+        for i, values in enumerate(value_columns, start=1):
+            group[i] += values[position]
+
+    return [(code, group[0], tuple(group[1:])) for code, group in groups.items()]